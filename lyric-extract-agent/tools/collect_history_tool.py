@@ -1,4 +1,4 @@
-from utils.qdrant_utils import get_qdrant_client
+from utils.qdrant_utils import get_qdrant_client, history_vector
 
 def save_to_history(interaction_data):
     """
@@ -11,7 +11,7 @@ def save_to_history(interaction_data):
     
     # Convert the interaction data to a format suitable for Qdrant
     point_id = interaction_data["id"]
-    vector = [0.1] * 1536  # Placeholder vector; in a real implementation, you would generate this
+    vector = history_vector()  # Placeholder (or empty, in vectorless mode); in a real implementation, you would generate this
     payload = interaction_data
     
     # Insert the point into the collection
@@ -1,4 +1,5 @@
 from utils.qdrant_utils import get_qdrant_client
+from config import HISTORY_STORAGE_MODE
 
 def query_history(query=None, limit=20):
     """
@@ -15,7 +16,7 @@ def query_history(query=None, limit=20):
     collection_name = "conversation_history"
     
     try:
-        if query:
+        if query and HISTORY_STORAGE_MODE != "vectorless":
             # Vectorize the query if needed and perform vector search
             # (Vectorization step would be needed here if you want to search by content similarity)
             results = client.search(
@@ -27,7 +28,7 @@ def query_history(query=None, limit=20):
                 with_vectors=False
             )
         else:
-            # Retrieve the latest history entries
+            # Retrieve the latest history entries (the only option without vectors)
             results = client.scroll(
                 collection_name=collection_name,
                 limit=limit,
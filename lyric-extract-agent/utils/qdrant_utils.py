@@ -1,15 +1,76 @@
+import os
+import threading
+import httpx
 from qdrant_client import QdrantClient
 from qdrant_client.http import models
-from config import QDRANT_URL, QDRANT_API_KEY
+from config import QDRANT_URL, QDRANT_API_KEY, HISTORY_STORAGE_MODE
 
-def get_qdrant_client():
+# Placeholder vector for dense-mode history points
+HISTORY_PLACEHOLDER_VECTOR = [0.1] * 1536
+
+def _env_flag(name, default="false"):
+    return os.getenv(name, default).lower() in ("1", "true", "yes")
+
+# Connection settings shared by every client this process creates
+QDRANT_PREFER_GRPC = _env_flag("QDRANT_PREFER_GRPC")
+QDRANT_TIMEOUT = int(os.getenv("QDRANT_TIMEOUT", "10"))
+QDRANT_MAX_CONNECTIONS = int(os.getenv("QDRANT_MAX_CONNECTIONS", "20"))
+
+_clients = {}  # pid -> QdrantClient
+_clients_lock = threading.Lock()
+
+def create_qdrant_client(prefer_grpc=None, timeout=None):
     """
-    Get a Qdrant client
-    
+    Build a new Qdrant client
+
+    The REST transport keeps up to QDRANT_MAX_CONNECTIONS pooled keep-alive connections.
+    Most code should call get_qdrant_client() instead, which reuses one client per process.
+
+    Args:
+        prefer_grpc (bool, optional): Use gRPC instead of REST. Defaults to QDRANT_PREFER_GRPC.
+        timeout (int, optional): Request timeout in seconds. Defaults to QDRANT_TIMEOUT.
+
     Returns:
         QdrantClient: A configured Qdrant client
     """
-    return QdrantClient(url=QDRANT_URL, api_key=QDRANT_API_KEY)
+    return QdrantClient(
+        QDRANT_URL,
+        api_key=QDRANT_API_KEY,
+        prefer_grpc=QDRANT_PREFER_GRPC if prefer_grpc is None else prefer_grpc,
+        timeout=QDRANT_TIMEOUT if timeout is None else timeout,
+        limits=httpx.Limits(
+            max_connections=QDRANT_MAX_CONNECTIONS,
+            max_keepalive_connections=QDRANT_MAX_CONNECTIONS
+        )
+    )
+
+def get_qdrant_client():
+    """
+    Get the process-wide Qdrant client, creating it on first use
+
+    Clients are keyed by process ID, so each forked worker (e.g. under gunicorn) builds
+    its own connection pool instead of sharing sockets inherited from the parent.
+
+    Returns:
+        QdrantClient: The configured Qdrant client shared by this process
+    """
+    pid = os.getpid()
+    client = _clients.get(pid)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(pid)
+            if client is None:
+                client = _clients[pid] = create_qdrant_client()
+    return client
+
+def history_vector():
+    """
+    Get the vector to store with a history point
+
+    Returns:
+        list | dict: The placeholder vector, or an empty dict in vectorless mode
+    """
+    return {} if HISTORY_STORAGE_MODE == "vectorless" else HISTORY_PLACEHOLDER_VECTOR
 
 def init_qdrant():
     """
@@ -23,11 +84,15 @@ def init_qdrant():
     
     if "conversation_history" not in collection_names:
         # Create the conversation history collection
-        client.create_collection(
-            collection_name="conversation_history",
-            vectors_config=models.VectorParams(
+        if HISTORY_STORAGE_MODE == "vectorless":
+            vectors_config = {}
+        else:
+            vectors_config = models.VectorParams(
                 size=1536,  # Dimensions for the vector
                 distance=models.Distance.COSINE
             )
+        client.create_collection(
+            collection_name="conversation_history",
+            vectors_config=vectors_config
         )
         print("Created 'conversation_history' collection") 
\ No newline at end of file
@@ -1,11 +1,43 @@
-from flask import Flask, request, jsonify, abort
+from flask import Flask, Response, g, request, jsonify, abort
 from flask_cors import CORS
 from qdrant_client.http import models
 from qdrant_client.http.models import Filter, FieldCondition, MatchValue
-import json
-from datetime import datetime
+import os
 from utils.qdrant_utils import get_qdrant_client
+from utils.words import (
+    SUPPORTED_LANGUAGES,
+    build_word_point,
+    existing_word_ids,
+    plan_batch,
+    skip_existing,
+    validate_word,
+    word_point_id,
+)
+from utils.schema import WORDS_SCHEMA, WORDS_STORAGE_MODE, reconcile_collection, word_vectors
+from utils.search import SEARCH_FIELDS, build_search_filter, search_words
+from utils.embeddings import embed_query
+from utils.batch import BatchParseError, parse_batch_body, upsert_in_chunks
+from utils.word_cache import COUNT_MODES, get_language_version, get_missing_count, get_word_count, invalidate_language
+from utils.page_cache import etag_matches, get_page, page_key, store_page
+from utils.fast_json import FastJSONProvider, encode_json
+from utils.snapshots import choose_encoding, get_snapshot
+from utils.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, debug_log, finish_request, render_metrics, span, start_request
+from utils.pagination import (
+    ORDERED_FIELDS,
+    InvalidCursorError,
+    build_language_filter,
+    build_missing_filter,
+    check_cursor_kind,
+    decode_cursor,
+    iter_pages,
+    scroll_ordered_page,
+    scroll_page,
+    skip_to_ordered_page,
+    skip_to_page,
+)
 app = Flask(__name__)
+# jsonify() and the /words page cache serialize with orjson when it is installed
+app.json = FastJSONProvider(app)
 
 # Configure CORS properly
 CORS(app, resources={
@@ -19,45 +51,41 @@ CORS(app, resources={
     }
 })
 
-# Get Qdrant client from utilities
-client = get_qdrant_client()
+# Limits for POST /words:batch
+BATCH_MAX_ITEMS = int(os.getenv("WORDS_BATCH_MAX_ITEMS", "50000"))
+BATCH_CHUNK_SIZE = int(os.getenv("WORDS_BATCH_CHUNK_SIZE", "500"))
+BATCH_PARALLEL = int(os.getenv("WORDS_BATCH_PARALLEL", "1"))
+BATCH_MAX_PARALLEL = 8
+NDJSON_MIMETYPES = ("application/x-ndjson", "application/ndjson")
+
+# Largest k accepted by GET /words/search
+SEARCH_MAX_K = 100
+
+# Points read per Qdrant scroll while streaming GET /words/export
+EXPORT_PAGE_SIZE = int(os.getenv("WORDS_EXPORT_PAGE_SIZE", "1000"))
 
 # Initialize collections
 def init_collections():
+    """
+    Brings the 'words' collection up to WORDS_SCHEMA without touching existing points.
+
+    This runs once per deployment (gunicorn's on_starting hook in gunicorn.conf.py, or
+    `flask --app app reconcile-schema`), not on import, so starting extra workers is cheap
+    and never wipes data.
+    """
     try:
-        # Collection for words
-        client.recreate_collection(
-            collection_name="words",
-            vectors_config=models.VectorParams(size=384, distance=models.Distance.COSINE),
-        )
-        # Create payload index for language filtering
-        client.create_payload_index(
-            collection_name="words",
-            field_name="language",
-            field_schema=models.PayloadSchemaType.KEYWORD
-        )
-        # Optional: Re-index other fields if needed or if recreate_collection clears them
-        client.create_payload_index(
-            collection_name="words",
-            field_name="salish",
-            field_schema=models.PayloadSchemaType.TEXT
-        )
-        client.create_payload_index(
-            collection_name="words",
-            field_name="english",
-            field_schema=models.PayloadSchemaType.TEXT
-        )
-        print("Collection 'words' recreated/initialized with language index.")
+        actions = reconcile_collection(get_qdrant_client(), WORDS_SCHEMA)
+        for action in actions:
+            print(f"Schema reconcile: {action}")
+        print(f"Collection 'words' verified ({len(actions)} change(s) applied).")
     except Exception as e:
         # Check if it's a connection error or other issue
         print(f"Could not initialize collection 'words': {e}")
-        # Depending on the error, you might want to raise it or handle differently
-        # For now, let's assume if it fails, it might already exist in a usable state,
-        # but log the error.
-        pass
 
-# Initialize collections on startup
-init_collections()
+@app.cli.command('reconcile-schema')
+def reconcile_schema_command():
+    """Create the words collection and any missing payload indexes."""
+    init_collections()
 
 # Error handling
 @app.errorhandler(400)
@@ -72,6 +100,26 @@ def not_found(e):
 def internal_server_error(e):
     return jsonify(error="Internal server error"), 500
 
+# Request timing: spans recorded during a request are exported on /metrics and
+# returned in a Server-Timing header
+@app.before_request
+def start_request_timer():
+    route = f"{request.method} {request.url_rule.rule if request.url_rule else 'unmatched'}"
+    g.request_timer = start_request(route, request.args.get('language'))
+
+@app.after_request
+def finish_request_timer(response):
+    timer = g.pop('request_timer', None)
+    if timer is not None:
+        if timer.spans:
+            response.headers['Server-Timing'] = timer.server_timing()
+        finish_request(timer)
+    return response
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    return app.response_class(render_metrics(), content_type=METRICS_CONTENT_TYPE)
+
 # Add OPTIONS method handler for CORS
 @app.route('/words', methods=['OPTIONS'])
 def handle_options():
@@ -79,73 +127,90 @@ def handle_options():
     return response
 
 # Get paginated results from Qdrant
-def get_paginated_results_qdrant(collection, page=1, per_page=10, sort_by=None, order=None, language=None):
+def get_paginated_results_qdrant(collection, page=1, per_page=10, sort_by=None, order=None, language=None, cursor=None, count_mode=None):
     """
     Get paginated results from a Qdrant collection, optionally filtering by language.
+
+    When a cursor is given, scrolling resumes from the position it encodes and, unless a
+    count_mode is requested, the total count is skipped. Otherwise the numbered page is
+    located by walking the scan, which is kept for compatibility with older clients.
+    Qdrant errors are raised to the caller.
+
+    Sorting on an indexed field (see ORDERED_FIELDS) is done by Qdrant across the whole
+    collection, provided every matching point has the field; any other sort_by only
+    reorders the items within the returned page.
     """
-    # Calculate offset
-    offset = (page - 1) * per_page
-    
-    # Build filter based on language
-    query_filter = None
+    # Looked up per call rather than bound at import, so each forked worker uses its own pool
+    client = get_qdrant_client()
+    query_filter = build_language_filter(language)
     if language:
-        query_filter = Filter(
-            must=[
-                FieldCondition(
-                    key="language",
-                    match=MatchValue(value=language)
-                )
-            ]
-        )
-        print(f"Applying filter for language: {language}") # Debug log
+        debug_log(f"Applying filter for language: {language}")
 
-    try:
-        # Get total count with filter
-        count_result = client.count(
-            collection_name=collection,
-            count_filter=query_filter, # Use count_filter here
-            exact=True # Use exact=True for potentially better accuracy with filters
-        )
-        total_count = count_result.count
-        print(f"Total count for language '{language}': {total_count}") # Debug log
-
-        # Get records with pagination and filter
-        search_result, next_offset = client.scroll( # scroll now returns a tuple
-            collection_name=collection,
-            scroll_filter=query_filter, # Use scroll_filter here
-            limit=per_page,
-            offset=offset,
-            with_payload=True,
-            with_vectors=False # No need for vectors if just displaying words
-        )
+    order = 'desc' if order and order.lower() == 'desc' else 'asc'
+    state = decode_cursor(cursor) if cursor is not None else None
+    if state is not None and 'k' in state:
+        # Ordered cursors carry their own sort so later pages stay consistent
+        sort_by, order = state['k'], state.get('d')
+    if count_mode is None:
+        count_mode = 'exact' if state is None else 'none'
+
+    # Counts are cached per language and invalidated by insert_word
+    with span("count"):
+        total_count = get_word_count(client, collection, language, count_mode, query_filter)
+        # Ordered scrolls leave out points without the field, so those are listed
+        # with the unordered scan until the field is backfilled
+        is_ordered = sort_by in ORDERED_FIELDS and get_missing_count(
+            client, collection, language, sort_by, build_missing_filter(sort_by, query_filter)
+        ) == 0
+    if state is not None:
+        check_cursor_kind(state, is_ordered)
+    debug_log(f"Total count ({count_mode}) for language '{language}': {total_count}")
+
+    if state is None:
+        with span("skip"):
+            if is_ordered:
+                state, has_more = skip_to_ordered_page(client, collection, page, per_page, sort_by, order, query_filter)
+            else:
+                offset, has_more = skip_to_page(client, collection, page, per_page, query_filter)
+                state = {'o': offset}
+        if not has_more:
+            return {
+                'page': page,
+                'per_page': per_page,
+                'total': total_count,
+                'count_mode': count_mode,
+                'items': [],
+                'next_cursor': None
+            }
 
-        # Extract payloads
-        results = [point.payload for point in search_result] # Directly iterate search_result
-        print(f"Retrieved {len(results)} items for page {page}, language '{language}'") # Debug log
+    # Get records starting at the resolved position
+    with span("scroll"):
+        if is_ordered:
+            search_result, next_cursor = scroll_ordered_page(client, collection, per_page, sort_by, order, state, query_filter)
+        else:
+            search_result, next_cursor = scroll_page(client, collection, per_page, state['o'], query_filter)
 
-        # Client-side sorting (if needed)
-        if sort_by and results:
-            reverse = order.lower() == 'desc' if order else False
+    # Extract payloads
+    results = [point.payload for point in search_result] # Directly iterate search_result
+    debug_log(f"Retrieved {len(results)} items for page {page}, language '{language}'")
+
+    # Client-side sorting for fields Qdrant cannot order by
+    if sort_by and results and not is_ordered:
+        with span("sort"):
             try:
-                results = sorted(results, key=lambda x: x.get(sort_by, ''), reverse=reverse)
+                results = sorted(results, key=lambda x: x.get(sort_by, ''), reverse=order == 'desc')
             except:
                 # If sorting fails, return unsorted
                 pass
-        
-        return {
-            'page': page,
-            'per_page': per_page,
-            'total': total_count,
-            'items': results
-        }
-    except Exception as e:
-        print(f"Error fetching from Qdrant: {e}")
-        return {
-            'page': page,
-            'per_page': per_page,
-            'total': 0,
-            'items': []
-        }
+
+    return {
+        'page': page if cursor is None else None,
+        'per_page': per_page,
+        'total': total_count,
+        'count_mode': count_mode,
+        'items': results,
+        'next_cursor': next_cursor
+    }
 
 @app.route('/words', methods=['POST'])
 def insert_word():
@@ -153,40 +218,106 @@ def insert_word():
     if not data:
         abort(400, description="No JSON data provided")
 
-    salish = data.get('salish')
-    english = data.get('english')
-    language = data.get('language')
-
-    if not salish or not english or not language:
-        abort(400, description="salish, english, and language are required")
+    error = validate_word(data)
+    if error:
+        abort(400, description=error)
 
-    if language not in ["salish", "italian"]:
-        abort(400, description="language must be either 'salish' or 'italian'")
+    salish = data['salish']
+    english = data['english']
+    language = data['language']
 
+    client = get_qdrant_client()
     try:
-        point_id = str(datetime.now().timestamp()) + "-" + language
+        # IDs are derived from the word itself, so a retried or repeated insert is a no-op
+        point_id = word_point_id(language, salish, english)
+        if existing_word_ids(client, "words", [point_id]):
+            debug_log(f"Word already exists: {point_id}")
+            return jsonify({'status': 'exists', 'id': point_id}), 200
+        vector = word_vectors([(salish, english)])[0]
 
         client.upsert(
             collection_name="words",
-            points=[
-                models.PointStruct(
-                    id=point_id,
-                    payload={
-                        "salish": salish,
-                        "english": english,
-                        "language": language,
-                        "created_at": datetime.now().isoformat()
-                    },
-                    vector=[0.0] * 384
-                )
-            ]
+            points=[build_word_point(point_id, salish, english, language, vector)]
         )
-        print(f"Inserted word: {{'salish': '{salish}', 'english': '{english}', 'language': '{language}'}}")
+        invalidate_language(language)
+        debug_log(f"Inserted word: {{'salish': '{salish}', 'english': '{english}', 'language': '{language}'}}")
         return jsonify({'status': 'success', 'id': point_id}), 201
     except Exception as e:
         print(f"Error inserting word: {e}")
         abort(500, description="Failed to insert word")
 
+@app.route('/words:batch', methods=['POST'])
+def insert_words_batch():
+    """
+    Inserts many words in one request.
+
+    The body is a JSON list (or {"words": [...]}) or NDJSON when sent as
+    application/x-ndjson. Every item is validated before anything is written; valid
+    items are upserted in chunks of ?chunk_size= with wait=False, ?parallel= chunks at a
+    time. The response has one status per input item, in input order.
+
+    Point IDs are derived from each word (see word_point_id). Words already stored, or
+    repeated earlier in the same batch, are reported as "exists" and not written again,
+    so a retried batch is safe.
+    """
+    is_ndjson = request.mimetype in NDJSON_MIMETYPES
+    try:
+        items = parse_batch_body(request.get_data(as_text=True), is_ndjson)
+    except BatchParseError as e:
+        abort(400, description=str(e))
+
+    if not items:
+        abort(400, description="No words provided")
+    if len(items) > BATCH_MAX_ITEMS:
+        abort(400, description=f"A batch may contain at most {BATCH_MAX_ITEMS} words")
+
+    chunk_size = request.args.get('chunk_size', BATCH_CHUNK_SIZE, type=int)
+    parallel = request.args.get('parallel', BATCH_PARALLEL, type=int)
+    if chunk_size < 1 or not 1 <= parallel <= BATCH_MAX_PARALLEL:
+        abort(400, description=f"chunk_size must be positive and parallel between 1 and {BATCH_MAX_PARALLEL}")
+
+    # Validate everything in one pass before writing
+    statuses, point_indexes = plan_batch(items)
+
+    # Skip words that are already stored, looked up by ID in a few retrieve calls
+    client = get_qdrant_client()
+    try:
+        existing = existing_word_ids(client, "words", [statuses[index]['id'] for index in point_indexes])
+    except Exception as e:
+        print(f"Error checking for existing words in batch: {e}")
+        abort(500, description="Failed to insert words")
+    point_indexes = skip_existing(statuses, point_indexes, existing)
+
+    # Vectors for all valid words in one batched pass (a no-op unless embeddings are on)
+    try:
+        vectors = word_vectors([(items[index]['salish'], items[index]['english']) for index in point_indexes])
+    except Exception as e:
+        print(f"Error computing word vectors for batch: {e}")
+        abort(500, description="Failed to insert words")
+    points = [
+        build_word_point(statuses[index]['id'], items[index]['salish'], items[index]['english'], items[index]['language'], vector)
+        for index, vector in zip(point_indexes, vectors)
+    ]
+
+    chunk_errors = upsert_in_chunks(client, "words", points, chunk_size, parallel, wait=False)
+    for chunk_number, error in enumerate(chunk_errors):
+        if error is None:
+            continue
+        print(f"Error upserting batch chunk {chunk_number}: {error}")
+        for index in point_indexes[chunk_number * chunk_size:(chunk_number + 1) * chunk_size]:
+            statuses[index] = {'index': index, 'status': 'failed', 'error': "Failed to insert word"}
+
+    for language in {point.payload['language'] for point in points}:
+        invalidate_language(language)
+
+    summary = {status: sum(1 for s in statuses if s['status'] == status) for status in ('accepted', 'exists', 'invalid', 'failed')}
+    debug_log(f"Batch insert: {len(items)} items, {summary}")
+    return jsonify({
+        'status': 'success' if summary['accepted'] + summary['exists'] == len(items) else 'partial',
+        **summary,
+        'items': statuses
+    }), 200
+
 @app.route('/words', methods=['GET'])
 def get_words():
     page = request.args.get('page', 1, type=int)
@@ -194,31 +325,190 @@ def get_words():
     sort_by = request.args.get('sort_by', 'created_at')
     order = request.args.get('order', 'desc')
     language = request.args.get('language', None, type=str)
+    cursor = request.args.get('cursor', None, type=str)
+    count_mode = request.args.get('count', None, type=str)
+    response_format = request.args.get('format', None, type=str)
+
+    if count_mode and count_mode not in COUNT_MODES:
+        abort(400, description=f"count must be one of {', '.join(COUNT_MODES)}")
 
-    if language and language not in ["salish", "italian"]:
-        print(f"Invalid language filter requested: {language}. Returning empty results.")
+    if response_format == 'snapshot':
+        return words_snapshot(language)
+    if response_format is not None:
+        abort(400, description="format must be 'snapshot' when given")
+
+    if language and language not in SUPPORTED_LANGUAGES:
+        debug_log(f"Invalid language filter requested: {language}. Returning empty results.")
         return jsonify({
             'page': page,
             'per_page': per_page,
             'total': 0,
-            'items': []
+            'count_mode': count_mode or 'exact',
+            'items': [],
+            'next_cursor': None
         })
 
-    print(f"Fetching words: page={page}, per_page={per_page}, sort_by={sort_by}, order={order}, language={language}")
+    debug_log(f"Fetching words: page={page}, cursor={cursor}, per_page={per_page}, sort_by={sort_by}, order={order}, language={language}")
+
+    # Serialized pages are cached until a write bumps the language version (or the TTL
+    # runs out), so repeat requests skip Qdrant and unchanged pages are answered with 304
+    key = page_key(language, cursor, page, per_page, sort_by, order, count_mode)
+    cached = get_page(key)
+    if cached is not None:
+        body, etag = cached.body, cached.etag
+    else:
+        version = get_language_version(language)
+        try:
+            result = get_paginated_results_qdrant(
+                collection="words",
+                page=page,
+                per_page=per_page,
+                sort_by=sort_by,
+                order=order,
+                language=language,
+                cursor=cursor,
+                count_mode=count_mode
+            )
+        except InvalidCursorError as e:
+            abort(400, description=str(e))
+        except Exception as e:
+            print(f"Error fetching from Qdrant: {e}")
+            return jsonify({
+                'page': page,
+                'per_page': per_page,
+                'total': 0,
+                'count_mode': count_mode or 'exact',
+                'items': [],
+                'next_cursor': None
+            })
+        with span("serialize"):
+            body = encode_json(result)
+        etag = store_page(key, body, version)
+
+    if etag_matches(request.headers.get('If-None-Match'), etag):
+        response = app.response_class(status=304)
+    else:
+        response = app.response_class(body, mimetype='application/json')
+    response.headers['ETag'] = etag
+    # Let browsers keep the page but revalidate it on every use
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+def words_snapshot(language):
+    """
+    Serves the whole word list for a language (all languages when omitted) as a
+    pre-compressed JSON document {"language", "total", "items"}.
+
+    Snapshots are rebuilt in the background when the language version changes, so this
+    never serializes or compresses per request; only the first request for a language
+    waits, for a build with faster compression (see utils/snapshots.py). Brotli is used when installed and accepted,
+    otherwise gzip.
+    """
+    if language and language not in SUPPORTED_LANGUAGES:
+        abort(400, description="language must be either 'salish' or 'italian'")
+
+    snapshot = get_snapshot(get_qdrant_client(), "words", language)
+    if snapshot is None:
+        abort(500, description="Failed to build words snapshot")
+
+    if etag_matches(request.headers.get('If-None-Match'), snapshot.etag):
+        response = app.response_class(status=304)
+    else:
+        coding, blob = choose_encoding(snapshot, request.headers.get('Accept-Encoding'))
+        response = app.response_class(blob, mimetype='application/json')
+        if coding:
+            response.headers['Content-Encoding'] = coding
+    response.headers['ETag'] = snapshot.etag
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+@app.route('/words/export', methods=['GET'])
+def export_words():
+    """
+    Streams every word as NDJSON, one Qdrant scroll page at a time.
+
+    Each word line is the point payload plus its "id". After each page a checkpoint
+    line {"next_cursor": "..."} is written; passing that value back as ?cursor= resumes
+    the export after the last complete page. The final line has "next_cursor": null.
+    """
+    language = request.args.get('language', None, type=str)
+    cursor = request.args.get('cursor', None, type=str)
+    page_size = request.args.get('page_size', EXPORT_PAGE_SIZE, type=int)
+
+    if language and language not in SUPPORTED_LANGUAGES:
+        abort(400, description="language must be either 'salish' or 'italian'")
+    if not 1 <= page_size <= EXPORT_PAGE_SIZE:
+        abort(400, description=f"page_size must be between 1 and {EXPORT_PAGE_SIZE}")
+
+    offset = None
+    if cursor is not None:
+        try:
+            state = decode_cursor(cursor)
+        except InvalidCursorError as e:
+            abort(400, description=str(e))
+        if 'k' in state:
+            abort(400, description="Ordered /words cursors cannot be used to resume an export")
+        offset = state['o']
+
+    query_filter = build_language_filter(language)
+
+    def generate():
+        exported = 0
+        try:
+            for records, next_cursor in iter_pages(get_qdrant_client(), "words", page_size, offset, query_filter):
+                lines = [encode_json({**point.payload, 'id': point.id}) for point in records]
+                lines.append(encode_json({'next_cursor': next_cursor}))
+                exported += len(records)
+                yield b"\n".join(lines) + b"\n"
+        except Exception as e:
+            print(f"Error exporting words after {exported} items: {e}")
+            yield encode_json({'error': "Export interrupted", 'exported': exported}) + b"\n"
+            return
+        debug_log(f"Exported {exported} words for language '{language}'")
+
+    return Response(generate(), mimetype='application/x-ndjson')
+
+@app.route('/words/search', methods=['GET'])
+def search_words_route():
+    """
+    Semantic word search: /words/search?q=...&language=...&k=...
+
+    ?field=english|target_word picks the named vector to match (default english) and
+    ?exact=1 first narrows candidates to words containing the query text. Only
+    available when words are stored with WORDS_STORAGE_MODE=embedded.
+    """
+    query = request.args.get('q', '', type=str).strip()
+    language = request.args.get('language', None, type=str)
+    k = request.args.get('k', 10, type=int)
+    field = request.args.get('field', 'english', type=str)
+    is_exact = request.args.get('exact', '0') in ('1', 'true')
+
+    if WORDS_STORAGE_MODE != 'embedded':
+        abort(400, description="Semantic search requires WORDS_STORAGE_MODE=embedded")
+    if not query:
+        abort(400, description="q is required")
+    if language and language not in SUPPORTED_LANGUAGES:
+        abort(400, description="language must be either 'salish' or 'italian'")
+    if not 1 <= k <= SEARCH_MAX_K:
+        abort(400, description=f"k must be between 1 and {SEARCH_MAX_K}")
+    if field not in SEARCH_FIELDS:
+        abort(400, description=f"field must be one of {', '.join(SEARCH_FIELDS)}")
 
     try:
-        result = get_paginated_results_qdrant(
-            collection="words",
-            page=page,
-            per_page=per_page,
-            sort_by=sort_by,
-            order=order,
-            language=language
-        )
-        return jsonify(result)
+        # Normalised text as the cache key so "Water" and "water " share an embedding
+        query_vector = embed_query(query.lower())
+        query_filter = build_search_filter(language, query if is_exact else None)
+        points = search_words(get_qdrant_client(), "words", query_vector, field, k, query_filter)
     except Exception as e:
-        print(f"Error fetching words: {e}")
-        return jsonify({"error": "Failed to fetch words"}), 500
+        print(f"Error searching words: {e}")
+        abort(500, description="Failed to search words")
+
+    return jsonify({
+        'query': query,
+        'k': k,
+        'items': [{**point.payload, 'id': point.id, 'score': point.score} for point in points]
+    })
 
 @app.route('/ping', methods=['GET'])
 def ping():
@@ -226,4 +516,6 @@ def ping():
     return response
 
 if __name__ == '__main__':
+    # The dev server has no deployment step, so reconcile here
+    init_collections()
     app.run(debug=True, port=5001) 
\ No newline at end of file
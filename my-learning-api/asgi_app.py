@@ -0,0 +1,524 @@
+"""
+ASGI (Starlette) version of the words API in app.py, built on AsyncQdrantClient.
+
+The routes, parameters and JSON shapes match app.py, so the frontend can use either.
+A Flask worker blocks on every Qdrant round trip. Here a worker keeps serving other
+requests while it waits, and GET /words runs its count and its page scroll concurrently.
+
+    uvicorn asgi_app:app --port 5002 --workers 4
+
+The schema is not reconciled here. Run `flask --app app reconcile-schema` once per
+deployment, as with gunicorn.
+"""
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import MutableHeaders, QueryParams
+from starlette.exceptions import HTTPException
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+from utils.qdrant_utils import create_async_qdrant_client, get_qdrant_client
+from utils.words import (
+    SUPPORTED_LANGUAGES,
+    build_word_point,
+    existing_word_ids_async,
+    plan_batch,
+    skip_existing,
+    validate_word,
+    word_point_id,
+)
+from utils.schema import WORDS_STORAGE_MODE, word_vectors
+from utils.search import SEARCH_FIELDS, build_search_filter, search_words_async
+from utils.embeddings import embed_query
+from utils.batch import BatchParseError, parse_batch_body, upsert_in_chunks_async
+from utils.word_cache import (
+    COUNT_MODES,
+    get_language_version,
+    get_missing_count_async,
+    get_word_count_async,
+    invalidate_language,
+)
+from utils.page_cache import etag_matches, get_page, page_key, store_page
+from utils.fast_json import encode_json
+from utils.snapshots import choose_encoding, get_snapshot
+from utils.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, finish_request, render_metrics, span, start_request
+from utils.pagination import (
+    ORDERED_FIELDS,
+    InvalidCursorError,
+    build_language_filter,
+    build_missing_filter,
+    check_cursor_kind,
+    decode_cursor,
+    iter_pages_async,
+    scroll_ordered_page_async,
+    scroll_page_async,
+    skip_to_ordered_page_async,
+    skip_to_page_async,
+)
+
+# Same limits as app.py
+BATCH_MAX_ITEMS = int(os.getenv("WORDS_BATCH_MAX_ITEMS", "50000"))
+BATCH_CHUNK_SIZE = int(os.getenv("WORDS_BATCH_CHUNK_SIZE", "500"))
+BATCH_PARALLEL = int(os.getenv("WORDS_BATCH_PARALLEL", "1"))
+BATCH_MAX_PARALLEL = 8
+NDJSON_MIMETYPES = ("application/x-ndjson", "application/ndjson")
+SEARCH_MAX_K = 100
+EXPORT_PAGE_SIZE = int(os.getenv("WORDS_EXPORT_PAGE_SIZE", "1000"))
+
+HTTP_REASONS = {400: "Bad Request", 404: "Not Found", 500: "Internal Server Error"}
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with utils.fast_json (orjson when installed)."""
+
+    def render(self, content):
+        return encode_json(content)
+
+
+@asynccontextmanager
+async def lifespan(app):
+    # One client per worker, created on the worker's own event loop
+    app.state.client = create_async_qdrant_client()
+    try:
+        yield
+    finally:
+        await app.state.client.close()
+
+
+def abort(status_code, description):
+    raise HTTPException(status_code=status_code, detail=description)
+
+
+def int_arg(request, name, default):
+    """Reads an integer query parameter, falling back to default like Flask's type=int."""
+    try:
+        return int(request.query_params[name])
+    except (KeyError, ValueError):
+        return default
+
+
+async def http_error(request, exc):
+    # Same body as Flask's abort(): {"error": "400 Bad Request: <description>"}
+    if exc.status_code == 404:
+        return FastJSONResponse({'error': "Not found"}, status_code=404)
+    if exc.status_code == 500:
+        return FastJSONResponse({'error': "Internal server error"}, status_code=500)
+    reason = HTTP_REASONS.get(exc.status_code, "Error")
+    return FastJSONResponse({'error': f"{exc.status_code} {reason}: {exc.detail}"}, status_code=exc.status_code)
+
+
+async def internal_server_error(request, exc):
+    return FastJSONResponse({'error': "Internal server error"}, status_code=500)
+
+
+def empty_page(page, per_page, count_mode, total=0):
+    return {
+        'page': page,
+        'per_page': per_page,
+        'total': total,
+        'count_mode': count_mode,
+        'items': [],
+        'next_cursor': None
+    }
+
+
+async def fetch_page(client, collection, page, per_page, sort_by, order, state, query_filter, is_ordered):
+    """
+    Resolves the requested position and reads one page. Returns (records, next_cursor),
+    or None when the numbered page is past the end.
+    """
+    if state is None:
+        with span("skip"):
+            if is_ordered:
+                state, has_more = await skip_to_ordered_page_async(client, collection, page, per_page, sort_by, order, query_filter)
+            else:
+                offset, has_more = await skip_to_page_async(client, collection, page, per_page, query_filter)
+                state = {'o': offset}
+        if not has_more:
+            return None
+
+    with span("scroll"):
+        if is_ordered:
+            return await scroll_ordered_page_async(client, collection, per_page, sort_by, order, state, query_filter)
+        return await scroll_page_async(client, collection, per_page, state['o'], query_filter)
+
+
+async def count_words(client, collection, language, count_mode, query_filter):
+    with span("count"):
+        return await get_word_count_async(client, collection, language, count_mode, query_filter)
+
+
+async def get_paginated_results_qdrant(client, collection, page=1, per_page=10, sort_by=None, order=None, language=None, cursor=None, count_mode=None):
+    """
+    Async version of app.get_paginated_results_qdrant.
+
+    The count does not depend on the page, so both run together with asyncio.gather and
+    the request takes as long as the slower of the two rather than their sum.
+    """
+    query_filter = build_language_filter(language)
+
+    order = 'desc' if order and order.lower() == 'desc' else 'asc'
+    state = decode_cursor(cursor) if cursor is not None else None
+    if state is not None and 'k' in state:
+        # Ordered cursors carry their own sort so later pages stay consistent
+        sort_by, order = state['k'], state.get('d')
+    # Ordered scrolls leave out points without the field, so those are listed with the
+    # unordered scan until the field is backfilled
+    is_ordered = sort_by in ORDERED_FIELDS and await get_missing_count_async(
+        client, collection, language, sort_by, build_missing_filter(sort_by, query_filter)
+    ) == 0
+    if state is not None:
+        check_cursor_kind(state, is_ordered)
+    if count_mode is None:
+        count_mode = 'exact' if state is None else 'none'
+
+    total_count, fetched = await asyncio.gather(
+        count_words(client, collection, language, count_mode, query_filter),
+        fetch_page(client, collection, page, per_page, sort_by, order, state, query_filter, is_ordered)
+    )
+
+    if fetched is None:
+        return empty_page(page, per_page, count_mode, total_count)
+
+    search_result, next_cursor = fetched
+    results = [point.payload for point in search_result]
+
+    # Client-side sorting for fields Qdrant cannot order by
+    if sort_by and results and not is_ordered:
+        with span("sort"):
+            try:
+                results = sorted(results, key=lambda x: x.get(sort_by, ''), reverse=order == 'desc')
+            except TypeError:
+                pass
+
+    return {
+        'page': page if cursor is None else None,
+        'per_page': per_page,
+        'total': total_count,
+        'count_mode': count_mode,
+        'items': results,
+        'next_cursor': next_cursor
+    }
+
+
+async def get_words(request):
+    params = request.query_params
+    page = int_arg(request, 'page', 1)
+    per_page = int_arg(request, 'per_page', 10)
+    sort_by = params.get('sort_by', 'created_at')
+    order = params.get('order', 'desc')
+    language = params.get('language')
+    cursor = params.get('cursor')
+    count_mode = params.get('count')
+    response_format = params.get('format')
+
+    if count_mode and count_mode not in COUNT_MODES:
+        abort(400, f"count must be one of {', '.join(COUNT_MODES)}")
+
+    if response_format == 'snapshot':
+        return await words_snapshot(request, language)
+    if response_format is not None:
+        abort(400, "format must be 'snapshot' when given")
+
+    if language and language not in SUPPORTED_LANGUAGES:
+        return FastJSONResponse(empty_page(page, per_page, count_mode or 'exact'))
+
+    # Same page cache and ETags as app.py
+    key = page_key(language, cursor, page, per_page, sort_by, order, count_mode)
+    cached = get_page(key)
+    if cached is not None:
+        body, etag = cached.body, cached.etag
+    else:
+        version = get_language_version(language)
+        try:
+            result = await get_paginated_results_qdrant(
+                request.app.state.client,
+                collection="words",
+                page=page,
+                per_page=per_page,
+                sort_by=sort_by,
+                order=order,
+                language=language,
+                cursor=cursor,
+                count_mode=count_mode
+            )
+        except InvalidCursorError as e:
+            abort(400, str(e))
+        except Exception as e:
+            print(f"Error fetching from Qdrant: {e}")
+            return FastJSONResponse(empty_page(page, per_page, count_mode or 'exact'))
+        with span("serialize"):
+            body = encode_json(result)
+        etag = store_page(key, body, version)
+
+    headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+    if etag_matches(request.headers.get('if-none-match'), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type='application/json', headers=headers)
+
+
+async def words_snapshot(request, language):
+    """
+    Async version of app.words_snapshot. Snapshots are built with the sync client in a
+    worker thread, so the event loop keeps serving while the first one is read.
+    """
+    if language and language not in SUPPORTED_LANGUAGES:
+        abort(400, "language must be either 'salish' or 'italian'")
+
+    snapshot = await run_in_threadpool(get_snapshot, get_qdrant_client(), "words", language)
+    if snapshot is None:
+        abort(500, "Failed to build words snapshot")
+
+    headers = {'ETag': snapshot.etag, 'Vary': 'Accept-Encoding', 'Cache-Control': 'no-cache'}
+    if etag_matches(request.headers.get('if-none-match'), snapshot.etag):
+        return Response(status_code=304, headers=headers)
+    coding, blob = choose_encoding(snapshot, request.headers.get('accept-encoding'))
+    if coding:
+        headers['Content-Encoding'] = coding
+    return Response(blob, media_type='application/json', headers=headers)
+
+
+async def insert_word(request):
+    try:
+        data = await request.json()
+    except ValueError:
+        data = None
+    if not data:
+        abort(400, "No JSON data provided")
+
+    error = validate_word(data)
+    if error:
+        abort(400, error)
+
+    salish = data['salish']
+    english = data['english']
+    language = data['language']
+
+    try:
+        point_id = word_point_id(language, salish, english)
+        if await existing_word_ids_async(request.app.state.client, "words", [point_id]):
+            return FastJSONResponse({'status': 'exists', 'id': point_id})
+        # Embedding is CPU-bound, so keep it off the event loop
+        vector = (await run_in_threadpool(word_vectors, [(salish, english)]))[0]
+        await request.app.state.client.upsert(
+            collection_name="words",
+            points=[build_word_point(point_id, salish, english, language, vector)]
+        )
+        invalidate_language(language)
+        return FastJSONResponse({'status': 'success', 'id': point_id}, status_code=201)
+    except Exception as e:
+        print(f"Error inserting word: {e}")
+        abort(500, "Failed to insert word")
+
+
+async def insert_words_batch(request):
+    """
+    Async version of app.insert_words_batch; the response has one status per input item.
+    """
+    is_ndjson = request.headers.get('content-type', '').split(';')[0].strip() in NDJSON_MIMETYPES
+    try:
+        items = parse_batch_body((await request.body()).decode('utf-8'), is_ndjson)
+    except BatchParseError as e:
+        abort(400, str(e))
+
+    if not items:
+        abort(400, "No words provided")
+    if len(items) > BATCH_MAX_ITEMS:
+        abort(400, f"A batch may contain at most {BATCH_MAX_ITEMS} words")
+
+    chunk_size = int_arg(request, 'chunk_size', BATCH_CHUNK_SIZE)
+    parallel = int_arg(request, 'parallel', BATCH_PARALLEL)
+    if chunk_size < 1 or not 1 <= parallel <= BATCH_MAX_PARALLEL:
+        abort(400, f"chunk_size must be positive and parallel between 1 and {BATCH_MAX_PARALLEL}")
+
+    statuses, point_indexes = plan_batch(items)
+    try:
+        existing = await existing_word_ids_async(
+            request.app.state.client, "words", [statuses[index]['id'] for index in point_indexes]
+        )
+    except Exception as e:
+        print(f"Error checking for existing words in batch: {e}")
+        abort(500, "Failed to insert words")
+    point_indexes = skip_existing(statuses, point_indexes, existing)
+
+    try:
+        vectors = await run_in_threadpool(
+            word_vectors, [(items[index]['salish'], items[index]['english']) for index in point_indexes]
+        )
+    except Exception as e:
+        print(f"Error computing word vectors for batch: {e}")
+        abort(500, "Failed to insert words")
+    points = [
+        build_word_point(statuses[index]['id'], items[index]['salish'], items[index]['english'], items[index]['language'], vector)
+        for index, vector in zip(point_indexes, vectors)
+    ]
+
+    chunk_errors = await upsert_in_chunks_async(request.app.state.client, "words", points, chunk_size, parallel, wait=False)
+    for chunk_number, error in enumerate(chunk_errors):
+        if error is None:
+            continue
+        print(f"Error upserting batch chunk {chunk_number}: {error}")
+        for index in point_indexes[chunk_number * chunk_size:(chunk_number + 1) * chunk_size]:
+            statuses[index] = {'index': index, 'status': 'failed', 'error': "Failed to insert word"}
+
+    for language in {point.payload['language'] for point in points}:
+        invalidate_language(language)
+
+    summary = {status: sum(1 for s in statuses if s['status'] == status) for status in ('accepted', 'exists', 'invalid', 'failed')}
+    return FastJSONResponse({
+        'status': 'success' if summary['accepted'] + summary['exists'] == len(items) else 'partial',
+        **summary,
+        'items': statuses
+    })
+
+
+async def export_words(request):
+    """
+    Async version of app.export_words: NDJSON words with {"next_cursor": ...} checkpoints.
+    """
+    language = request.query_params.get('language')
+    cursor = request.query_params.get('cursor')
+    page_size = int_arg(request, 'page_size', EXPORT_PAGE_SIZE)
+
+    if language and language not in SUPPORTED_LANGUAGES:
+        abort(400, "language must be either 'salish' or 'italian'")
+    if not 1 <= page_size <= EXPORT_PAGE_SIZE:
+        abort(400, f"page_size must be between 1 and {EXPORT_PAGE_SIZE}")
+
+    offset = None
+    if cursor is not None:
+        try:
+            state = decode_cursor(cursor)
+        except InvalidCursorError as e:
+            abort(400, str(e))
+        if 'k' in state:
+            abort(400, "Ordered /words cursors cannot be used to resume an export")
+        offset = state['o']
+
+    query_filter = build_language_filter(language)
+    client = request.app.state.client
+
+    async def generate():
+        exported = 0
+        try:
+            async for records, next_cursor in iter_pages_async(client, "words", page_size, offset, query_filter):
+                lines = [encode_json({**point.payload, 'id': point.id}) for point in records]
+                lines.append(encode_json({'next_cursor': next_cursor}))
+                exported += len(records)
+                yield b"\n".join(lines) + b"\n"
+        except Exception as e:
+            print(f"Error exporting words after {exported} items: {e}")
+            yield encode_json({'error': "Export interrupted", 'exported': exported}) + b"\n"
+
+    return StreamingResponse(generate(), media_type='application/x-ndjson')
+
+
+async def search_words_route(request):
+    """
+    Async version of app.search_words_route (WORDS_STORAGE_MODE=embedded only).
+    """
+    params = request.query_params
+    query = params.get('q', '').strip()
+    language = params.get('language')
+    k = int_arg(request, 'k', 10)
+    field = params.get('field', 'english')
+    is_exact = params.get('exact', '0') in ('1', 'true')
+
+    if WORDS_STORAGE_MODE != 'embedded':
+        abort(400, "Semantic search requires WORDS_STORAGE_MODE=embedded")
+    if not query:
+        abort(400, "q is required")
+    if language and language not in SUPPORTED_LANGUAGES:
+        abort(400, "language must be either 'salish' or 'italian'")
+    if not 1 <= k <= SEARCH_MAX_K:
+        abort(400, f"k must be between 1 and {SEARCH_MAX_K}")
+    if field not in SEARCH_FIELDS:
+        abort(400, f"field must be one of {', '.join(SEARCH_FIELDS)}")
+
+    try:
+        query_vector = await run_in_threadpool(embed_query, query.lower())
+        query_filter = build_search_filter(language, query if is_exact else None)
+        points = await search_words_async(request.app.state.client, "words", query_vector, field, k, query_filter)
+    except Exception as e:
+        print(f"Error searching words: {e}")
+        abort(500, "Failed to search words")
+
+    return FastJSONResponse({
+        'query': query,
+        'k': k,
+        'items': [{**point.payload, 'id': point.id, 'score': point.score} for point in points]
+    })
+
+
+async def handle_options(request):
+    return FastJSONResponse({'status': 'ok'})
+
+
+async def ping(request):
+    return FastJSONResponse({"message": "pong"})
+
+
+async def metrics(request):
+    return Response(render_metrics(), headers={'Content-Type': METRICS_CONTENT_TYPE})
+
+
+class RequestTimingMiddleware:
+    """
+    ASGI middleware doing what app.py's before_request/after_request timing hooks do.
+
+    Plain ASGI rather than BaseHTTPMiddleware, so the timer's context variable is visible
+    to the endpoint.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        path = scope["path"] if scope["path"] in ROUTE_PATHS else "unmatched"
+        language = QueryParams(scope["query_string"]).get("language")
+        timer = start_request(f"{scope['method']} {path}", language)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start" and timer.spans:
+                MutableHeaders(scope=message).append("Server-Timing", timer.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            finish_request(timer)
+
+
+ROUTES = [
+    Route('/words', get_words, methods=['GET']),
+    Route('/words', insert_word, methods=['POST']),
+    Route('/words', handle_options, methods=['OPTIONS']),
+    Route('/words:batch', insert_words_batch, methods=['POST']),
+    Route('/words/export', export_words, methods=['GET']),
+    Route('/words/search', search_words_route, methods=['GET']),
+    Route('/ping', ping, methods=['GET']),
+    Route('/metrics', metrics, methods=['GET']),
+]
+ROUTE_PATHS = {route.path for route in ROUTES}
+
+app = Starlette(
+    routes=ROUTES,
+    middleware=[
+        Middleware(RequestTimingMiddleware),
+        Middleware(
+            CORSMiddleware,
+            allow_origins=["http://localhost:5173", "http://127.0.0.1:5173"],
+            allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+            allow_headers=["Content-Type", "Authorization"]
+        )
+    ],
+    exception_handlers={HTTPException: http_error, 500: internal_server_error},
+    lifespan=lifespan,
+)
@@ -0,0 +1,71 @@
+"""
+Re-embeds every existing word in an embedded-mode words collection, in chunks.
+
+Use it after migrating with `python migrate_storage.py --mode embedded`, after changing
+EMBEDDING_MODEL, or for words written by a process that had embeddings switched off.
+Each chunk is read, encoded and written before the next one is read, so memory stays
+at one chunk. The offset of every chunk is printed; pass it to --start-offset to resume.
+
+    python backfill_embeddings.py --chunk-size 256 --batch-size 64 --workers 4
+"""
+import argparse
+import time
+from qdrant_client.http import models
+from utils.embeddings import EMBEDDING_BATCH_SIZE, EMBEDDING_WORKERS, embed_words
+from utils.qdrant_utils import get_qdrant_client
+from utils.schema import word_texts
+
+
+def backfill(client, collection, chunk_size, batch_size, workers, start_offset=None):
+    """
+    Writes fresh named vectors for every point from start_offset on. Returns the number of points updated.
+    """
+    updated = 0
+    offset = start_offset
+    started = time.perf_counter()
+    while True:
+        print(f"Chunk starting at offset: {offset}")
+        records, next_offset = client.scroll(
+            collection_name=collection,
+            limit=chunk_size,
+            offset=offset,
+            with_payload=True,
+            with_vectors=False
+        )
+        if records:
+            vectors = embed_words([word_texts(record.payload) for record in records], batch_size, workers)
+            client.update_vectors(
+                collection_name=collection,
+                points=[
+                    models.PointVectors(id=record.id, vector=vector)
+                    for record, vector in zip(records, vectors)
+                ],
+                wait=True
+            )
+            updated += len(records)
+            rate = updated / (time.perf_counter() - started)
+            print(f"  {updated} points embedded ({rate:.0f} points/s)")
+        if next_offset is None:
+            return updated
+        offset = next_offset
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--collection", default="words")
+    parser.add_argument("--chunk-size", type=int, default=256, help="Points read and written per round trip")
+    parser.add_argument("--batch-size", type=int, default=EMBEDDING_BATCH_SIZE, help="Texts per model call")
+    parser.add_argument("--workers", type=int, default=EMBEDDING_WORKERS, help="Encoding threads")
+    parser.add_argument("--start-offset", default=None, help="Point ID to resume from")
+    args = parser.parse_args()
+
+    start_offset = args.start_offset
+    if start_offset is not None and start_offset.isdigit():
+        start_offset = int(start_offset)
+
+    updated = backfill(get_qdrant_client(), args.collection, args.chunk_size, args.batch_size, args.workers, start_offset)
+    print(f"Backfill complete: {updated} points re-embedded.")
+
+
+if __name__ == "__main__":
+    main()
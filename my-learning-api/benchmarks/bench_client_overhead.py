@@ -0,0 +1,53 @@
+"""
+Micro-benchmark of per-request Qdrant client overhead.
+
+Times the same small request (an exact count on the words collection) three ways:
+  per-call     - a new QdrantClient for every request, as the services used to do
+  shared-rest  - one pooled client from utils.qdrant_utils, REST transport
+  shared-grpc  - one pooled client from utils.qdrant_utils, gRPC transport
+
+Uses the Qdrant settings in config.py. Run from my-learning-api/:
+    python -m benchmarks.bench_client_overhead --requests 500
+"""
+import argparse
+import statistics
+import time
+from qdrant_client import QdrantClient
+from config import QDRANT_URL, QDRANT_API_KEY
+from utils.qdrant_utils import create_qdrant_client
+
+
+def count_words(client, collection):
+    client.count(collection_name=collection, exact=True)
+
+
+def time_requests(label, get_client, collection, requests):
+    latencies = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        count_words(get_client(), collection)
+        latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{label:<12} p50 {statistics.median(latencies):7.2f} ms   p95 {p95:7.2f} ms   total {sum(latencies) / 1000:6.2f} s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--collection", default="words")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--skip-grpc", action="store_true", help="Skip gRPC if port 6334 is not reachable")
+    args = parser.parse_args()
+
+    time_requests("per-call", lambda: QdrantClient(QDRANT_URL, api_key=QDRANT_API_KEY), args.collection, args.requests)
+
+    shared_rest = create_qdrant_client(prefer_grpc=False)
+    time_requests("shared-rest", lambda: shared_rest, args.collection, args.requests)
+
+    if not args.skip_grpc:
+        shared_grpc = create_qdrant_client(prefer_grpc=True)
+        time_requests("shared-grpc", lambda: shared_grpc, args.collection, args.requests)
+
+
+if __name__ == "__main__":
+    main()
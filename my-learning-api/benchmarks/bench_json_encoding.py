@@ -0,0 +1,109 @@
+"""
+Benchmark of JSON encoding for large word lists: encode time and peak memory.
+
+Two shapes are measured at each size:
+  page    - a /words response: {"items": [payload dicts], ...}, as built by get_words
+  export  - the vocabulary loader export: a list of words with target_word/english/language
+
+Baselines are what the code used before utils/fast_json.py: Flask's default provider
+(sorted keys, ASCII escapes) for pages, and json.dumps(indent=4) for exports. Every
+installed encoder from utils.fast_json.ENCODERS is compared against them. Exports are
+also encoded from slotted dataclasses, like vocabulary_loader/utils/fast_json.Word. Peak
+memory includes building the words.
+
+No Qdrant needed. Run from my-learning-api/:
+    python -m benchmarks.bench_json_encoding --sizes 10000 100000 1000000
+"""
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from dataclasses import dataclass
+from utils.fast_json import ENCODERS
+
+
+@dataclass(slots=True)
+class Word:
+    # Mirrors vocabulary_loader/utils/fast_json.Word
+    target_word: str
+    english: str
+    language: str
+
+
+def make_payloads(size):
+    return [
+        {
+            "salish": f"sxʷəl̕{i}",
+            "english": f"word number {i}",
+            "language": "salish" if i % 2 else "italian",
+            "created_at": "2025-01-01T12:00:00.000000",
+        }
+        for i in range(size)
+    ]
+
+
+def make_page(size):
+    return {"page": 1, "per_page": size, "total": size, "count_mode": "exact", "items": make_payloads(size), "next_cursor": None}
+
+
+def make_export_dicts(size):
+    return [{"target_word": p["salish"], "english": p["english"], "language": p["language"]} for p in make_payloads(size)]
+
+
+def make_export_structs(size):
+    return [Word(p["salish"], p["english"], p["language"]) for p in make_payloads(size)]
+
+
+def measure(build, encode, size):
+    """
+    Returns (encode_seconds, peak_mib). Timing and memory are separate runs so
+    tracemalloc overhead does not skew the timing.
+    """
+    data = build(size)
+    gc.collect()
+    started = time.perf_counter()
+    encode(data)
+    elapsed = time.perf_counter() - started
+    del data
+    gc.collect()
+
+    tracemalloc.start()
+    encode(build(size))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / (1024 * 1024)
+
+
+def available_encoders():
+    encoders = {}
+    for name, factory in ENCODERS.items():
+        try:
+            encoders[name] = factory()
+        except ImportError:
+            print(f"({name} not installed, skipped)")
+    return encoders
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    encoders = available_encoders()
+    cases = [("page", "flask-default", make_page, lambda obj: json.dumps(obj, sort_keys=True).encode("utf-8"))]
+    cases += [("page", name, make_page, encode) for name, encode in encoders.items()]
+    cases.append(("export", "json-indent4", make_export_dicts, lambda obj: json.dumps(obj, indent=4, ensure_ascii=False).encode("utf-8")))
+    for name, encode in encoders.items():
+        if name != "json":
+            cases.append(("export", f"{name}+slots", make_export_structs, encode))
+
+    for size in args.sizes:
+        print(f"\n{size} words")
+        for shape, label, build, encode in cases:
+            elapsed, peak = measure(build, encode, size)
+            print(f"  {shape:<7} {label:<15} encode {elapsed * 1000:9.1f} ms   peak {peak:8.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
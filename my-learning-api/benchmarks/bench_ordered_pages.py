@@ -0,0 +1,104 @@
+"""
+Benchmark for ordered /words paging on created_at.
+
+Seeds a scratch collection with synthetic words, then walks the whole collection with
+ordered cursors and reports page latency per depth decile. Flat numbers across deciles
+mean deep pages cost the same as the first one.
+
+Run from my-learning-api/ against a Qdrant server (e.g. opea-comps/qdrant-machine):
+    python -m benchmarks.bench_ordered_pages --url http://localhost:6333 --words 100000
+"""
+import argparse
+import os
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta
+from qdrant_client import QdrantClient
+from qdrant_client.http import models
+from utils.pagination import build_language_filter, decode_cursor, scroll_ordered_page
+
+COLLECTION = "words_bench_ordered"
+SEED_BATCH_SIZE = 1000
+
+
+def seed_collection(client, total_words):
+    """
+    Recreates the scratch collection and fills it with `total_words` synthetic words.
+    """
+    if client.collection_exists(COLLECTION):
+        client.delete_collection(COLLECTION)
+    client.create_collection(
+        collection_name=COLLECTION,
+        vectors_config=models.VectorParams(size=384, distance=models.Distance.COSINE),
+    )
+    client.create_payload_index(COLLECTION, "language", models.PayloadSchemaType.KEYWORD)
+    client.create_payload_index(COLLECTION, "created_at", models.PayloadSchemaType.DATETIME)
+
+    start = datetime(2024, 1, 1)
+    vector = [0.0] * 384
+    for batch_start in range(0, total_words, SEED_BATCH_SIZE):
+        points = [
+            models.PointStruct(
+                id=str(uuid.uuid4()),
+                payload={
+                    "salish": f"word{i}",
+                    "english": f"english{i}",
+                    "language": "italian" if i % 2 else "salish",
+                    "created_at": (start + timedelta(seconds=i)).isoformat()
+                },
+                vector=vector
+            )
+            for i in range(batch_start, min(batch_start + SEED_BATCH_SIZE, total_words))
+        ]
+        client.upsert(collection_name=COLLECTION, points=points, wait=True)
+
+
+def walk_ordered_scan(client, per_page, language):
+    """
+    Reads every page in created_at desc order, returning the latency of each page in ms.
+    """
+    query_filter = build_language_filter(language)
+    latencies = []
+    state = None
+    while True:
+        started = time.perf_counter()
+        _, next_cursor = scroll_ordered_page(client, COLLECTION, per_page, "created_at", "desc", state, query_filter)
+        latencies.append((time.perf_counter() - started) * 1000)
+        if next_cursor is None:
+            return latencies
+        state = decode_cursor(next_cursor)
+
+
+def report(latencies):
+    deciles = 10
+    bucket_size = max(1, len(latencies) // deciles)
+    print(f"{len(latencies)} pages read")
+    print(f"{'depth':>10} {'p50 ms':>8} {'p95 ms':>8}")
+    for bucket in range(0, len(latencies), bucket_size):
+        sample = sorted(latencies[bucket:bucket + bucket_size])
+        p95 = sample[min(len(sample) - 1, int(len(sample) * 0.95))]
+        print(f"{bucket:>10} {statistics.median(sample):>8.2f} {p95:>8.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=os.getenv("QDRANT_URL", "http://localhost:6333"))
+    parser.add_argument("--api-key", default=os.getenv("QDRANT_API_KEY"))
+    parser.add_argument("--words", type=int, default=100_000)
+    parser.add_argument("--per-page", type=int, default=50)
+    parser.add_argument("--language", default=None)
+    parser.add_argument("--skip-seed", action="store_true", help="Reuse the collection from a previous run")
+    args = parser.parse_args()
+
+    client = QdrantClient(args.url, api_key=args.api_key)
+    if not args.skip_seed:
+        started = time.perf_counter()
+        seed_collection(client, args.words)
+        print(f"Seeded {args.words} words in {time.perf_counter() - started:.1f}s")
+
+    report(walk_ordered_scan(client, args.per_page, args.language))
+
+
+if __name__ == "__main__":
+    main()
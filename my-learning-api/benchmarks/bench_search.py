@@ -0,0 +1,103 @@
+"""
+Latency benchmark for semantic word search (GET /words/search).
+
+Seeds a scratch collection in the embedded layout, then times the same steps the route
+runs per request (cached query embedding + filtered Qdrant search) and reports p50/p95
+against the 20 ms p95 target.
+
+Seeding 100k words with the real model takes a while on CPU, so by default stored
+vectors are random unit vectors; pass --real-embeddings to encode them with the model.
+Queries are always embedded with the model.
+
+Run from my-learning-api/ against a Qdrant server:
+    python -m benchmarks.bench_search --url http://localhost:6333 --words 100000
+"""
+import argparse
+import os
+import random
+import statistics
+import time
+import uuid
+import numpy as np
+from qdrant_client import QdrantClient
+from qdrant_client.http import models
+from utils.embeddings import embed_query, embed_words
+from utils.schema import reconcile_collection, words_schema
+from utils.search import build_search_filter, search_words
+
+COLLECTION = "words_bench_search"
+SEED_BATCH_SIZE = 1000
+P95_TARGET_MS = 20
+QUERIES = ["water", "mountain", "hello", "thank you", "tree", "river", "house", "friend", "food", "sun"]
+
+
+def random_vectors(count):
+    vectors = np.random.rand(count, 384).astype(np.float32) - 0.5
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors.tolist()
+
+
+def seed(client, total_words, real_embeddings):
+    if client.collection_exists(COLLECTION):
+        client.delete_collection(COLLECTION)
+    reconcile_collection(client, words_schema("embedded"), collection_name=COLLECTION)
+    for batch_start in range(0, total_words, SEED_BATCH_SIZE):
+        batch = range(batch_start, min(batch_start + SEED_BATCH_SIZE, total_words))
+        pairs = [(f"parola {i}", f"{QUERIES[i % len(QUERIES)]} {i}") for i in batch]
+        if real_embeddings:
+            vectors = embed_words(pairs)
+        else:
+            targets, englishes = random_vectors(len(pairs)), random_vectors(len(pairs))
+            vectors = [{"target_word": t, "english": e} for t, e in zip(targets, englishes)]
+        client.upsert(
+            collection_name=COLLECTION,
+            points=[
+                models.PointStruct(
+                    id=str(uuid.uuid4()),
+                    payload={"salish": target, "english": english, "language": "italian" if i % 2 else "salish"},
+                    vector=vector
+                )
+                for i, (target, english), vector in zip(batch, pairs, vectors)
+            ],
+            wait=True
+        )
+
+
+def time_queries(client, runs, language, exact):
+    latencies = []
+    for _ in range(runs):
+        query = random.choice(QUERIES)
+        started = time.perf_counter()
+        query_vector = embed_query(query)
+        search_words(client, COLLECTION, query_vector, "english", 10, build_search_filter(language, query if exact else None))
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=os.getenv("QDRANT_URL", "http://localhost:6333"))
+    parser.add_argument("--api-key", default=os.getenv("QDRANT_API_KEY"))
+    parser.add_argument("--words", type=int, default=100_000)
+    parser.add_argument("--runs", type=int, default=500)
+    parser.add_argument("--real-embeddings", action="store_true")
+    parser.add_argument("--skip-seed", action="store_true", help="Reuse the collection from a previous run")
+    args = parser.parse_args()
+
+    client = QdrantClient(args.url, api_key=args.api_key)
+    if not args.skip_seed:
+        started = time.perf_counter()
+        seed(client, args.words, args.real_embeddings)
+        print(f"Seeded {args.words} words in {time.perf_counter() - started:.1f}s")
+
+    # Warm the model and the connection before timing
+    time_queries(client, 20, None, False)
+    for label, language, exact in (("unfiltered", None, False), ("language", "italian", False), ("language+exact", "italian", True)):
+        latencies = sorted(time_queries(client, args.runs, language, exact))
+        p95 = latencies[int(len(latencies) * 0.95) - 1]
+        verdict = "ok" if p95 <= P95_TARGET_MS else "over target"
+        print(f"{label:<15} p50 {statistics.median(latencies):6.2f} ms   p95 {p95:6.2f} ms   ({verdict})")
+
+
+if __name__ == "__main__":
+    main()
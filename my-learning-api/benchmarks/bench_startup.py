@@ -0,0 +1,55 @@
+"""
+Benchmark for the per-process schema step run at API startup.
+
+Compares the old behaviour (recreate_collection plus every payload index, which also
+wipes the data) with reconcile_collection against an already reconciled collection.
+
+Run from my-learning-api/ against a Qdrant server:
+    python -m benchmarks.bench_startup --url http://localhost:6333 --runs 10
+"""
+import argparse
+import os
+import statistics
+import time
+from qdrant_client import QdrantClient
+from utils.schema import WORDS_SCHEMA, reconcile_collection
+
+COLLECTION = "words_bench_startup"
+
+
+def legacy_startup(client):
+    client.delete_collection(COLLECTION)
+    client.create_collection(collection_name=COLLECTION, vectors_config=WORDS_SCHEMA["vectors_config"])
+    for field_name, field_schema in WORDS_SCHEMA["payload_indexes"].items():
+        client.create_payload_index(COLLECTION, field_name, field_schema, wait=True)
+
+
+def reconcile_startup(client):
+    reconcile_collection(client, WORDS_SCHEMA, collection_name=COLLECTION)
+
+
+def time_runs(label, startup, client, runs):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        startup(client)
+        timings.append((time.perf_counter() - started) * 1000)
+    print(f"{label:<12} median {statistics.median(timings):8.2f} ms   max {max(timings):8.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=os.getenv("QDRANT_URL", "http://localhost:6333"))
+    parser.add_argument("--api-key", default=os.getenv("QDRANT_API_KEY"))
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    client = QdrantClient(args.url, api_key=args.api_key)
+    reconcile_startup(client)
+    time_runs("recreate", legacy_startup, client, args.runs)
+    time_runs("reconcile", reconcile_startup, client, args.runs)
+    client.delete_collection(COLLECTION)
+
+
+if __name__ == "__main__":
+    main()
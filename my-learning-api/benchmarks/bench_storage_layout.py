@@ -0,0 +1,89 @@
+"""
+Memory/disk comparison of the word storage modes (see utils/schema.py).
+
+Seeds the same synthetic words into one scratch collection per mode and reports what
+Qdrant holds for each: points, indexed vectors, segments, raw vector bytes and, when
+the server's storage directory is mounted locally (--storage-dir), bytes on disk.
+
+Run from my-learning-api/ against a Qdrant server whose storage is mounted locally:
+    docker run -p 6333:6333 -v $(pwd)/qdrant_storage:/qdrant/storage qdrant/qdrant
+    python -m benchmarks.bench_storage_layout --words 100000 --storage-dir ./qdrant_storage
+"""
+import argparse
+import os
+import time
+import uuid
+from datetime import datetime
+from qdrant_client import QdrantClient
+from qdrant_client.http import models
+from utils.schema import reconcile_collection, word_vectors, words_schema
+
+SEED_BATCH_SIZE = 1000
+
+
+def seed(client, collection, mode, total_words):
+    if client.collection_exists(collection):
+        client.delete_collection(collection)
+    reconcile_collection(client, words_schema(mode), collection_name=collection)
+    created_at = datetime.now().isoformat()
+    for batch_start in range(0, total_words, SEED_BATCH_SIZE):
+        batch = range(batch_start, min(batch_start + SEED_BATCH_SIZE, total_words))
+        vectors = word_vectors([(f"word{i}", f"english{i}") for i in batch], mode)
+        client.upsert(
+            collection_name=collection,
+            points=[
+                models.PointStruct(
+                    id=str(uuid.uuid4()),
+                    payload={"salish": f"word{i}", "english": f"english{i}", "language": "salish", "created_at": created_at},
+                    vector=vector
+                )
+                for i, vector in zip(batch, vectors)
+            ],
+            wait=True
+        )
+
+
+def wait_until_optimized(client, collection, timeout_seconds=600):
+    deadline = time.monotonic() + timeout_seconds
+    while time.monotonic() < deadline:
+        if client.get_collection(collection).status == models.CollectionStatus.GREEN:
+            return
+        time.sleep(1)
+
+
+def directory_size(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        total += sum(os.path.getsize(os.path.join(root, name)) for name in files)
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=os.getenv("QDRANT_URL", "http://localhost:6333"))
+    parser.add_argument("--api-key", default=os.getenv("QDRANT_API_KEY"))
+    parser.add_argument("--words", type=int, default=100_000)
+    parser.add_argument("--storage-dir", default=None, help="Qdrant storage directory, if mounted locally")
+    parser.add_argument("--modes", default="dense,vectorless", help="Comma-separated storage modes to compare")
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch collections")
+    args = parser.parse_args()
+
+    client = QdrantClient(args.url, api_key=args.api_key)
+    print(f"{'mode':<12} {'points':>9} {'vectors':>9} {'segments':>9} {'vector MB':>10} {'disk MB':>9}")
+    for mode in args.modes.split(","):
+        collection = f"words_bench_{mode}"
+        seed(client, collection, mode, args.words)
+        wait_until_optimized(client, collection)
+        info = client.get_collection(collection)
+        vector_bytes = info.points_count * 384 * 4 * {"dense": 1, "embedded": 2}.get(mode, 0)
+        disk = "n/a"
+        if args.storage_dir:
+            disk = f"{directory_size(os.path.join(args.storage_dir, 'collections', collection)) / 1e6:.1f}"
+        print(f"{mode:<12} {info.points_count:>9} {info.indexed_vectors_count or 0:>9} "
+              f"{info.segments_count:>9} {vector_bytes / 1e6:>10.1f} {disk:>9}")
+        if not args.keep:
+            client.delete_collection(collection)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Load test comparing the Flask app (app.py) with the ASGI app (asgi_app.py) on GET /words.
+
+Start both against the same Qdrant, with the same number of workers, then run this:
+    gunicorn -c gunicorn.conf.py -b 127.0.0.1:5001 -w 4 app:app
+    uvicorn asgi_app:app --port 5002 --workers 4
+    python -m benchmarks.load_test_words --concurrency 1 8 32 64 --requests 2000
+
+Every request asks for an exact count (?count=exact) so each one makes both the count
+and the scroll round trip; pass --count approx or none to compare cheaper modes.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import httpx
+
+DEFAULT_TARGETS = ["flask=http://127.0.0.1:5001", "asgi=http://127.0.0.1:5002"]
+
+
+async def run_load(base_url, concurrency, requests, params):
+    """
+    Sends `requests` GET /words calls from `concurrency` concurrent clients.
+    Returns (latencies_ms, errors, elapsed_s).
+    """
+    latencies = []
+    errors = 0
+    remaining = requests
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        async def worker():
+            nonlocal remaining, errors
+            while remaining > 0:
+                remaining -= 1
+                started = time.perf_counter()
+                try:
+                    response = await client.get("/words", params=params)
+                    response.raise_for_status()
+                    latencies.append((time.perf_counter() - started) * 1000)
+                except httpx.HTTPError:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return latencies, errors, time.perf_counter() - started
+
+
+def report(label, concurrency, latencies, errors, elapsed):
+    if not latencies:
+        print(f"{label:<8} c={concurrency:<4} all {errors} requests failed")
+        return
+    latencies.sort()
+    p95 = latencies[max(int(len(latencies) * 0.95) - 1, 0)]
+    print(
+        f"{label:<8} c={concurrency:<4} {len(latencies) / elapsed:8.1f} req/s   "
+        f"p50 {statistics.median(latencies):7.2f} ms   p95 {p95:7.2f} ms   errors {errors}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", action="append", help="label=base_url (repeatable)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 64])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--per-page", type=int, default=20)
+    parser.add_argument("--language", default=None)
+    parser.add_argument("--count", default="exact", choices=("exact", "approx", "none"))
+    args = parser.parse_args()
+
+    params = {"per_page": args.per_page, "count": args.count}
+    if args.language:
+        params["language"] = args.language
+
+    targets = [target.split("=", 1) for target in (args.target or DEFAULT_TARGETS)]
+    for concurrency in args.concurrency:
+        for label, base_url in targets:
+            latencies, errors, elapsed = asyncio.run(run_load(base_url, concurrency, args.requests, params))
+            report(label, concurrency, latencies, errors, elapsed)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,18 @@
 import os
 from flask import Flask, g
-from qdrant_client import QdrantClient
-from config import QDRANT_URL, QDRANT_API_KEY  # Import Qdrant config
+from utils.qdrant_utils import get_qdrant_client
 
 # Collection name for Qdrant
 COLLECTION_NAME = "learning_portal_data"
 
 def get_db():
     """
-    Returns a Qdrant client instance, storing it in Flask's g object for reuse within the same request.
+    Returns the process-wide Qdrant client, also storing it in Flask's g object for this request.
     """
     client = getattr(g, '_qdrant_client', None)
     if client is None:
         try:
-            print(f"Connecting to Qdrant at {QDRANT_URL}")
-            client = g._qdrant_client = QdrantClient(
-                url=QDRANT_URL,
-                api_key=QDRANT_API_KEY
-            )
-            print("Qdrant connection successful")
+            client = g._qdrant_client = get_qdrant_client()
         except Exception as e:
             print(f"ERROR connecting to Qdrant: {str(e)}")
             # Return a dummy client or raise the error
@@ -27,9 +21,9 @@ def get_db():
 
 def close_db(e=None):
     """
-    No need to explicitly close Qdrant client, but keeping the function for consistent API.
+    The client is shared by the whole process and reused by later requests, so it is not closed here.
     """
-    pass  # Qdrant client doesn't require explicit closing
+    pass
 
 def init_db():
     """
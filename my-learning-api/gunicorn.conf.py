@@ -0,0 +1,26 @@
+# Gunicorn settings for my-learning-api: gunicorn -c gunicorn.conf.py app:app
+import os
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:5001")
+workers = int(os.getenv("GUNICORN_WORKERS", "4"))
+
+
+def on_starting(server):
+    """
+    Reconciles the Qdrant schema once in the master process, before any worker starts.
+    """
+    from utils.qdrant_utils import get_qdrant_client
+    from utils.schema import WORDS_SCHEMA, reconcile_collection
+
+    actions = reconcile_collection(get_qdrant_client(), WORDS_SCHEMA)
+    server.log.info("Schema reconcile: %s", "; ".join(actions) or "no changes")
+
+
+def child_exit(server, worker):
+    """
+    Drops a dead worker's live gauges when metrics are shared through PROMETHEUS_MULTIPROC_DIR.
+    """
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
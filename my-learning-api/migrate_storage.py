@@ -0,0 +1,95 @@
+"""
+Migrates the words collection between storage modes (see utils/schema.py).
+
+The collection is first copied, vectors included, to '<collection>_migration_backup'.
+It is then recreated in the target layout and refilled from the backup. The backup is
+kept unless --drop-backup is given, so a failed run can be retried or rolled back.
+
+    python migrate_storage.py --mode vectorless
+    WORDS_STORAGE_MODE=vectorless gunicorn -c gunicorn.conf.py app:app
+"""
+import argparse
+import time
+from qdrant_client.http import models
+from utils.qdrant_utils import get_qdrant_client
+from utils.schema import STORAGE_MODES, reconcile_collection, word_texts, word_vectors, words_schema
+
+COPY_BATCH_SIZE = 500
+
+
+def copy_points(client, source, target, vectors_for=None):
+    """
+    Copies every point from source to target, one scroll page at a time.
+
+    vectors_for(records) returns the vectors to write for a page of records; by default
+    the source vectors are kept. Returns the number of points copied.
+    """
+    copied = 0
+    offset = None
+    while True:
+        records, offset = client.scroll(
+            collection_name=source,
+            limit=COPY_BATCH_SIZE,
+            offset=offset,
+            with_payload=True,
+            with_vectors=vectors_for is None
+        )
+        if records:
+            if vectors_for is None:
+                vectors = [record.vector or {} for record in records]
+            else:
+                vectors = vectors_for(records)
+            client.upsert(
+                collection_name=target,
+                points=[
+                    models.PointStruct(id=record.id, payload=record.payload, vector=vector)
+                    for record, vector in zip(records, vectors)
+                ],
+                wait=True
+            )
+            copied += len(records)
+            print(f"  {copied} points copied to '{target}'")
+        if offset is None:
+            return copied
+
+
+def migrate(client, collection, mode, drop_backup=False):
+    backup = f"{collection}_migration_backup"
+    source_info = client.get_collection(collection)
+
+    print(f"Backing up '{collection}' to '{backup}'...")
+    if client.collection_exists(backup):
+        client.delete_collection(backup)
+    client.create_collection(collection_name=backup, vectors_config=source_info.config.params.vectors)
+    backed_up = copy_points(client, collection, backup)
+
+    print(f"Recreating '{collection}' in '{mode}' mode...")
+    client.delete_collection(collection)
+    reconcile_collection(client, words_schema(mode), collection_name=collection)
+    restored = copy_points(
+        client, backup, collection,
+        vectors_for=lambda records: word_vectors([word_texts(record.payload) for record in records], mode)
+    )
+
+    if restored != backed_up:
+        raise RuntimeError(f"Restored {restored} of {backed_up} points; '{backup}' has been kept")
+    if drop_backup:
+        client.delete_collection(backup)
+    return restored
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=STORAGE_MODES, required=True)
+    parser.add_argument("--collection", default="words")
+    parser.add_argument("--drop-backup", action="store_true")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    migrated = migrate(get_qdrant_client(), args.collection, args.mode, args.drop_backup)
+    print(f"Migrated {migrated} points to '{args.mode}' mode in {time.perf_counter() - started:.1f}s.")
+    print(f"Set WORDS_STORAGE_MODE={args.mode} for the API and the vocabulary loader.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import asyncio
+import json
+import pytest
+from qdrant_client import AsyncQdrantClient
+from starlette.testclient import TestClient
+import asgi_app
+from utils.schema import WORDS_SCHEMA
+from utils.word_cache import invalidate_language
+from utils.words import SUPPORTED_LANGUAGES
+
+@pytest.fixture
+def api(monkeypatch):
+    client = AsyncQdrantClient(":memory:")
+    asyncio.run(client.create_collection(collection_name="words", vectors_config=WORDS_SCHEMA["vectors_config"]))
+    monkeypatch.setattr(asgi_app, "create_async_qdrant_client", lambda: client)
+    # Counts and pages are cached per process, so drop anything left by another test
+    for language in SUPPORTED_LANGUAGES:
+        invalidate_language(language)
+    with TestClient(asgi_app.app) as test_client:
+        yield test_client
+
+def test_inserted_words_are_paged_newest_first(api):
+    for i in range(5):
+        response = api.post('/words', json={"salish": f"parola{i}", "english": f"word{i}", "language": "italian"})
+        assert response.status_code == 201
+    response = api.post('/words', json={"salish": "parola0", "english": "word0", "language": "italian"})
+    assert response.json()['status'] == "exists"
+
+    body = api.get('/words?language=italian&per_page=2').json()
+    assert body['total'] == 5
+    seen = [item['english'] for item in body['items']]
+    while body['next_cursor']:
+        body = api.get(f"/words?language=italian&per_page=2&cursor={body['next_cursor']}").json()
+        assert body['total'] is None
+        seen.extend(item['english'] for item in body['items'])
+    assert seen == [f"word{i}" for i in range(4, -1, -1)]
+
+def test_batch_and_export_match_the_flask_app(api):
+    response = api.post('/words:batch?chunk_size=2', json=[
+        {"salish": "gatto", "english": "cat", "language": "italian"},
+        {"salish": "gatto", "english": "cat", "language": "italian"},
+        {"salish": 5, "english": "five", "language": "italian"},
+        {"salish": "cane", "english": "dog", "language": "italian"},
+        {"salish": "sqwel", "english": "bird", "language": "salish"},
+    ])
+    body = response.json()
+    assert [item['status'] for item in body['items']] == ["accepted", "exists", "invalid", "accepted", "accepted"]
+    assert (body['accepted'], body['exists'], body['invalid']) == (3, 1, 1)
+
+    lines = [json.loads(line) for line in api.get('/words/export?language=italian&page_size=1').text.splitlines()]
+    words = [line for line in lines if 'next_cursor' not in line]
+    assert sorted(word['english'] for word in words) == ["cat", "dog"]
+    assert lines[-1] == {'next_cursor': None}
+
+def test_bad_requests_get_json_errors(api):
+    response = api.get('/words?cursor=not-a-cursor')
+    assert response.status_code == 400
+    assert 'error' in response.json()
+    assert api.get('/words?count=sometimes').status_code == 400
+    assert api.post('/words', json={"salish": "gatto"}).status_code == 400
+    assert api.post('/words:batch', content="not json", headers={"Content-Type": "application/json"}).status_code == 400
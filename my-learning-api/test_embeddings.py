@@ -0,0 +1,52 @@
+import threading
+import numpy as np
+import pytest
+from utils import embeddings
+from utils.embeddings import EMBEDDING_DIMENSIONS, embed_words, encode_texts
+
+class FakeModel:
+    """Stands in for the sentence-transformer: one axis per text, so vectors identify texts."""
+
+    def __init__(self):
+        self.batches = []
+        self.lock = threading.Lock()
+
+    def vector(self, text):
+        vector = np.zeros(EMBEDDING_DIMENSIONS)
+        vector[sum(map(ord, text)) % EMBEDDING_DIMENSIONS] = 1.0
+        return vector
+
+    def encode(self, texts, batch_size=None, normalize_embeddings=False):
+        if isinstance(texts, str):
+            return self.vector(texts)
+        with self.lock:
+            self.batches.append(len(texts))
+        return np.array([self.vector(text) for text in texts])
+
+@pytest.fixture
+def model(monkeypatch):
+    model = FakeModel()
+    monkeypatch.setattr(embeddings, "_model", model)
+    return model
+
+def test_encode_texts_keeps_order_across_parallel_batches(model):
+    texts = [f"word{i}" for i in range(10)]
+    vectors = encode_texts(texts, batch_size=3, workers=3)
+    assert sorted(model.batches) == [1, 3, 3, 3]
+    assert vectors == [model.vector(text).tolist() for text in texts]
+    assert encode_texts([]) == []
+
+def test_embed_words_returns_named_vectors_per_pair(model):
+    vectors = embed_words([("gatto", "cat"), ("cane", "dog")], batch_size=64, workers=1)
+    # Both sides are encoded together, in one batch
+    assert model.batches == [4]
+    assert vectors == [
+        {"target_word": model.vector("gatto").tolist(), "english": model.vector("cat").tolist()},
+        {"target_word": model.vector("cane").tolist(), "english": model.vector("dog").tolist()},
+    ]
+
+def test_embedded_storage_mode_stores_named_vectors(model):
+    from utils.schema import word_vectors, words_schema
+    [vectors] = word_vectors([("gatto", "cat")], "embedded")
+    assert set(vectors) == set(words_schema("embedded")["vectors_config"]) == {"target_word", "english"}
+    assert len(vectors["english"]) == EMBEDDING_DIMENSIONS
@@ -0,0 +1,47 @@
+import json
+import uuid
+from datetime import datetime
+import pytest
+import app as words_app
+from utils.fast_json import ENCODERS, load_encoder
+
+PAGE = {
+    'page': 1,
+    'total': 2,
+    'items': [
+        {"salish": "città", "english": "city", "language": "italian", "created_at": "2024-01-01T00:00:00",
+         "id": str(uuid.uuid4())},
+        {"salish": "ʔəsxʷ", "english": "seal", "language": "salish", "id": 7},
+    ],
+    'next_cursor': None,
+}
+
+def available_encoders():
+    for name in ENCODERS:
+        try:
+            yield load_encoder(name)
+        except ImportError:
+            continue
+
+def test_every_encoder_produces_the_same_document():
+    for name, encode in available_encoders():
+        encoded = encode(PAGE)
+        assert isinstance(encoded, bytes), name
+        assert json.loads(encoded) == PAGE, name
+        # Non-ASCII words are written as UTF-8, not \u escapes
+        assert "città".encode("utf-8") in encoded, name
+
+def test_unserializable_values_fall_back_to_str():
+    value = datetime(2024, 1, 2, 3, 4, 5)
+    for name, encode in available_encoders():
+        assert json.loads(encode({"at": value}))["at"] in (str(value), value.isoformat()), name
+
+def test_unknown_encoder_is_rejected():
+    with pytest.raises(ValueError):
+        load_encoder("yaml")
+
+def test_jsonify_uses_the_fast_encoder():
+    with words_app.app.test_request_context():
+        response = words_app.app.json.response(PAGE)
+    assert response.mimetype == "application/json"
+    assert json.loads(response.data) == PAGE
@@ -0,0 +1,49 @@
+import logging
+from utils import metrics
+from utils.metrics import finish_request, span, start_request
+
+def test_request_summary_is_off_by_default(monkeypatch, caplog, capsys):
+    monkeypatch.delenv("WORDS_API_REQUEST_LOGS", raising=False)
+    assert not metrics._env_flag("WORDS_API_REQUEST_LOGS")
+    monkeypatch.setattr(metrics, "REQUEST_LOGS", False)
+    caplog.set_level(logging.DEBUG, logger="words_api.requests")
+    timer = start_request("/words", "italian")
+    with span("count"):
+        pass
+    finish_request(timer)
+    assert caplog.records == []
+    assert capsys.readouterr().out == ""
+
+def test_request_summary_is_logged_at_debug(monkeypatch, caplog, capsys):
+    monkeypatch.setattr(metrics, "REQUEST_LOGS", True)
+    caplog.set_level(logging.DEBUG, logger="words_api.requests")
+    timer = start_request("/words", "italian")
+    with span("count"):
+        pass
+    finish_request(timer)
+    [record] = caplog.records
+    assert record.levelno == logging.DEBUG
+    assert record.getMessage().startswith("/words language=italian total=")
+    assert "count=" in record.getMessage()
+    assert capsys.readouterr().out == ""
+
+def test_words_response_has_server_timing_and_metrics_are_exported(monkeypatch):
+    from qdrant_client import QdrantClient
+    import app as words_app
+    from utils.schema import WORDS_SCHEMA
+    from utils.word_cache import invalidate_language
+
+    client = QdrantClient(":memory:")
+    client.create_collection(collection_name="words", vectors_config=WORDS_SCHEMA["vectors_config"])
+    monkeypatch.setattr(words_app, "get_qdrant_client", lambda: client)
+    invalidate_language("italian")
+    with words_app.app.test_client() as api:
+        response = api.get('/words?language=italian&per_page=5&page=3')
+        assert response.status_code == 200
+        spans = [part.split(";")[0].strip() for part in response.headers["Server-Timing"].split(",")]
+        assert "count" in spans and "skip" in spans
+        assert all(";dur=" in part for part in response.headers["Server-Timing"].split(","))
+
+        text = api.get('/metrics').get_data(as_text=True)
+    assert 'words_api_request_seconds_count{language="italian",route="GET /words"}' in text
+    assert 'words_api_span_seconds_count{language="italian",route="GET /words",span="count"}' in text
@@ -0,0 +1,36 @@
+from qdrant_client import QdrantClient
+from qdrant_client.http import models
+from migrate_storage import migrate
+from utils.pagination import build_language_filter, scroll_page
+from utils.schema import ZERO_VECTOR, word_vectors, words_schema
+from utils.words import build_word_point
+
+def test_dense_words_migrate_to_vectorless_storage():
+    client = QdrantClient(":memory:")
+    client.create_collection(collection_name="words", vectors_config=words_schema("dense")["vectors_config"])
+    client.upsert(
+        collection_name="words",
+        points=[
+            build_word_point(i, f"parola{i}", f"word{i}", "italian" if i % 2 else "salish", ZERO_VECTOR)
+            for i in range(1, 8)
+        ]
+    )
+
+    assert migrate(client, "words", "vectorless", drop_backup=True) == 7
+    assert not client.collection_exists("words_migration_backup")
+    assert client.get_collection("words").config.params.vectors == {}
+    records, _ = client.scroll("words", limit=10, with_payload=True, with_vectors=True)
+    assert sorted(record.payload["english"] for record in records) == [f"word{i}" for i in range(1, 8)]
+    assert all(not record.vector for record in records)
+
+    # Words written in the new layout are read back by the same payload scans
+    point = build_word_point(8, "gatto", "cat", "italian", word_vectors([("gatto", "cat")], "vectorless")[0])
+    client.upsert(collection_name="words", points=[point])
+    records, _ = scroll_page(client, "words", 10, query_filter=build_language_filter("italian"))
+    assert sorted(record.id for record in records) == [1, 3, 5, 7, 8]
+
+def test_word_vectors_per_storage_mode():
+    assert word_vectors([("gatto", "cat"), ("cane", "dog")], "dense") == [ZERO_VECTOR, ZERO_VECTOR]
+    assert word_vectors([("gatto", "cat")], "vectorless") == [{}]
+    assert words_schema("vectorless")["vectors_config"] == {}
+    assert isinstance(words_schema("dense")["vectors_config"], models.VectorParams)
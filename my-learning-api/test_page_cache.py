@@ -0,0 +1,26 @@
+from utils.page_cache import etag_matches, get_page, page_key, store_page
+from utils.word_cache import get_language_version, invalidate_language
+
+def test_cached_page_survives_until_its_language_is_written():
+    key = page_key("italian", None, 1, 10, "created_at", "desc", None)
+    etag = store_page(key, b'{"items": []}', get_language_version("italian"))
+    assert get_page(key).etag == etag
+
+    invalidate_language("salish")
+    assert get_page(key) is not None
+
+    invalidate_language("italian")
+    assert get_page(key) is None
+
+def test_all_languages_page_is_invalidated_by_any_write():
+    key = page_key(None, None, 1, 10, "created_at", "desc", None)
+    store_page(key, b'{"items": []}', get_language_version(None))
+    invalidate_language("salish")
+    assert get_page(key) is None
+
+def test_etag_matches_weak_lists_and_wildcard():
+    assert etag_matches('W/"abc"', '"abc"')
+    assert etag_matches('"x", "abc"', '"abc"')
+    assert etag_matches('*', '"abc"')
+    assert not etag_matches('"x"', '"abc"')
+    assert not etag_matches(None, '"abc"')
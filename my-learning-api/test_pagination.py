@@ -0,0 +1,105 @@
+import pytest
+from qdrant_client import QdrantClient
+from qdrant_client.http import models
+from utils.pagination import (
+    InvalidCursorError,
+    build_language_filter,
+    check_cursor_kind,
+    decode_cursor,
+    encode_cursor,
+    scroll_ordered_page,
+    scroll_page,
+    skip_to_ordered_page,
+    skip_to_page,
+)
+
+@pytest.fixture
+def qdrant():
+    client = QdrantClient(":memory:")
+    client.create_collection(
+        collection_name="words",
+        vectors_config=models.VectorParams(size=4, distance=models.Distance.COSINE),
+    )
+    client.upsert(
+        collection_name="words",
+        points=[
+            models.PointStruct(
+                id=i,
+                payload={
+                    "salish": f"word{i}",
+                    "english": f"english{i}",
+                    "language": "italian" if i % 2 else "salish",
+                    # Several points share each timestamp so ties cross page boundaries
+                    "created_at": f"2024-01-{1 + i // 4:02d}T00:00:00"
+                },
+                vector=[0.0] * 4
+            )
+            for i in range(1, 26)
+        ]
+    )
+    return client
+
+def test_cursor_round_trip():
+    token = encode_cursor({"o": "5f0c1e1a-0000-4000-8000-000000000000"})
+    assert decode_cursor(token) == {"o": "5f0c1e1a-0000-4000-8000-000000000000"}
+
+def test_decode_invalid_cursor():
+    with pytest.raises(InvalidCursorError):
+        decode_cursor("not-a-cursor")
+
+def test_cursor_kind_must_match_the_scan():
+    check_cursor_kind({"o": 5}, ordered=False)
+    check_cursor_kind({"o": "2024-01-01T00:00:00", "s": [1], "k": "created_at", "d": "desc"}, ordered=True)
+    with pytest.raises(InvalidCursorError):
+        check_cursor_kind({"o": 5}, ordered=True)
+    with pytest.raises(InvalidCursorError):
+        check_cursor_kind({"o": "2024-01-01T00:00:00", "k": "created_at", "d": "desc"}, ordered=False)
+    with pytest.raises(InvalidCursorError):
+        check_cursor_kind({"o": "x", "k": "english", "d": "desc"}, ordered=True)
+
+def test_ordered_scan_rejects_invalid_position(qdrant):
+    state = {"o": "not-a-date", "s": [], "k": "created_at", "d": "asc"}
+    with pytest.raises(InvalidCursorError):
+        scroll_ordered_page(qdrant, "words", 5, "created_at", "asc", state)
+
+def test_cursor_scan_visits_every_point_once(qdrant):
+    query_filter = build_language_filter("italian")
+    seen = []
+    offset = None
+    while True:
+        records, next_cursor = scroll_page(qdrant, "words", 5, offset, query_filter)
+        seen.extend(record.id for record in records)
+        if next_cursor is None:
+            break
+        offset = decode_cursor(next_cursor)["o"]
+    assert sorted(seen) == list(range(1, 26, 2))
+
+def test_skip_to_page_matches_cursor_scan(qdrant):
+    offset, has_more = skip_to_page(qdrant, "words", 3, 5)
+    records, _ = scroll_page(qdrant, "words", 5, offset)
+    assert has_more
+    assert [record.id for record in records] == [11, 12, 13, 14, 15]
+
+def test_skip_to_page_past_end(qdrant):
+    _, has_more = skip_to_page(qdrant, "words", 6, 5)
+    assert not has_more
+
+def test_ordered_scan_is_globally_sorted_across_ties(qdrant):
+    seen = []
+    state = None
+    while True:
+        records, next_cursor = scroll_ordered_page(qdrant, "words", 3, "created_at", "desc", state)
+        seen.extend(records)
+        if next_cursor is None:
+            break
+        state = decode_cursor(next_cursor)
+    assert sorted(record.id for record in seen) == list(range(1, 26))
+    created = [record.payload["created_at"] for record in seen]
+    assert created == sorted(created, reverse=True)
+
+def test_skip_to_ordered_page_matches_ordered_scan(qdrant):
+    first_pages, _ = scroll_ordered_page(qdrant, "words", 9, "created_at", "asc")
+    state, has_more = skip_to_ordered_page(qdrant, "words", 3, 3, "created_at", "asc")
+    records, _ = scroll_ordered_page(qdrant, "words", 3, "created_at", "asc", state)
+    assert has_more
+    assert [record.id for record in records] == [record.id for record in first_pages[6:9]]
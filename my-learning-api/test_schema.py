@@ -0,0 +1,54 @@
+import pytest
+from qdrant_client import QdrantClient
+from qdrant_client.http import models
+from utils.schema import WORDS_PAYLOAD_INDEXES, reconcile_collection, words_schema
+
+@pytest.fixture
+def qdrant(monkeypatch):
+    """In-memory client that remembers payload indexes, which local Qdrant does not keep."""
+    client = QdrantClient(":memory:")
+    indexes = {}
+    get_collection = client.get_collection
+
+    def create_payload_index(collection_name, field_name, field_schema, wait=True):
+        indexes[field_name] = field_schema
+
+    def get_collection_with_indexes(collection_name):
+        info = get_collection(collection_name)
+        payload_schema = {
+            field: models.PayloadIndexInfo(data_type=data_type, points=0) for field, data_type in indexes.items()
+        }
+        return info.model_copy(update={"payload_schema": payload_schema})
+
+    monkeypatch.setattr(client, "create_payload_index", create_payload_index)
+    monkeypatch.setattr(client, "get_collection", get_collection_with_indexes)
+    client.indexes = indexes
+    return client
+
+def test_reconcile_creates_a_missing_collection_with_its_indexes(qdrant):
+    actions = reconcile_collection(qdrant, words_schema("dense"))
+    assert actions[0] == "created collection 'words'"
+    assert qdrant.indexes == WORDS_PAYLOAD_INDEXES
+    assert reconcile_collection(qdrant, words_schema("dense")) == []
+
+def test_reconcile_adds_missing_and_retypes_wrong_indexes_without_losing_points(qdrant):
+    schema = words_schema("dense")
+    qdrant.create_collection(collection_name="words", vectors_config=schema["vectors_config"])
+    qdrant.upsert(collection_name="words", points=[models.PointStruct(id=1, payload={"language": "italian"}, vector=[0.1] * 384)])
+    qdrant.indexes.update({"language": models.PayloadSchemaType.KEYWORD, "created_at": models.PayloadSchemaType.KEYWORD})
+
+    actions = reconcile_collection(qdrant, schema)
+    assert "created datetime index on 'created_at'" in actions
+    assert "created text index on 'english'" in actions
+    assert not any("'language'" in action for action in actions)
+    assert qdrant.indexes == WORDS_PAYLOAD_INDEXES
+    assert qdrant.count("words").count == 1
+
+def test_reconcile_leaves_a_different_vector_config_alone(qdrant, capsys):
+    qdrant.create_collection(
+        collection_name="words",
+        vectors_config=models.VectorParams(size=4, distance=models.Distance.COSINE),
+    )
+    reconcile_collection(qdrant, words_schema("dense"))
+    assert "differs from the declared schema" in capsys.readouterr().out
+    assert qdrant.get_collection("words").config.params.vectors.size == 4
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+from qdrant_client import QdrantClient
+import app as words_app
+from utils import embeddings
+from utils.embeddings import EMBEDDING_DIMENSIONS
+from utils.schema import word_vectors, words_schema
+from utils.words import build_word_point
+
+class FakeModel:
+    """One axis per text, so a query only scores against identical text."""
+
+    def vector(self, text):
+        vector = np.zeros(EMBEDDING_DIMENSIONS)
+        vector[sum(map(ord, text)) % EMBEDDING_DIMENSIONS] = 1.0
+        return vector
+
+    def encode(self, texts, batch_size=None, normalize_embeddings=False):
+        if isinstance(texts, str):
+            return self.vector(texts)
+        return np.array([self.vector(text) for text in texts])
+
+@pytest.fixture
+def api(monkeypatch):
+    monkeypatch.setattr(embeddings, "_model", FakeModel())
+    embeddings.embed_query.cache_clear()
+    client = QdrantClient(":memory:")
+    client.create_collection(collection_name="words", vectors_config=words_schema("embedded")["vectors_config"])
+    words = [("gatto", "cat", "italian"), ("cane", "dog", "italian"), ("sqwel", "cat", "salish")]
+    vectors = word_vectors([(salish, english) for salish, english, _ in words], "embedded")
+    client.upsert(
+        collection_name="words",
+        points=[build_word_point(i, *word, vector) for i, (word, vector) in enumerate(zip(words, vectors), 1)]
+    )
+    monkeypatch.setattr(words_app, "get_qdrant_client", lambda: client)
+    monkeypatch.setattr(words_app, "WORDS_STORAGE_MODE", "embedded")
+    with words_app.app.test_client() as test_client:
+        yield test_client
+    embeddings.embed_query.cache_clear()
+
+def test_search_ranks_the_matching_word_first(api):
+    body = api.get('/words/search?q=Cat&language=italian&k=2').get_json()
+    assert [item['salish'] for item in body['items']] == ["gatto", "cane"]
+    assert body['items'][0]['score'] == pytest.approx(1.0)
+
+    body = api.get('/words/search?q=sqwel&field=target_word').get_json()
+    assert body['items'][0]['english'] == "cat"
+    assert body['items'][0]['language'] == "salish"
+
+def test_search_rejects_bad_parameters(api, monkeypatch):
+    assert api.get('/words/search').status_code == 400
+    assert api.get('/words/search?q=cat&k=0').status_code == 400
+    assert api.get('/words/search?q=cat&field=salish').status_code == 400
+    assert api.get('/words/search?q=cat&language=french').status_code == 400
+    monkeypatch.setattr(words_app, "WORDS_STORAGE_MODE", "dense")
+    assert api.get('/words/search?q=cat').status_code == 400
@@ -0,0 +1,114 @@
+import gzip
+import json
+import threading
+import time
+import pytest
+from qdrant_client import QdrantClient
+from qdrant_client.http import models
+from utils import snapshots
+from utils.snapshots import choose_encoding, get_snapshot
+from utils.word_cache import invalidate_language
+
+@pytest.fixture
+def qdrant(monkeypatch):
+    monkeypatch.setattr(snapshots, "_snapshots", {})
+    monkeypatch.setattr(snapshots, "_building", {})
+    client = QdrantClient(":memory:")
+    client.create_collection(
+        collection_name="words",
+        vectors_config=models.VectorParams(size=4, distance=models.Distance.COSINE),
+    )
+    add_word(client, 1, "gatto", "cat")
+    add_word(client, 2, "cane", "dog")
+    yield client
+    # Let background rebuilds finish before the next test swaps the caches out
+    for language in list(snapshots._building):
+        wait_for_rebuild(language)
+
+def add_word(client, point_id, salish, english):
+    client.upsert(
+        collection_name="words",
+        points=[models.PointStruct(id=point_id, payload={"salish": salish, "english": english, "language": "italian"}, vector=[0.0] * 4)]
+    )
+
+def wait_for_rebuild(language):
+    with snapshots._lock:
+        building = snapshots._building.get(language)
+    if building is not None:
+        assert building.wait(5)
+
+def decode(snapshot):
+    return json.loads(gzip.decompress(snapshot.blobs["gzip"]))
+
+def test_snapshot_holds_every_word_of_the_language(qdrant):
+    snapshot = get_snapshot(qdrant, "words", "italian")
+    document = decode(snapshot)
+    assert document["total"] == 2
+    assert sorted(item["english"] for item in document["items"]) == ["cat", "dog"]
+    coding, blob = choose_encoding(snapshot, "gzip")
+    assert (coding, blob) == ("gzip", snapshot.blobs["gzip"])
+    assert choose_encoding(snapshot, None)[0] is None
+
+def test_first_build_is_fast_then_rebuilt_at_full_compression(qdrant, monkeypatch):
+    builds = []
+    build_snapshot = snapshots.build_snapshot
+
+    def recording_build(client, collection, language, **compression):
+        builds.append(compression.get("brotli_quality", snapshots.SNAPSHOT_BROTLI_QUALITY))
+        return build_snapshot(client, collection, language, **compression)
+
+    monkeypatch.setattr(snapshots, "build_snapshot", recording_build)
+    first = get_snapshot(qdrant, "words", "italian")
+    wait_for_rebuild("italian")
+    assert builds == [snapshots.INLINE_BROTLI_QUALITY, snapshots.SNAPSHOT_BROTLI_QUALITY]
+    # Same document, so the ETag is unchanged by the recompression
+    assert get_snapshot(qdrant, "words", "italian").etag == first.etag
+
+def test_concurrent_first_requests_share_one_build(qdrant, monkeypatch):
+    builds = []
+    build_snapshot = snapshots.build_snapshot
+
+    def slow_build(client, collection, language, **compression):
+        builds.append(language)
+        time.sleep(0.1)
+        return build_snapshot(client, collection, language, **compression)
+
+    monkeypatch.setattr(snapshots, "build_snapshot", slow_build)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(get_snapshot(qdrant, "words", "italian"))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(results) == 4
+    assert len({snapshot.etag for snapshot in results}) == 1
+    wait_for_rebuild("italian")
+    # One inline build plus its background recompression
+    assert builds == ["italian", "italian"]
+
+def test_write_serves_the_stale_snapshot_until_the_rebuild_lands(qdrant):
+    first = get_snapshot(qdrant, "words", "italian")
+    wait_for_rebuild("italian")
+
+    add_word(qdrant, 3, "uccello", "bird")
+    invalidate_language("italian")
+    assert get_snapshot(qdrant, "words", "italian").etag == first.etag
+    wait_for_rebuild("italian")
+
+    rebuilt = get_snapshot(qdrant, "words", "italian")
+    assert rebuilt.etag != first.etag
+    assert decode(rebuilt)["total"] == 3
+
+def test_snapshot_endpoint_answers_matching_etag_with_304(qdrant, monkeypatch):
+    import app as words_app
+    monkeypatch.setattr(words_app, "get_qdrant_client", lambda: qdrant)
+    with words_app.app.test_client() as api:
+        response = api.get('/words?format=snapshot&language=italian', headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert json.loads(gzip.decompress(response.data))["total"] == 2
+        etag = response.headers["ETag"]
+
+        response = api.get('/words?format=snapshot&language=italian', headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
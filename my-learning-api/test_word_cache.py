@@ -0,0 +1,57 @@
+import pytest
+from qdrant_client import QdrantClient
+from qdrant_client.http import models
+from utils.pagination import build_language_filter
+from utils.word_cache import get_word_count, invalidate_language
+
+@pytest.fixture
+def qdrant(monkeypatch):
+    client = QdrantClient(":memory:")
+    client.create_collection(
+        collection_name="words",
+        vectors_config=models.VectorParams(size=4, distance=models.Distance.COSINE),
+    )
+    client.upsert(
+        collection_name="words",
+        points=[
+            models.PointStruct(id=i, payload={"language": "italian" if i % 2 else "salish"}, vector=[0.0] * 4)
+            for i in range(1, 8)
+        ]
+    )
+    counts = []
+    count = client.count
+
+    def counting(**kwargs):
+        counts.append(kwargs["exact"])
+        return count(**kwargs)
+
+    monkeypatch.setattr(client, "count", counting)
+    client.counts = counts
+    for language in ("italian", "salish"):
+        invalidate_language(language)
+    return client
+
+def test_count_is_cached_until_its_language_is_written(qdrant):
+    italian = build_language_filter("italian")
+    assert get_word_count(qdrant, "words", "italian", "exact", italian) == 4
+    assert get_word_count(qdrant, "words", "italian", "exact", italian) == 4
+    assert qdrant.counts == [True]
+
+    invalidate_language("salish")
+    assert get_word_count(qdrant, "words", "italian", "exact", italian) == 4
+    assert qdrant.counts == [True]
+
+    invalidate_language("italian")
+    assert get_word_count(qdrant, "words", "italian", "exact", italian) == 4
+    assert qdrant.counts == [True, True]
+
+def test_all_languages_count_is_invalidated_by_any_write(qdrant):
+    assert get_word_count(qdrant, "words", None, "exact") == 7
+    invalidate_language("salish")
+    assert get_word_count(qdrant, "words", None, "exact") == 7
+    assert qdrant.counts == [True, True]
+
+def test_count_modes(qdrant):
+    assert get_word_count(qdrant, "words", "salish", "none") is None
+    assert get_word_count(qdrant, "words", "salish", "approx", build_language_filter("salish")) == 3
+    assert qdrant.counts == [False]
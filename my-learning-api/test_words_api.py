@@ -0,0 +1,199 @@
+import json
+import pytest
+from qdrant_client import QdrantClient
+from qdrant_client.http import models
+import app as words_app
+from utils.batch import BatchParseError, parse_batch_body
+from utils.pagination import encode_cursor
+from utils.schema import WORDS_SCHEMA, ZERO_VECTOR
+from utils.word_cache import invalidate_language
+from utils.words import SUPPORTED_LANGUAGES
+
+@pytest.fixture
+def qdrant(monkeypatch):
+    client = QdrantClient(":memory:")
+    client.create_collection(collection_name="words", vectors_config=WORDS_SCHEMA["vectors_config"])
+    monkeypatch.setattr(words_app, "get_qdrant_client", lambda: client)
+    # Counts and pages are cached per process, so drop anything left by another test
+    for language in SUPPORTED_LANGUAGES:
+        invalidate_language(language)
+    return client
+
+@pytest.fixture
+def api(qdrant):
+    words_app.app.config['TESTING'] = True
+    with words_app.app.test_client() as test_client:
+        yield test_client
+
+def add_words(client, payloads, first_id=1):
+    client.upsert(
+        collection_name="words",
+        points=[
+            models.PointStruct(id=first_id + i, payload=payload, vector=ZERO_VECTOR)
+            for i, payload in enumerate(payloads)
+        ]
+    )
+
+def test_words_are_listed_in_created_at_order(qdrant, api):
+    add_words(qdrant, [
+        {"salish": f"parola{i}", "english": f"word{i}", "language": "italian",
+         "created_at": f"2024-01-{i:02d}T00:00:00"}
+        for i in range(1, 8)
+    ])
+    response = api.get('/words?language=italian&per_page=3')
+    body = response.get_json()
+    assert body['total'] == 7
+    assert [item['english'] for item in body['items']] == ["word7", "word6", "word5"]
+
+    seen = [item['english'] for item in body['items']]
+    while body['next_cursor']:
+        body = api.get(f"/words?language=italian&per_page=3&cursor={body['next_cursor']}").get_json()
+        seen.extend(item['english'] for item in body['items'])
+    assert seen == [f"word{i}" for i in range(7, 0, -1)]
+
+def test_words_without_created_at_are_still_listed(qdrant, api):
+    add_words(qdrant, [
+        {"salish": "gatto", "english": "cat", "language": "italian", "created_at": "2024-01-01T00:00:00"},
+        # Edited by an older vocabulary loader, which wrote only updated_at
+        {"target_word": "cane", "english": "dog", "language": "italian", "updated_at": "2024-01-02T00:00:00"},
+    ])
+    body = api.get('/words?language=italian').get_json()
+    assert body['total'] == 2
+    assert sorted(item['english'] for item in body['items']) == ["cat", "dog"]
+
+def test_unordered_cursor_is_rejected_by_the_ordered_scan(qdrant, api):
+    add_words(qdrant, [
+        {"salish": "gatto", "english": "cat", "language": "italian", "created_at": "2024-01-01T00:00:00"},
+    ])
+    response = api.get(f"/words?language=italian&cursor={encode_cursor({'o': 1})}")
+    assert response.status_code == 400
+
+def test_parse_batch_body_accepts_lists_objects_and_ndjson():
+    words = [{"salish": "gatto", "english": "cat", "language": "italian"}]
+    assert parse_batch_body(json.dumps(words), is_ndjson=False) == words
+    assert parse_batch_body(json.dumps({"words": words}), is_ndjson=False) == words
+    assert parse_batch_body(json.dumps(words[0]) + "\n\n", is_ndjson=True) == words
+    with pytest.raises(BatchParseError):
+        parse_batch_body('{"word": "gatto"}', is_ndjson=False)
+    with pytest.raises(BatchParseError):
+        parse_batch_body("not json", is_ndjson=True)
+
+def test_batch_reports_a_status_per_item(qdrant, api):
+    response = api.post('/words:batch', json=[
+        {"salish": "gatto", "english": "cat", "language": "italian"},
+        {"salish": "gatto", "english": "cat", "language": "italian"},
+        {"salish": "cane", "language": "italian"},
+        {"salish": "cane", "english": "dog", "language": "french"},
+        {"salish": "cane", "english": "dog", "language": "italian"},
+    ])
+    body = response.get_json()
+    assert response.status_code == 200
+    assert [item['status'] for item in body['items']] == ["accepted", "exists", "invalid", "invalid", "accepted"]
+    assert (body['status'], body['accepted'], body['exists'], body['invalid'], body['failed']) == ("partial", 2, 1, 2, 0)
+    assert body['items'][1]['id'] == body['items'][0]['id']
+    assert qdrant.count("words").count == 2
+
+def test_batch_skips_words_that_are_already_stored(qdrant, api):
+    words = [{"salish": f"parola{i}", "english": f"word{i}", "language": "italian"} for i in range(3)]
+    api.post('/words:batch', json=words[:2])
+    body = api.post('/words:batch', data="\n".join(json.dumps(word) for word in words),
+                    content_type="application/x-ndjson").get_json()
+    assert [item['status'] for item in body['items']] == ["exists", "exists", "accepted"]
+    assert body['status'] == "success"
+    assert qdrant.count("words").count == 3
+
+def test_batch_is_upserted_in_chunks(qdrant, api, monkeypatch):
+    upserted = []
+    upsert = qdrant.upsert
+
+    def failing_upsert(collection_name, points, wait):
+        upserted.append(len(points))
+        if any(point.payload['salish'] == "parola2" for point in points):
+            raise RuntimeError("unavailable")
+        return upsert(collection_name=collection_name, points=points, wait=wait)
+
+    monkeypatch.setattr(qdrant, "upsert", failing_upsert)
+    words = [{"salish": f"parola{i}", "english": f"word{i}", "language": "italian"} for i in range(5)]
+    body = api.post('/words:batch?chunk_size=2', json={"words": words}).get_json()
+    assert upserted == [2, 2, 1]
+    assert [item['status'] for item in body['items']] == ["accepted", "accepted", "failed", "failed", "accepted"]
+    assert body['status'] == "partial"
+    assert qdrant.count("words").count == 3
+
+def test_batch_rejects_invalid_bodies_and_limits(api):
+    assert api.post('/words:batch', data="not json", content_type="application/json").status_code == 400
+    assert api.post('/words:batch', json=[]).status_code == 400
+    word = {"salish": "gatto", "english": "cat", "language": "italian"}
+    assert api.post('/words:batch?chunk_size=0', json=[word]).status_code == 400
+
+def test_non_string_word_is_rejected(qdrant, api):
+    response = api.post('/words', json={"salish": 5, "english": "five", "language": "italian"})
+    assert response.status_code == 400
+    response = api.post('/words', json={"salish": "cinque", "english": ["five"], "language": "italian"})
+    assert response.status_code == 400
+    assert qdrant.count("words").count == 0
+
+def test_batch_marks_a_non_string_item_invalid(qdrant, api):
+    response = api.post('/words:batch', json=[
+        {"salish": "gatto", "english": "cat", "language": "italian"},
+        {"salish": 5, "english": "five", "language": "italian"},
+        {"salish": "cane", "english": "dog", "language": "italian"},
+    ])
+    body = response.get_json()
+    assert response.status_code == 200
+    assert [item['status'] for item in body['items']] == ["accepted", "invalid", "accepted"]
+    assert qdrant.count("words").count == 2
+
+def test_each_process_gets_its_own_client(monkeypatch):
+    from utils import qdrant_utils
+    created = []
+    monkeypatch.setattr(qdrant_utils, "_clients", {})
+    monkeypatch.setattr(qdrant_utils, "create_qdrant_client", lambda: created.append(object()) or created[-1])
+    monkeypatch.setattr(qdrant_utils.os, "getpid", lambda: 100)
+    parent = qdrant_utils.get_qdrant_client()
+    assert qdrant_utils.get_qdrant_client() is parent
+    # A forked worker has a new pid and must not reuse the parent's client
+    monkeypatch.setattr(qdrant_utils.os, "getpid", lambda: 101)
+    assert qdrant_utils.get_qdrant_client() is not parent
+    assert not hasattr(words_app, "client")
+
+def test_count_mode_parameter(qdrant, api):
+    add_words(qdrant, [
+        {"salish": "gatto", "english": "cat", "language": "italian", "created_at": "2024-01-01T00:00:00"},
+    ])
+    body = api.get('/words?language=italian&count=none').get_json()
+    assert (body['total'], body['count_mode'], len(body['items'])) == (None, 'none', 1)
+    assert api.get('/words?language=italian&count=approx').get_json()['total'] == 1
+    assert api.get('/words?count=sometimes').status_code == 400
+
+def read_export(response):
+    lines = [json.loads(line) for line in response.data.splitlines()]
+    words = [line for line in lines if 'next_cursor' not in line]
+    cursors = [line['next_cursor'] for line in lines if 'next_cursor' in line]
+    return words, cursors
+
+def test_export_streams_every_word_with_checkpoints(qdrant, api):
+    add_words(qdrant, [
+        {"salish": f"parola{i}", "english": f"word{i}", "language": "italian" if i % 2 else "salish"}
+        for i in range(7)
+    ])
+    response = api.get('/words/export?page_size=2')
+    assert response.mimetype == "application/x-ndjson"
+    words, cursors = read_export(response)
+    assert sorted(word['english'] for word in words) == [f"word{i}" for i in range(7)]
+    assert all('id' in word for word in words)
+    assert len(cursors) == 4 and cursors[-1] is None
+
+    # Resuming from a checkpoint exports only what came after it
+    resumed, _ = read_export(api.get(f'/words/export?page_size=2&cursor={cursors[1]}'))
+    assert [word['id'] for word in resumed] == [word['id'] for word in words[4:]]
+
+    italian, _ = read_export(api.get('/words/export?language=italian'))
+    assert sorted(word['english'] for word in italian) == ["word1", "word3", "word5"]
+
+def test_export_rejects_bad_parameters(api):
+    assert api.get('/words/export?language=french').status_code == 400
+    assert api.get('/words/export?page_size=0').status_code == 400
+    assert api.get('/words/export?cursor=not-a-cursor').status_code == 400
+    ordered = encode_cursor({"o": "2024-01-01T00:00:00", "s": [], "k": "created_at", "d": "desc"})
+    assert api.get(f'/words/export?cursor={ordered}').status_code == 400
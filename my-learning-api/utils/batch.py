@@ -0,0 +1,74 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+
+class BatchParseError(ValueError):
+    """Raised when a batch request body is neither a JSON list nor NDJSON."""
+
+
+def parse_batch_body(body, is_ndjson):
+    """
+    Parses a batch request body into a list of items.
+
+    JSON bodies may be a list or an object with a "words" list. NDJSON bodies hold one
+    JSON object per line; blank lines are ignored.
+    """
+    try:
+        if is_ndjson:
+            return [json.loads(line) for line in body.splitlines() if line.strip()]
+        data = json.loads(body)
+    except ValueError as e:
+        raise BatchParseError(f"Invalid batch body: {e}") from e
+
+    if isinstance(data, dict):
+        data = data.get('words')
+    if not isinstance(data, list):
+        raise BatchParseError("Batch body must be a JSON list or an object with a 'words' list")
+    return data
+
+
+def chunked(items, chunk_size):
+    """
+    Splits a list into consecutive chunks of at most chunk_size items.
+    """
+    return [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+
+
+def upsert_in_chunks(client, collection, points, chunk_size=500, parallel=1, wait=False):
+    """
+    Upserts points in chunks, optionally sending several chunks at once.
+
+    Returns one error (or None) per chunk, in the order of chunked(points, chunk_size).
+    With wait=False Qdrant acknowledges a chunk once it is queued, not once it is indexed.
+    """
+    chunks = chunked(points, chunk_size)
+
+    def upsert_chunk(chunk):
+        try:
+            client.upsert(collection_name=collection, points=chunk, wait=wait)
+            return None
+        except Exception as e:
+            return str(e)
+
+    if parallel <= 1 or len(chunks) <= 1:
+        return [upsert_chunk(chunk) for chunk in chunks]
+    with ThreadPoolExecutor(max_workers=min(parallel, len(chunks))) as executor:
+        return list(executor.map(upsert_chunk, chunks))
+
+
+async def upsert_in_chunks_async(client, collection, points, chunk_size=500, parallel=1, wait=False):
+    """
+    Async version of upsert_in_chunks for AsyncQdrantClient.
+    """
+    semaphore = asyncio.Semaphore(max(1, parallel))
+
+    async def upsert_chunk(chunk):
+        async with semaphore:
+            try:
+                await client.upsert(collection_name=collection, points=chunk, wait=wait)
+                return None
+            except Exception as e:
+                return str(e)
+
+    return await asyncio.gather(*(upsert_chunk(chunk) for chunk in chunked(points, chunk_size)))
@@ -0,0 +1,66 @@
+import json
+import os
+from flask.json.provider import DefaultJSONProvider
+
+# JSON encoder for API responses: "auto" (orjson, then msgspec, then json), or one of ENCODERS
+JSON_ENCODER = os.getenv("JSON_ENCODER", "auto")
+
+
+def _json_encode(obj):
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def _orjson_encoder():
+    import orjson
+    return lambda obj: orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _msgspec_encoder():
+    import msgspec
+    encoder = msgspec.json.Encoder(enc_hook=str)
+    return encoder.encode
+
+
+# name -> factory returning an encode(obj) -> bytes function; factories import lazily
+ENCODERS = {
+    "orjson": _orjson_encoder,
+    "msgspec": _msgspec_encoder,
+    "json": lambda: _json_encode,
+}
+
+
+def load_encoder(name=JSON_ENCODER):
+    """
+    Returns (name, encode) for the requested encoder.
+
+    "auto" picks the first of orjson and msgspec that is installed, falling back to the
+    standard library so the API runs without either. Naming one explicitly fails loudly
+    if it is missing.
+    """
+    if name != "auto":
+        if name not in ENCODERS:
+            raise ValueError(f"JSON_ENCODER must be 'auto' or one of {', '.join(ENCODERS)}")
+        return name, ENCODERS[name]()
+    for candidate in ("orjson", "msgspec"):
+        try:
+            return candidate, ENCODERS[candidate]()
+        except ImportError:
+            continue
+    return "json", _json_encode
+
+
+ENCODER_NAME, encode_json = load_encoder()
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider that serializes with encode_json, so jsonify() uses the fast
+    encoder too. Keys are not sorted. Parsing is left to the standard library.
+    """
+
+    def dumps(self, obj, **kwargs):
+        return encode_json(obj).decode("utf-8")
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(encode_json(obj), mimetype=self.mimetype)
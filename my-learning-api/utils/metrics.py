@@ -0,0 +1,123 @@
+import logging
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Histogram, generate_latest, multiprocess
+
+def _env_flag(name, default="false"):
+    return os.getenv(name, default).lower() in ("1", "true", "yes")
+
+# Per-request debug lines, logged at DEBUG; off by default so the hot path does no
+# log I/O. Set WORDS_API_REQUEST_LOGS=1 to see them.
+REQUEST_LOGS = _env_flag("WORDS_API_REQUEST_LOGS")
+
+logger = logging.getLogger("words_api.requests")
+if REQUEST_LOGS:
+    logger.setLevel(logging.DEBUG)
+    if not logger.handlers:
+        logger.addHandler(logging.StreamHandler())
+
+# Languages used as metric labels; anything else is reported as "other"
+LANGUAGE_LABELS = ("salish", "italian")
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+REQUEST_SECONDS = Histogram(
+    "words_api_request_seconds",
+    "Time spent handling a request",
+    ["route", "language"],
+    buckets=LATENCY_BUCKETS
+)
+SPAN_SECONDS = Histogram(
+    "words_api_span_seconds",
+    "Time spent in one step of a request (count, scroll, sort, serialize)",
+    ["route", "language", "span"],
+    buckets=LATENCY_BUCKETS
+)
+
+CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+
+class RequestTimer:
+    """Timing spans recorded while handling one request."""
+
+    def __init__(self, route, language):
+        self.route = route
+        self.language = language
+        self.started = time.perf_counter()
+        self.spans = []  # (name, seconds), in the order they finished
+
+    def server_timing(self):
+        """Formats the spans as a Server-Timing header value (durations in ms)."""
+        return ", ".join(f"{name};dur={seconds * 1000:.2f}" for name, seconds in self.spans)
+
+
+_current = ContextVar("words_api_request_timer", default=None)
+
+
+def language_label(language):
+    if not language:
+        return "all"
+    return language if language in LANGUAGE_LABELS else "other"
+
+
+def start_request(route, language):
+    """
+    Starts timing a request and makes it current for span(). Returns the RequestTimer.
+    """
+    timer = RequestTimer(route, language_label(language))
+    _current.set(timer)
+    return timer
+
+
+def finish_request(timer):
+    """
+    Records the request duration and, if request logs are on, logs its spans on one line.
+    """
+    elapsed = time.perf_counter() - timer.started
+    REQUEST_SECONDS.labels(timer.route, timer.language).observe(elapsed)
+    if REQUEST_LOGS and timer.spans and logger.isEnabledFor(logging.DEBUG):
+        spans = " ".join(f"{name}={seconds * 1000:.1f}ms" for name, seconds in timer.spans)
+        logger.debug("%s language=%s total=%.1fms %s", timer.route, timer.language, elapsed * 1000, spans)
+
+
+@contextmanager
+def span(name):
+    """
+    Times a block as a named span of the current request. Outside a request it does nothing.
+
+    Context variables follow asyncio tasks, so spans inside asyncio.gather still reach
+    the request that started them.
+    """
+    timer = _current.get()
+    if timer is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - started
+        timer.spans.append((name, seconds))
+        SPAN_SECONDS.labels(timer.route, timer.language, name).observe(seconds)
+
+
+def debug_log(message):
+    """Logs a per-request debug line when WORDS_API_REQUEST_LOGS is on."""
+    if REQUEST_LOGS:
+        logger.debug(message)
+
+
+def render_metrics():
+    """
+    Returns the Prometheus text exposition of all metrics.
+
+    Under gunicorn, set PROMETHEUS_MULTIPROC_DIR so every worker's samples are merged
+    (see child_exit in gunicorn.conf.py); otherwise only this process is reported.
+    """
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest()
@@ -0,0 +1,77 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from utils.word_cache import get_language_version
+
+# Serialized /words pages kept per process, least recently used evicted first
+PAGE_CACHE_SIZE = int(os.getenv("WORDS_PAGE_CACHE_SIZE", "256"))
+# Upper bound on how stale a cached page can get when another process writes
+PAGE_CACHE_TTL_SECONDS = float(os.getenv("WORDS_PAGE_CACHE_TTL", "60"))
+
+CachedPage = namedtuple("CachedPage", ["body", "etag", "version", "cached_at"])
+
+_lock = threading.Lock()
+_pages = OrderedDict()  # page key -> CachedPage
+
+
+def page_key(language, cursor, page, per_page, sort_by, order, count_mode):
+    """
+    Builds the cache key for a /words request. The language must come first; get_page
+    reads it to look up the version.
+    """
+    return (language, cursor, page, per_page, sort_by, order, count_mode)
+
+
+def make_etag(body):
+    """
+    Returns a quoted ETag for a serialized page.
+
+    It is a digest of the body rather than the version counter itself, so every worker
+    hands out the same ETag for the same page even though each counts its own writes.
+    """
+    return '"' + hashlib.sha1(body).hexdigest() + '"'
+
+
+def etag_matches(if_none_match, etag):
+    """
+    Checks an If-None-Match header against an ETag using weak comparison.
+    """
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+def get_page(key):
+    """
+    Returns the CachedPage for a key, or None if it is missing, expired, or older than
+    the current version of its language.
+    """
+    with _lock:
+        cached = _pages.get(key)
+        if cached is None:
+            return None
+        if (cached.version != get_language_version(key[0])
+                or time.monotonic() - cached.cached_at >= PAGE_CACHE_TTL_SECONDS):
+            del _pages[key]
+            return None
+        _pages.move_to_end(key)
+        return cached
+
+
+def store_page(key, body, version):
+    """
+    Caches a serialized page read at `version` and returns its ETag.
+
+    Take the version with get_language_version before reading from Qdrant, so a write
+    that lands during the read leaves the page already stale instead of hiding it.
+    """
+    etag = make_etag(body)
+    with _lock:
+        _pages[key] = CachedPage(body, etag, version, time.monotonic())
+        _pages.move_to_end(key)
+        while len(_pages) > PAGE_CACHE_SIZE:
+            _pages.popitem(last=False)
+    return etag
@@ -0,0 +1,325 @@
+import base64
+import json
+from datetime import datetime
+from qdrant_client.http.models import Direction, Filter, FieldCondition, IsEmptyCondition, MatchValue, OrderBy, PayloadField
+
+# Largest batch used when walking IDs to reach a numbered page
+SKIP_BATCH_SIZE = 1000
+
+# Payload fields with a range-capable index, which Qdrant can scroll in order
+ORDERED_FIELDS = {"created_at"}
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor token cannot be decoded."""
+
+
+def encode_cursor(state):
+    """
+    Encodes cursor state (a small JSON-serialisable dict) as an opaque, URL-safe token.
+    """
+    raw = json.dumps(state, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token):
+    """
+    Decodes a token produced by encode_cursor back into its state dict.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        state = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError) as e:
+        raise InvalidCursorError(f"Invalid cursor: {token}") from e
+    if not isinstance(state, dict) or "o" not in state:
+        raise InvalidCursorError(f"Invalid cursor: {token}")
+    return state
+
+
+def build_language_filter(language=None):
+    """
+    Returns a Qdrant filter restricting results to one language, or None for all languages.
+    """
+    if not language:
+        return None
+    return Filter(
+        must=[
+            FieldCondition(
+                key="language",
+                match=MatchValue(value=language)
+            )
+        ]
+    )
+
+
+def build_missing_filter(field, query_filter=None):
+    """
+    Returns a filter matching the points of query_filter that have no value for `field`.
+    """
+    conditions = list(query_filter.must) if query_filter is not None and query_filter.must else []
+    conditions.append(IsEmptyCondition(is_empty=PayloadField(key=field)))
+    return Filter(must=conditions)
+
+
+def skip_to_page(client, collection, page, per_page, query_filter=None):
+    """
+    Finds the scroll offset (a point ID) where a numbered page starts.
+
+    Only IDs are fetched while skipping, so this is cheaper than reading the skipped
+    payloads, but it still grows with the page number. Clients should prefer cursors.
+    Returns (offset, has_more); has_more is False when the page lies past the end.
+    """
+    remaining = (page - 1) * per_page
+    offset = None
+    while remaining > 0:
+        records, offset = client.scroll(
+            collection_name=collection,
+            scroll_filter=query_filter,
+            limit=min(remaining, SKIP_BATCH_SIZE),
+            offset=offset,
+            with_payload=False,
+            with_vectors=False
+        )
+        remaining -= len(records)
+        if offset is None:
+            return None, False
+    return offset, True
+
+
+def scroll_page(client, collection, per_page, offset=None, query_filter=None):
+    """
+    Reads one page of points starting at a scroll offset.
+
+    Returns (records, next_cursor) where next_cursor is None on the last page.
+    """
+    records, next_offset = client.scroll(
+        collection_name=collection,
+        scroll_filter=query_filter,
+        limit=per_page,
+        offset=offset,
+        with_payload=True,
+        with_vectors=False
+    )
+    next_cursor = encode_cursor({"o": next_offset}) if next_offset is not None else None
+    return records, next_cursor
+
+
+def iter_pages(client, collection, page_size, offset=None, query_filter=None):
+    """
+    Yields (records, next_cursor) for every page from `offset` to the end of the scan.
+
+    Only one page is held in memory at a time.
+    """
+    while True:
+        records, next_cursor = scroll_page(client, collection, page_size, offset, query_filter)
+        yield records, next_cursor
+        if next_cursor is None:
+            return
+        offset = decode_cursor(next_cursor)["o"]
+
+
+def check_cursor_kind(state, ordered):
+    """
+    Raises InvalidCursorError unless a decoded cursor was issued by the same kind of scan,
+    ordered or unordered, as the one it is about to resume.
+    """
+    if "k" in state:
+        valid = ordered and state["k"] in ORDERED_FIELDS and state.get("d") in ("asc", "desc")
+    else:
+        valid = not ordered
+    if not valid:
+        raise InvalidCursorError("Cursor does not match the requested sort; request the first page again")
+
+
+def _order_value(value):
+    """
+    Converts a payload value into something Qdrant accepts as an order_by start point.
+    """
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError as e:
+            raise InvalidCursorError(f"Invalid cursor position: {value}") from e
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise InvalidCursorError(f"Invalid cursor position: {value}")
+    return value
+
+
+def _ordered_scroll_kwargs(collection, limit, sort_by, order, state, query_filter, with_payload):
+    """
+    Builds the scroll arguments that read up to `limit` points after an ordered position.
+
+    Qdrant's order_by scroll has no offset, so a position is the last value returned plus
+    the IDs already returned with that value ("s"). start_from is inclusive, so enough
+    extra points are requested to cover those IDs, which _ordered_scroll_result drops.
+    """
+    start_from = None
+    seen_ids = []
+    if state is not None:
+        start_from = _order_value(state["o"])
+        seen_ids = state.get("s", [])
+    return dict(
+        collection_name=collection,
+        scroll_filter=query_filter,
+        limit=limit + len(seen_ids) + 1,
+        order_by=OrderBy(
+            key=sort_by,
+            direction=Direction.DESC if order == "desc" else Direction.ASC,
+            start_from=start_from
+        ),
+        with_payload=with_payload,
+        with_vectors=False
+    )
+
+
+def _ordered_scroll_result(records, limit, sort_by, order, state):
+    """
+    Turns the records of an ordered scroll into (page_records, next_state).
+    """
+    seen_ids = state.get("s", []) if state is not None else []
+    skipped = set(seen_ids)
+    records = [record for record in records if record.id not in skipped]
+    has_more = len(records) > limit
+    records = records[:limit]
+    if not has_more or not records:
+        return records, None
+
+    last_value = records[-1].payload.get(sort_by)
+    tied_ids = [record.id for record in records if record.payload.get(sort_by) == last_value]
+    if state is not None and state["o"] == last_value:
+        tied_ids = seen_ids + tied_ids
+    return records, {"o": last_value, "s": tied_ids, "k": sort_by, "d": order}
+
+
+def _scroll_ordered(client, collection, limit, sort_by, order, state, query_filter, with_payload):
+    """
+    Reads up to `limit` points in payload order after the position described by `state`.
+    Returns (records, next_state).
+    """
+    records, _ = client.scroll(
+        **_ordered_scroll_kwargs(collection, limit, sort_by, order, state, query_filter, with_payload)
+    )
+    return _ordered_scroll_result(records, limit, sort_by, order, state)
+
+
+def skip_to_ordered_page(client, collection, page, per_page, sort_by, order, query_filter=None):
+    """
+    Finds the ordered-scan position where a numbered page starts.
+
+    Like skip_to_page, only the sort key is read for skipped points.
+    Returns (state, has_more); has_more is False when the page lies past the end.
+    """
+    remaining = (page - 1) * per_page
+    state = None
+    while remaining > 0:
+        records, state = _scroll_ordered(
+            client, collection, min(remaining, SKIP_BATCH_SIZE), sort_by, order,
+            state, query_filter, with_payload=[sort_by]
+        )
+        remaining -= len(records)
+        if state is None:
+            return None, False
+    return state, True
+
+
+def scroll_ordered_page(client, collection, per_page, sort_by, order, state=None, query_filter=None):
+    """
+    Reads one page of points ordered by an indexed payload field.
+
+    Each page costs O(per_page) regardless of depth. Points without the field are not
+    returned, as Qdrant leaves them out of ordered scrolls; check build_missing_filter
+    finds none before using this.
+    Returns (records, next_cursor) where next_cursor is None on the last page.
+    """
+    records, next_state = _scroll_ordered(
+        client, collection, per_page, sort_by, order, state, query_filter, with_payload=True
+    )
+    next_cursor = encode_cursor(next_state) if next_state is not None else None
+    return records, next_cursor
+
+
+# Async variants of the helpers above, for asgi_app.py and AsyncQdrantClient.
+# Request building and result handling are shared with the sync versions.
+
+async def skip_to_page_async(client, collection, page, per_page, query_filter=None):
+    """
+    Async version of skip_to_page.
+    """
+    remaining = (page - 1) * per_page
+    offset = None
+    while remaining > 0:
+        records, offset = await client.scroll(
+            collection_name=collection,
+            scroll_filter=query_filter,
+            limit=min(remaining, SKIP_BATCH_SIZE),
+            offset=offset,
+            with_payload=False,
+            with_vectors=False
+        )
+        remaining -= len(records)
+        if offset is None:
+            return None, False
+    return offset, True
+
+
+async def scroll_page_async(client, collection, per_page, offset=None, query_filter=None):
+    """
+    Async version of scroll_page.
+    """
+    records, next_offset = await client.scroll(
+        collection_name=collection,
+        scroll_filter=query_filter,
+        limit=per_page,
+        offset=offset,
+        with_payload=True,
+        with_vectors=False
+    )
+    next_cursor = encode_cursor({"o": next_offset}) if next_offset is not None else None
+    return records, next_cursor
+
+
+async def iter_pages_async(client, collection, page_size, offset=None, query_filter=None):
+    """
+    Async version of iter_pages.
+    """
+    while True:
+        records, next_cursor = await scroll_page_async(client, collection, page_size, offset, query_filter)
+        yield records, next_cursor
+        if next_cursor is None:
+            return
+        offset = decode_cursor(next_cursor)["o"]
+
+
+async def _scroll_ordered_async(client, collection, limit, sort_by, order, state, query_filter, with_payload):
+    records, _ = await client.scroll(
+        **_ordered_scroll_kwargs(collection, limit, sort_by, order, state, query_filter, with_payload)
+    )
+    return _ordered_scroll_result(records, limit, sort_by, order, state)
+
+
+async def skip_to_ordered_page_async(client, collection, page, per_page, sort_by, order, query_filter=None):
+    """
+    Async version of skip_to_ordered_page.
+    """
+    remaining = (page - 1) * per_page
+    state = None
+    while remaining > 0:
+        records, state = await _scroll_ordered_async(
+            client, collection, min(remaining, SKIP_BATCH_SIZE), sort_by, order,
+            state, query_filter, with_payload=[sort_by]
+        )
+        remaining -= len(records)
+        if state is None:
+            return None, False
+    return state, True
+
+
+async def scroll_ordered_page_async(client, collection, per_page, sort_by, order, state=None, query_filter=None):
+    """
+    Async version of scroll_ordered_page.
+    """
+    records, next_state = await _scroll_ordered_async(
+        client, collection, per_page, sort_by, order, state, query_filter, with_payload=True
+    )
+    next_cursor = encode_cursor(next_state) if next_state is not None else None
+    return records, next_cursor
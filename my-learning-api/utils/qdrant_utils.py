@@ -1,14 +1,69 @@
-from qdrant_client import QdrantClient
+import os
+import threading
+import httpx
+from qdrant_client import AsyncQdrantClient, QdrantClient
 from config import QDRANT_URL, QDRANT_API_KEY # Import Qdrant config from config.py
 
-def get_qdrant_client():
+def _env_flag(name, default="false"):
+    return os.getenv(name, default).lower() in ("1", "true", "yes")
+
+# Connection settings shared by every client this process creates
+QDRANT_PREFER_GRPC = _env_flag("QDRANT_PREFER_GRPC")
+QDRANT_TIMEOUT = int(os.getenv("QDRANT_TIMEOUT", "10"))
+QDRANT_MAX_CONNECTIONS = int(os.getenv("QDRANT_MAX_CONNECTIONS", "20"))
+
+_clients = {}  # pid -> QdrantClient
+_clients_lock = threading.Lock()
+
+def create_qdrant_client(prefer_grpc=None, timeout=None):
+    """
+    Builds a new Qdrant client using configuration from config.py.
+
+    The REST transport keeps up to QDRANT_MAX_CONNECTIONS pooled keep-alive connections.
+    Most code should call get_qdrant_client() instead, which reuses one client per process.
+    """
+    return QdrantClient(
+        QDRANT_URL,
+        api_key=QDRANT_API_KEY,
+        prefer_grpc=QDRANT_PREFER_GRPC if prefer_grpc is None else prefer_grpc,
+        timeout=QDRANT_TIMEOUT if timeout is None else timeout,
+        limits=httpx.Limits(
+            max_connections=QDRANT_MAX_CONNECTIONS,
+            max_keepalive_connections=QDRANT_MAX_CONNECTIONS
+        )
+    )
+
+def create_async_qdrant_client(prefer_grpc=None, timeout=None):
     """
-    Returns a Qdrant client instance using configuration from config.py.
+    Builds an AsyncQdrantClient with the same settings as create_qdrant_client().
+
+    asgi_app.py creates one per worker in its lifespan handler, on the running event loop.
     """
-    client = QdrantClient(
+    return AsyncQdrantClient(
         QDRANT_URL,
-        api_key=QDRANT_API_KEY
+        api_key=QDRANT_API_KEY,
+        prefer_grpc=QDRANT_PREFER_GRPC if prefer_grpc is None else prefer_grpc,
+        timeout=QDRANT_TIMEOUT if timeout is None else timeout,
+        limits=httpx.Limits(
+            max_connections=QDRANT_MAX_CONNECTIONS,
+            max_keepalive_connections=QDRANT_MAX_CONNECTIONS
+        )
     )
+
+def get_qdrant_client():
+    """
+    Returns the process-wide Qdrant client, creating it on first use.
+
+    Clients are keyed by process ID, so each forked worker (e.g. under gunicorn) builds
+    its own connection pool instead of sharing sockets inherited from the parent.
+    """
+    pid = os.getpid()
+    client = _clients.get(pid)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(pid)
+            if client is None:
+                client = _clients[pid] = create_qdrant_client()
     return client
 
 def init_qdrant():
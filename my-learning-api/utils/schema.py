@@ -0,0 +1,127 @@
+import os
+from qdrant_client.http import models
+
+# How word points are stored:
+#   dense      - a 384-dim placeholder vector per point (the original layout)
+#   vectorless - no vectors at all; words are only ever read by payload filters
+#   embedded   - real sentence embeddings in named vectors "target_word" and "english"
+STORAGE_MODES = ("dense", "vectorless", "embedded")
+WORDS_STORAGE_MODE = os.getenv("WORDS_STORAGE_MODE", "dense")
+
+# Placeholder vector shared by every dense-mode word point
+ZERO_VECTOR = [0.0] * 384
+
+WORDS_PAYLOAD_INDEXES = {
+    "language": models.PayloadSchemaType.KEYWORD,
+    "salish": models.PayloadSchemaType.TEXT,
+    # Words written by the vocabulary loader keep the target word here instead of "salish"
+    "target_word": models.PayloadSchemaType.TEXT,
+    "english": models.PayloadSchemaType.TEXT,
+    # Range index so /words can be scrolled in created_at order by Qdrant
+    "created_at": models.PayloadSchemaType.DATETIME,
+}
+
+
+def words_schema(mode=WORDS_STORAGE_MODE):
+    """
+    Returns the declared layout of the words collection for a storage mode.
+    """
+    if mode not in STORAGE_MODES:
+        raise ValueError(f"Unknown storage mode '{mode}', expected one of {STORAGE_MODES}")
+    if mode == "vectorless":
+        vectors_config = {}
+    elif mode == "embedded":
+        vectors_config = {
+            name: models.VectorParams(size=384, distance=models.Distance.COSINE)
+            for name in ("target_word", "english")
+        }
+    else:
+        vectors_config = models.VectorParams(size=384, distance=models.Distance.COSINE)
+    return {
+        "collection_name": "words",
+        "vectors_config": vectors_config,
+        "payload_indexes": WORDS_PAYLOAD_INDEXES,
+    }
+
+
+def word_texts(payload):
+    """
+    Returns the (target_word, english) texts of a stored word payload.
+
+    The API stores the target word as "salish" whatever the language; the vocabulary
+    loader stores it as "target_word".
+    """
+    return payload.get("target_word") or payload.get("salish") or "", payload.get("english") or ""
+
+
+def word_vectors(pairs, mode=WORDS_STORAGE_MODE):
+    """
+    Returns the vectors to store for (target_word, english) pairs in the given storage mode.
+
+    Embedded mode encodes all pairs in one batched pass; the other modes need no model.
+    """
+    if mode == "embedded":
+        from utils.embeddings import embed_words
+        return embed_words(pairs)
+    return [{} if mode == "vectorless" else ZERO_VECTOR] * len(pairs)
+
+
+# Declared layout of the words collection. reconcile_collection brings a live
+# collection up to this without dropping data.
+WORDS_SCHEMA = words_schema()
+
+
+def _vector_params_match(existing, declared):
+    """
+    Compares the parts of a vector config that cannot change without recreating the collection.
+    """
+    if isinstance(declared, dict) or isinstance(existing, dict):
+        if not isinstance(declared, dict) or not isinstance(existing, dict):
+            return False
+        if set(declared) != set(existing):
+            return False
+        return all(_vector_params_match(existing[name], declared[name]) for name in declared)
+    return existing.size == declared.size and existing.distance == declared.distance
+
+
+def reconcile_collection(client, schema, collection_name=None):
+    """
+    Makes a Qdrant collection match a declared schema, applying only the missing pieces.
+
+    A missing collection is created. Missing payload indexes, or indexes of the wrong
+    type, are (re)created. A vector config that differs from the declaration is only
+    reported, because changing it would mean recreating the collection and losing its
+    points. Returns a list of human-readable actions that were applied.
+    """
+    collection_name = collection_name or schema["collection_name"]
+    actions = []
+
+    if not client.collection_exists(collection_name):
+        client.create_collection(
+            collection_name=collection_name,
+            vectors_config=schema["vectors_config"],
+        )
+        actions.append(f"created collection '{collection_name}'")
+        existing_indexes = {}
+    else:
+        info = client.get_collection(collection_name)
+        if not _vector_params_match(info.config.params.vectors, schema["vectors_config"]):
+            print(f"WARNING: vector config of '{collection_name}' differs from the declared schema; "
+                  f"leaving it unchanged (found {info.config.params.vectors})")
+        existing_indexes = {
+            field: index_info.data_type for field, index_info in (info.payload_schema or {}).items()
+        }
+
+    for field_name, field_schema in schema["payload_indexes"].items():
+        if existing_indexes.get(field_name) == field_schema:
+            continue
+        client.create_payload_index(
+            collection_name=collection_name,
+            field_name=field_name,
+            field_schema=field_schema,
+            wait=True
+        )
+        actions.append(f"created {field_schema.value} index on '{field_name}'")
+
+    return actions
+
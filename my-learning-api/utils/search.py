@@ -0,0 +1,58 @@
+from qdrant_client.http.models import FieldCondition, Filter, MatchText, MatchValue
+
+# Named vectors a query can be matched against (see words_schema("embedded"))
+SEARCH_FIELDS = ("english", "target_word")
+
+# Full-text indexed fields used by the exact-match prefilter
+TEXT_FIELDS = ("english", "target_word", "salish")
+
+
+def build_search_filter(language=None, text=None):
+    """
+    Builds the filter applied before vector scoring.
+
+    `language` restricts results to one language; `text` keeps only words whose english
+    or target word contains all of its tokens, using the existing full-text indexes.
+    Returns None when neither is given.
+    """
+    must = []
+    should = None
+    if language:
+        must.append(FieldCondition(key="language", match=MatchValue(value=language)))
+    if text:
+        should = [FieldCondition(key=field, match=MatchText(text=text)) for field in TEXT_FIELDS]
+    if not must and not should:
+        return None
+    return Filter(must=must or None, should=should)
+
+
+def search_words(client, collection, query_vector, using, k, query_filter=None):
+    """
+    Returns the k points whose `using` vector is closest to query_vector, with payloads and scores.
+    """
+    response = client.query_points(
+        collection_name=collection,
+        query=list(query_vector),
+        using=using,
+        query_filter=query_filter,
+        limit=k,
+        with_payload=True,
+        with_vectors=False
+    )
+    return response.points
+
+
+async def search_words_async(client, collection, query_vector, using, k, query_filter=None):
+    """
+    Async version of search_words for AsyncQdrantClient.
+    """
+    response = await client.query_points(
+        collection_name=collection,
+        query=list(query_vector),
+        using=using,
+        query_filter=query_filter,
+        limit=k,
+        with_payload=True,
+        with_vectors=False
+    )
+    return response.points
@@ -0,0 +1,154 @@
+import gzip
+import hashlib
+import os
+import threading
+import time
+from collections import namedtuple
+from utils.fast_json import encode_json
+from utils.pagination import build_language_filter, iter_pages
+from utils.word_cache import get_language_version
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+# Upper bound on how stale a snapshot can get when another process writes
+SNAPSHOT_TTL_SECONDS = float(os.getenv("WORDS_SNAPSHOT_TTL", "300"))
+# Optional directory to also write words-<language>-<digest>.json.gz/.br files to
+SNAPSHOT_DIR = os.getenv("WORDS_SNAPSHOT_DIR")
+SNAPSHOT_PAGE_SIZE = 1000
+# Compression for snapshots built by the background rebuilder, where time is no concern
+SNAPSHOT_BROTLI_QUALITY = int(os.getenv("WORDS_SNAPSHOT_BROTLI_QUALITY", "11"))
+SNAPSHOT_GZIP_LEVEL = 9
+# Faster settings for the first snapshot of a language, which a request waits for
+INLINE_BROTLI_QUALITY = 5
+INLINE_GZIP_LEVEL = 6
+
+Snapshot = namedtuple("Snapshot", ["language", "version", "etag", "total", "blobs", "built_at"])
+
+_lock = threading.Lock()
+_snapshots = {}  # language (None for all languages) -> Snapshot
+_building = {}  # language -> threading.Event set when its rebuild finishes
+
+
+def build_snapshot(client, collection, language, brotli_quality=SNAPSHOT_BROTLI_QUALITY,
+                   gzip_level=SNAPSHOT_GZIP_LEVEL):
+    """
+    Reads every word for a language and returns a Snapshot holding the compressed JSON
+    document {"language", "total", "items"}. blobs maps content codings ("gzip", and
+    "br" when brotli is installed) to bytes.
+    """
+    version = get_language_version(language)
+    items = []
+    for records, _ in iter_pages(client, collection, SNAPSHOT_PAGE_SIZE, query_filter=build_language_filter(language)):
+        items.extend({**record.payload, 'id': record.id} for record in records)
+    body = encode_json({'language': language, 'total': len(items), 'items': items})
+
+    digest = hashlib.sha1(body).hexdigest()
+    blobs = {"gzip": gzip.compress(body, compresslevel=gzip_level)}
+    if brotli is not None:
+        blobs["br"] = brotli.compress(body, quality=brotli_quality)
+    snapshot = Snapshot(language, version, f'"{digest}"', len(items), blobs, time.monotonic())
+    if SNAPSHOT_DIR:
+        _write_files(snapshot, digest)
+    return snapshot
+
+
+def _write_files(snapshot, digest):
+    """
+    Writes each blob atomically and removes older snapshots of the same language.
+    """
+    prefix = f"words-{snapshot.language or 'all'}-"
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    names = set()
+    for coding, blob in snapshot.blobs.items():
+        name = f"{prefix}{digest}.json.{'gz' if coding == 'gzip' else coding}"
+        path = os.path.join(SNAPSHOT_DIR, name)
+        with open(path + ".tmp", "wb") as f:
+            f.write(blob)
+        os.replace(path + ".tmp", path)
+        names.add(name)
+    for name in os.listdir(SNAPSHOT_DIR):
+        if name.startswith(prefix) and name not in names and not name.endswith(".tmp"):
+            os.remove(os.path.join(SNAPSHOT_DIR, name))
+
+
+def _is_fresh(snapshot):
+    return (snapshot.version == get_language_version(snapshot.language)
+            and time.monotonic() - snapshot.built_at < SNAPSHOT_TTL_SECONDS)
+
+
+def _rebuild(client, collection, language, **compression):
+    try:
+        snapshot = build_snapshot(client, collection, language, **compression)
+        with _lock:
+            _snapshots[language] = snapshot
+        print(f"Built words snapshot for '{language}': {snapshot.total} words, "
+              + ", ".join(f"{coding} {len(blob)} bytes" for coding, blob in snapshot.blobs.items()))
+    except Exception as e:
+        print(f"Error building words snapshot for '{language}': {e}")
+    finally:
+        with _lock:
+            _building.pop(language).set()
+
+
+def _start_rebuild(client, collection, language):
+    """
+    Rebuilds a snapshot in a background thread at full compression, unless a rebuild of
+    the language is already running.
+    """
+    with _lock:
+        if language in _building:
+            return
+        _building[language] = threading.Event()
+    threading.Thread(target=_rebuild, args=(client, collection, language), daemon=True).start()
+
+
+def get_snapshot(client, collection, language):
+    """
+    Returns the current snapshot for a language.
+
+    A stale snapshot (older version or past the TTL) is still returned while a background
+    thread builds its replacement, so requests never wait on a rebuild. Only the first
+    request for a language builds inline, with faster compression; a full-compression
+    rebuild then replaces it in the background, and concurrent first requests wait on the
+    inline build. Returns None if that first build fails.
+    """
+    with _lock:
+        snapshot = _snapshots.get(language)
+        building = _building.get(language)
+        if snapshot is None and building is None:
+            building = _building[language] = threading.Event()
+            build_inline = True
+        else:
+            build_inline = False
+
+    if snapshot is None:
+        if build_inline:
+            _rebuild(client, collection, language,
+                     brotli_quality=INLINE_BROTLI_QUALITY, gzip_level=INLINE_GZIP_LEVEL)
+            with _lock:
+                snapshot = _snapshots.get(language)
+            if snapshot is not None:
+                _start_rebuild(client, collection, language)
+            return snapshot
+        building.wait()
+        with _lock:
+            return _snapshots.get(language)
+
+    if not _is_fresh(snapshot):
+        _start_rebuild(client, collection, language)
+    return snapshot
+
+
+def choose_encoding(snapshot, accept_encoding):
+    """
+    Picks the best blob the client accepts. Returns (coding, blob); coding is None when
+    the client accepts neither, in which case the gzip blob is decompressed.
+    """
+    accepted = {part.split(";")[0].strip().lower() for part in (accept_encoding or "").split(",")}
+    for coding in ("br", "gzip"):
+        if coding in snapshot.blobs and (coding in accepted or "*" in accepted):
+            return coding, snapshot.blobs[coding]
+    return None, gzip.decompress(snapshot.blobs["gzip"])
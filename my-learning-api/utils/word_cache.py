@@ -0,0 +1,116 @@
+import os
+import threading
+import time
+
+# Supported values for the /words ?count= parameter
+COUNT_MODES = ("exact", "approx", "none")
+
+# Upper bound on how stale a cached count can get when another process writes
+COUNT_CACHE_TTL_SECONDS = float(os.getenv("WORD_COUNT_CACHE_TTL", "60"))
+
+_lock = threading.Lock()
+_counts = {}  # (collection, language, mode) -> (count, cached_at)
+_versions = {}  # language (None for all languages) -> writes seen by this process
+
+
+def get_cached_count(collection, language, mode):
+    """
+    Returns a cached count that is still within its TTL, or None.
+    """
+    with _lock:
+        cached = _counts.get((collection, language, mode))
+    if cached is not None and time.monotonic() - cached[1] < COUNT_CACHE_TTL_SECONDS:
+        return cached[0]
+    return None
+
+
+def store_count(collection, language, mode, count):
+    with _lock:
+        _counts[(collection, language, mode)] = (count, time.monotonic())
+
+
+def get_word_count(client, collection, language, mode, query_filter=None):
+    """
+    Returns the number of words for a language using the requested count mode.
+
+    "exact" and "approx" results are cached per (collection, language, mode) until
+    invalidate_language is called for that language or the TTL runs out.
+    "none" skips counting and returns None.
+    """
+    if mode == "none":
+        return None
+    count = get_cached_count(collection, language, mode)
+    if count is None:
+        count = client.count(
+            collection_name=collection,
+            count_filter=query_filter,
+            exact=mode == "exact"
+        ).count
+        store_count(collection, language, mode, count)
+    return count
+
+
+async def get_word_count_async(client, collection, language, mode, query_filter=None):
+    """
+    Async version of get_word_count for AsyncQdrantClient; shares the same cache.
+    """
+    if mode == "none":
+        return None
+    count = get_cached_count(collection, language, mode)
+    if count is None:
+        count = (await client.count(
+            collection_name=collection,
+            count_filter=query_filter,
+            exact=mode == "exact"
+        )).count
+        store_count(collection, language, mode, count)
+    return count
+
+
+def get_missing_count(client, collection, language, field, missing_filter):
+    """
+    Returns the number of words for a language without a value for `field`, counted with
+    missing_filter (see pagination.build_missing_filter). Cached like the "exact" count.
+    """
+    mode = f"missing:{field}"
+    count = get_cached_count(collection, language, mode)
+    if count is None:
+        count = client.count(collection_name=collection, count_filter=missing_filter, exact=True).count
+        store_count(collection, language, mode, count)
+    return count
+
+
+async def get_missing_count_async(client, collection, language, field, missing_filter):
+    """
+    Async version of get_missing_count; shares the same cache.
+    """
+    mode = f"missing:{field}"
+    count = get_cached_count(collection, language, mode)
+    if count is None:
+        count = (await client.count(collection_name=collection, count_filter=missing_filter, exact=True)).count
+        store_count(collection, language, mode, count)
+    return count
+
+
+def get_language_version(language):
+    """
+    Returns the version counter for a language (None for all languages).
+
+    invalidate_language bumps it, so anything cached from a read at one version is stale
+    once the version moves on.
+    """
+    with _lock:
+        return _versions.get(language, 0)
+
+
+def invalidate_language(language):
+    """
+    Drops cached counts affected by a write to `language`, including the all-languages total,
+    and bumps the version of both.
+    """
+    with _lock:
+        for key in (language, None):
+            _versions[key] = _versions.get(key, 0) + 1
+        for key in list(_counts):
+            if key[1] in (language, None):
+                del _counts[key]
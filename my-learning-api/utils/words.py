@@ -0,0 +1,134 @@
+import unicodedata
+import uuid
+from datetime import datetime
+from qdrant_client.http import models
+
+# Shared by the Flask app (app.py) and the ASGI app (asgi_app.py) so both keep the same contracts
+
+SUPPORTED_LANGUAGES = ["salish", "italian"]
+
+# IDs looked up per retrieve call when checking for existing words
+RETRIEVE_BATCH_SIZE = 1000
+
+# Namespace for word point IDs. vocabulary_loader/utils/words.py uses the same value, so a
+# word gets the same ID whichever service writes it. Changing it re-addresses every word.
+WORD_ID_NAMESPACE = uuid.UUID("6f1c3f0e-5d0b-5a4e-9c57-3a8e2f4d7b10")
+
+
+def normalize_word_text(text):
+    """
+    Normalizes word text for IDs: Unicode NFC, case-folded, whitespace collapsed.
+    """
+    return " ".join(unicodedata.normalize("NFC", text).casefold().split())
+
+
+def word_point_id(language, target_word, english):
+    """
+    Returns the content-addressed point ID (UUIDv5) for a word.
+
+    The same (language, target word, english) always maps to the same ID, so a duplicate
+    is found with one retrieve by ID and retried writes overwrite rather than duplicate.
+    """
+    key = "\x1f".join((language, normalize_word_text(target_word), normalize_word_text(english)))
+    return str(uuid.uuid5(WORD_ID_NAMESPACE, key))
+
+
+def validate_word(data):
+    """
+    Returns an error message for an invalid word payload, or None when it is valid.
+    """
+    if not isinstance(data, dict):
+        return "each word must be a JSON object"
+    fields = [data.get(field) for field in ('salish', 'english', 'language')]
+    if not all(isinstance(value, str) and value.strip() for value in fields):
+        return "salish, english, and language are required and must be non-empty strings"
+    if data['language'] not in SUPPORTED_LANGUAGES:
+        return "language must be either 'salish' or 'italian'"
+    return None
+
+
+def build_word_point(point_id, salish, english, language, vector):
+    """
+    Builds the Qdrant point stored for a word. `vector` comes from word_vectors.
+    """
+    return models.PointStruct(
+        id=point_id,
+        payload={
+            "salish": salish,
+            "english": english,
+            "language": language,
+            "created_at": datetime.now().isoformat()
+        },
+        vector=vector
+    )
+
+
+def plan_batch(items):
+    """
+    Validates batch items and assigns their point IDs.
+
+    Returns (statuses, point_indexes): one status per item, in input order, and the
+    indexes of the items to write. Repeats of an earlier item in the same batch are
+    reported as "exists".
+    """
+    statuses = []
+    point_indexes = []
+    batch_ids = set()
+    for index, item in enumerate(items):
+        error = validate_word(item)
+        if error:
+            statuses.append({'index': index, 'status': 'invalid', 'error': error})
+            continue
+        point_id = word_point_id(item['language'], item['salish'], item['english'])
+        if point_id in batch_ids:
+            statuses.append({'index': index, 'status': 'exists', 'id': point_id})
+            continue
+        batch_ids.add(point_id)
+        point_indexes.append(index)
+        statuses.append({'index': index, 'status': 'accepted', 'id': point_id})
+    return statuses, point_indexes
+
+
+def skip_existing(statuses, point_indexes, existing_ids):
+    """
+    Marks items whose IDs are already stored as "exists"; returns the indexes still to write.
+    """
+    remaining = []
+    for index in point_indexes:
+        if statuses[index]['id'] in existing_ids:
+            statuses[index]['status'] = 'exists'
+        else:
+            remaining.append(index)
+    return remaining
+
+
+def existing_word_ids(client, collection, ids):
+    """
+    Returns the subset of `ids` that already exist in the collection.
+    """
+    found = set()
+    for start in range(0, len(ids), RETRIEVE_BATCH_SIZE):
+        records = client.retrieve(
+            collection_name=collection,
+            ids=ids[start:start + RETRIEVE_BATCH_SIZE],
+            with_payload=False,
+            with_vectors=False
+        )
+        found.update(str(record.id) for record in records)
+    return found
+
+
+async def existing_word_ids_async(client, collection, ids):
+    """
+    Async version of existing_word_ids for AsyncQdrantClient.
+    """
+    found = set()
+    for start in range(0, len(ids), RETRIEVE_BATCH_SIZE):
+        records = await client.retrieve(
+            collection_name=collection,
+            ids=ids[start:start + RETRIEVE_BATCH_SIZE],
+            with_payload=False,
+            with_vectors=False
+        )
+        found.update(str(record.id) for record in records)
+    return found
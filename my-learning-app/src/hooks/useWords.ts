@@ -31,52 +31,28 @@ export const useWords = ({ apiBaseUrl, selectedLanguage }: UseWordsProps): UseWo
       setWords([]); // Clear previous words
 
       try {
-        console.log(`[useWords] Fetching total count for language: ${selectedLanguage}`);
-        // Step 1: Fetch total count
-        const countResponse = await fetch(`${apiBaseUrl}/words?language=${selectedLanguage}&page=1&per_page=1`);
-        
-        if (!countResponse.ok) {
-          throw new Error(`API error (count fetch): ${countResponse.status} - ${countResponse.statusText}`);
-        }
-        
-        const countData = await countResponse.json();
-        const totalWords = countData?.total;
-
-        console.log(`[useWords] Total words available for ${selectedLanguage}: ${totalWords}`);
+        console.log(`[useWords] Fetching word snapshot for language: ${selectedLanguage}`);
+        // The snapshot is pre-built and pre-compressed by the API, and the browser
+        // revalidates it with its ETag, so unchanged word lists come back as a 304.
+        const response = await fetch(`${apiBaseUrl}/words?format=snapshot&language=${selectedLanguage}`);
 
-        if (totalWords && totalWords > 0) {
-          // Step 2: Fetch all words using the total count
-          console.log(`[useWords] Fetching all ${totalWords} words for ${selectedLanguage}...`);
-          const allWordsResponse = await fetch(`${apiBaseUrl}/words?language=${selectedLanguage}&page=1&per_page=${totalWords}`);
-
-          if (!allWordsResponse.ok) {
-            throw new Error(`API error (all words fetch): ${allWordsResponse.status} - ${allWordsResponse.statusText}`);
-          }
+        if (!response.ok) {
+          throw new Error(`API error (snapshot): ${response.status} - ${response.statusText}`);
+        }
 
-          const allWordsData = await allWordsResponse.json();
-          console.log('[useWords] API Response (all words):', allWordsData);
+        const snapshot = await response.json();
+        const fetchedWords: WordData[] = (snapshot.items || []).map((item: any) => ({
+          id: item.id || String(Math.random()),
+          english: item.english,
+          // Use target_word if available, otherwise fallback based on language (though API should ideally provide target_word)
+          targetWord: item.target_word || item[selectedLanguage] || `[Missing Target Word]`,
+        }));
 
-          if (allWordsData && Array.isArray(allWordsData.items)) {
-            const fetchedWords = allWordsData.items.map((item: any) => ({
-              id: item.id || String(Math.random()), 
-              english: item.english,
-              // Use target_word if available, otherwise fallback based on language (though API should ideally provide target_word)
-              targetWord: item.target_word || item[selectedLanguage] || `[Missing Target Word]`, 
-            }));
-            setWords(fetchedWords);
-             console.log(`[useWords] Successfully loaded ${fetchedWords.length} words.`);
-          } else {
-             console.warn('[useWords] API response for all words not in expected format:', allWordsData);
-             setError(`Warning: Could not parse all ${selectedLanguage} words from API. Using sample data.`);
-             setWords(getFallbackWords(selectedLanguage));
-          }
-        } else {
-          // No words found based on count
-          console.log(`[useWords] No words found for ${selectedLanguage} via API count.`);
-          setWords([]); // Set to empty array if count is 0 or undefined
-          // Optionally set an info message instead of an error if 0 is valid
-          // setError(`Info: No ${selectedLanguage} words currently available.`); 
+        if (fetchedWords.length === 0) {
+          console.log(`[useWords] No words found for ${selectedLanguage}.`);
         }
+        setWords(fetchedWords);
+        console.log(`[useWords] Successfully loaded ${fetchedWords.length} words.`);
 
       } catch (err: any) {
         console.error(`[useWords] Error fetching ${selectedLanguage} words:`, err);
@@ -0,0 +1,495 @@
+"""
+Vocabulary data operations shared by the Streamlit app (vocabulary_loader.py) and the
+command line (vocab.py).
+
+Nothing here talks to Streamlit, and importing this module neither connects to Qdrant
+nor imports qdrant_client or boto3: clients are created on first use and the modules
+that need them are imported inside the functions. Operations raise VocabularyError for
+refusals meant to be shown to the user and return plain results; callers decide how to
+report them.
+"""
+import io
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime
+from utils.fast_json import Word, encode_json
+from utils.words import word_point_id
+from utils.word_import import iter_chunks, iter_records, normalize_record
+
+COLLECTION = "words"
+SUPPORTED_LANGUAGES = ["salish", "italian"]
+# Points read per Qdrant scroll when paging through words
+FETCH_PAGE_SIZE = 1000
+
+# created: the collection was missing and has been created; index_error: why creating
+# its payload indexes failed, if it did
+CollectionStatus = namedtuple("CollectionStatus", ["created", "index_error"])
+# added/skipped/failed are "target - english [language]" labels; incomplete is a count;
+# chunks holds the utils.upload.ChunkResult of every upsert request
+InsertResult = namedtuple("InsertResult", ["added", "skipped", "incomplete", "failed", "chunks"])
+ImportResult = namedtuple("ImportResult", ["added", "skipped", "invalid", "failed", "seconds", "chunks"])
+# errors: (prompt, exception) pairs; malformed: generated lines that were not "target - english"
+GenerationResult = namedtuple("GenerationResult", ["words", "errors", "malformed", "seconds"])
+
+
+class VocabularyError(Exception):
+    """An operation was refused, e.g. an unsupported language or a duplicate word."""
+
+
+def check_language(language):
+    if language not in SUPPORTED_LANGUAGES:
+        raise VocabularyError(f"Invalid language: {language}. Must be one of {SUPPORTED_LANGUAGES}")
+
+
+def get_client():
+    """The process-wide Qdrant client, created on first use."""
+    from utils.qdrant_utils import get_qdrant_client
+    return get_qdrant_client()
+
+
+def ensure_collection():
+    """Creates the words collection and its payload indexes if the collection is missing."""
+    from qdrant_client.http import models
+    from utils.qdrant_utils import words_vectors_config
+
+    client = get_client()
+    if any(collection.name == COLLECTION for collection in client.get_collections().collections):
+        return CollectionStatus(False, None)
+
+    client.create_collection(
+        collection_name=COLLECTION,
+        vectors_config=words_vectors_config(),
+    )
+    try:
+        client.create_payload_index(collection_name=COLLECTION, field_name="language", field_schema=models.PayloadSchemaType.KEYWORD)
+        client.create_payload_index(collection_name=COLLECTION, field_name="target_word", field_schema=models.PayloadSchemaType.TEXT) # Index target word
+        client.create_payload_index(collection_name=COLLECTION, field_name="english", field_schema=models.PayloadSchemaType.TEXT)
+    except Exception as index_e:
+        return CollectionStatus(True, index_e)
+    return CollectionStatus(True, None)
+
+
+# --- Reads ---
+
+def normalize_word_payload(point):
+    """
+    Returns a point's payload as a word dict with id, language and target_word, or None
+    for a point whose payload is not a dict.
+    """
+    payload = point.payload
+    if not isinstance(payload, dict):
+        return None
+    # Add id from the point itself into the payload for easier reference
+    payload['id'] = point.id
+    # Handle potential legacy data without language
+    if 'language' not in payload:
+        payload['language'] = 'salish' # Assume old data is Salish
+    # Rename 'salish' to 'target_word' if present
+    if 'salish' in payload and 'target_word' not in payload:
+        payload['target_word'] = payload.pop('salish')
+    elif 'target_word' not in payload:
+        payload['target_word'] = "[missing]" # Placeholder if somehow missing
+    return payload
+
+
+def fetch_word_page(offset=None, limit=FETCH_PAGE_SIZE):
+    """
+    Reads one page of words starting at a scroll offset. Returns (words, next_offset);
+    next_offset is None after the last page. Points without a dict payload are left out.
+    """
+    records, next_offset = get_client().scroll(
+        collection_name=COLLECTION,
+        limit=limit,
+        offset=offset,
+        with_payload=True,
+        with_vectors=False
+    )
+    words = [word for word in map(normalize_word_payload, records) if word is not None]
+    return words, next_offset
+
+
+def iter_words(page_size=FETCH_PAGE_SIZE):
+    """
+    Yields every word in the collection, reading one page at a time, so callers never
+    hold more than one page unless they collect it.
+    """
+    offset = None
+    while True:
+        words, offset = fetch_word_page(offset, page_size)
+        yield from words
+        if offset is None:
+            return
+
+
+def count_words():
+    return get_client().count(collection_name=COLLECTION, exact=True).count
+
+
+def write_export(out, page_size=FETCH_PAGE_SIZE):
+    """
+    Writes every word to a binary file as a JSON array, one word per line, encoding each
+    word as it is read. Returns the number of words written.
+    """
+    out.write(b"[")
+    exported = 0
+    for w in iter_words(page_size):
+        out.write(b",\n  " if exported else b"\n  ")
+        out.write(encode_json(Word(w.get('target_word'), w.get('english'), w.get('language'))))
+        exported += 1
+    out.write(b"\n]\n" if exported else b"]\n")
+    return exported
+
+
+def export_words_json(page_size=FETCH_PAGE_SIZE):
+    """Returns (export bytes, word count); see write_export."""
+    buffer = io.BytesIO()
+    exported = write_export(buffer, page_size)
+    return buffer.getvalue(), exported
+
+
+# --- Writes ---
+
+def _word_point(point_id, target_word, english, language, vector, created_at=None, updated=False):
+    """
+    Builds a word point. An edited word keeps its original created_at (so the API can
+    still list it in created_at order) and records the edit in updated_at.
+    """
+    from qdrant_client.http import models
+    now = datetime.now().isoformat()
+    payload = {
+        "target_word": target_word, # Use generic field name
+        "english": english,
+        "language": language, # Store the language
+        "created_at": created_at or now
+    }
+    if updated:
+        payload["updated_at"] = now
+    return models.PointStruct(id=point_id, payload=payload, vector=vector)
+
+
+def add_word(target_word, english, language):
+    """Adds one word. Returns its point ID; raises VocabularyError for a duplicate."""
+    from utils.duplicates import get_duplicate_index
+    from utils.qdrant_utils import word_vectors
+
+    check_language(language)
+    client = get_client()
+    # IDs are derived from the word, so an exact duplicate is one lookup by ID
+    point_id = word_point_id(language, target_word, english)
+    if client.retrieve(collection_name=COLLECTION, ids=[point_id]):
+        raise VocabularyError(f"Word already exists for {language}: '{target_word}' - '{english}'.")
+
+    # Check for duplicates for the given language (hashed lookups, see utils/duplicates.py)
+    duplicate_index = get_duplicate_index(client, language)
+    if duplicate_index.contains(target_word, english):
+        raise VocabularyError(f"Word already exists for {language}! Either '{target_word}' or '{english}' is already in the database for this language.")
+
+    client.upsert(
+        collection_name=COLLECTION,
+        wait=True, # Wait for confirmation
+        points=[_word_point(point_id, target_word, english, language, word_vectors([(target_word, english)])[0])]
+    )
+    duplicate_index.add(target_word, english)
+    return point_id
+
+
+def update_word(id, target_word, english, language):
+    """
+    Updates a word, moving it to the ID of its new content. Returns the new point ID;
+    raises VocabularyError if the new content duplicates another word.
+    """
+    from qdrant_client.http import models
+    from utils.duplicates import get_duplicate_index
+    from utils.qdrant_utils import word_vectors
+
+    check_language(language)
+    client = get_client()
+    # The word as currently stored, so it is left out of its own duplicate check
+    current = client.retrieve(collection_name=COLLECTION, ids=[str(id)], with_payload=True)
+    old_payload = current[0].payload if current else {}
+    old_word = (old_payload.get('target_word') or old_payload.get('salish') or '', old_payload.get('english') or '')
+    old_language = old_payload.get('language', 'salish')
+
+    # Check for duplicates against other words of the same language
+    duplicate_index = get_duplicate_index(client, language)
+    if duplicate_index.contains(target_word, english, ignore=old_word if current and old_language == language else None):
+        raise VocabularyError(f"Cannot update: Either '{target_word}' or '{english}' already exists in another entry for {language}.")
+
+    # IDs are derived from the word, so an edited word moves to its new ID
+    new_id = word_point_id(language, target_word, english)
+    if new_id != str(id) and client.retrieve(collection_name=COLLECTION, ids=[new_id]):
+        raise VocabularyError(f"Cannot update: '{target_word}' - '{english}' already exists for {language}.")
+
+    client.upsert(
+        collection_name=COLLECTION,
+        wait=True,
+        # Overwritten with the new data plus updated_at
+        points=[_word_point(new_id, target_word, english, language, word_vectors([(target_word, english)])[0],
+                            created_at=old_payload.get('created_at'), updated=True)]
+    )
+    if new_id != str(id):
+        client.delete(
+            collection_name=COLLECTION,
+            points_selector=models.PointIdsList(points=[str(id)]),
+            wait=True
+        )
+    if current:
+        get_duplicate_index(client, old_language).discard(*old_word)
+    duplicate_index.add(target_word, english)
+    return new_id
+
+
+def delete_word(id):
+    from qdrant_client.http import models
+    from utils.duplicates import invalidate_duplicate_index
+
+    get_client().delete(
+        collection_name=COLLECTION,
+        points_selector=models.PointIdsList(
+            points=[str(id)] # Ensure ID is string if using UUIDs
+        ),
+        wait=True
+    )
+    # The deleted word's language is not known here, so rebuild every index on next use
+    invalidate_duplicate_index()
+
+
+def prepare_word_points(words, language, duplicate_index):
+    """
+    Builds points for the words that are not duplicates, adding them to the index as it
+    goes so repeats within `words` are caught too. Returns (points, added, skipped,
+    incomplete): the points, "target - english [language]" labels of added and skipped
+    words, and the count of items missing a field.
+    """
+    from utils.qdrant_utils import word_vectors
+
+    new_words = []
+    skipped_words = []
+    incomplete = 0
+
+    # Expecting `words` to be a list of dicts like {'target_word': '...', 'english': '...'}
+    for word_data in words:
+        target_word = word_data.get('target_word')
+        english = word_data.get('english')
+
+        if not target_word or not english:
+            incomplete += 1
+            continue
+
+        # Perform language-specific duplicate check
+        if duplicate_index.contains(target_word, english):
+            skipped_words.append(f"{target_word} - {english} [{language}]")
+            continue
+
+        # Content-addressed ID: the same word always gets the same ID
+        point_id = word_point_id(language, target_word, english)
+        new_words.append((point_id, target_word, english))
+        # Add the new word to the index for subsequent checks within the same batch
+        duplicate_index.add(target_word, english)
+
+    added_words = [f"{target_word} - {english} [{language}]" for _, target_word, english in new_words]
+
+    # Vectors for every new word in one batched pass (a no-op unless embeddings are on)
+    vectors = word_vectors([(target_word, english) for _, target_word, english in new_words])
+    points = [
+        _word_point(point_id, target_word, english, language, vector)
+        for (point_id, target_word, english), vector in zip(new_words, vectors)
+    ]
+    return points, added_words, skipped_words, incomplete
+
+
+def insert_words(words, language, on_chunk=None):
+    """
+    Inserts the words that are not duplicates through the parallel chunked upsert pipeline
+    (utils/upload.py). on_chunk(ChunkResult) is called as each chunk finishes. Returns an
+    InsertResult; words in chunks that still failed after retries are counted in failed.
+    """
+    from utils.duplicates import get_duplicate_index, invalidate_duplicate_index
+    from utils.upload import upsert_points
+
+    check_language(language)
+    client = get_client()
+    try:
+        # Every existing word of the language, hashed, so each check is O(1)
+        duplicate_index = get_duplicate_index(client, language)
+        points, added_words, skipped_words, incomplete = prepare_word_points(words, language, duplicate_index)
+        chunks = upsert_points(client, COLLECTION, points, on_chunk=on_chunk) if points else []
+    except Exception:
+        # The cached index already holds this batch's words; rebuild it from Qdrant
+        invalidate_duplicate_index(language)
+        raise
+
+    # Chunks hold consecutive points, so each result maps to a slice of added_words
+    stored, failed, start = [], [], 0
+    for chunk in chunks:
+        (failed if chunk.error else stored).extend(added_words[start:start + chunk.points])
+        start += chunk.points
+    if failed:
+        invalidate_duplicate_index(language)
+    return InsertResult(stored, skipped_words, incomplete, failed, chunks)
+
+
+def import_words(fileobj, filename, language, size=None, on_progress=None, on_chunk=None):
+    """
+    Streams an import file into Qdrant: records are parsed, normalized and deduplicated in
+    chunks of IMPORT_CHUNK_SIZE, and the resulting points feed the parallel upsert
+    pipeline while parsing continues, so memory stays bounded by a few chunks rather
+    than the whole file.
+
+    on_progress(added, skipped, invalid, fraction) is called after every uploaded chunk;
+    fraction is the share of `size` bytes consumed, or None without a size; on_chunk is
+    given each ChunkResult first. Chunks upserted before an error stay in the collection.
+    """
+    from utils.duplicates import get_duplicate_index, invalidate_duplicate_index
+    from utils.upload import upsert_points
+
+    check_language(language)
+    client = get_client()
+    # Updated by the pipeline's producer thread as it parses
+    parsed = {"skipped": 0, "invalid": 0}
+    added = failed = 0
+    started = time.perf_counter()
+
+    def import_points(duplicate_index):
+        for chunk in iter_chunks(iter_records(fileobj, filename)):
+            words = [word for word in (normalize_record(record, language) for record in chunk) if word is not None]
+            parsed["invalid"] += len(chunk) - len(words)
+            points, _, skipped_words, _ = prepare_word_points(words, language, duplicate_index)
+            parsed["skipped"] += len(skipped_words)
+            yield from points
+
+    def report(chunk):
+        nonlocal added, failed
+        if chunk.error:
+            failed += chunk.points
+        else:
+            added += chunk.points
+        if on_chunk:
+            on_chunk(chunk)
+        if on_progress:
+            # Progress by bytes consumed; the parser reads ahead of the uploads by a few chunks
+            on_progress(added, parsed["skipped"], parsed["invalid"], min(fileobj.tell() / size, 1.0) if size else None)
+
+    try:
+        duplicate_index = get_duplicate_index(client, language)
+        chunks = upsert_points(client, COLLECTION, import_points(duplicate_index), on_chunk=report)
+    except Exception:
+        # The cached index may hold words of the failed chunk
+        invalidate_duplicate_index(language)
+        raise
+    if failed:
+        invalidate_duplicate_index(language)
+    return ImportResult(added, parsed["skipped"], parsed["invalid"], failed, time.perf_counter() - started, chunks)
+
+
+# --- Migration ---
+
+def missing_language_status():
+    """
+    Returns (points missing a language, checkpoint of an interrupted run or None). A
+    checkpoint left when nothing is pending is obsolete and is removed.
+    """
+    from utils.migrations import MISSING_LANGUAGE, clear_checkpoint, count_pending, load_checkpoint
+
+    pending = count_pending(get_client(), MISSING_LANGUAGE)
+    if not pending:
+        clear_checkpoint(MISSING_LANGUAGE)
+        return 0, None
+    return pending, load_checkpoint(MISSING_LANGUAGE)
+
+
+def migrate_missing_language(mode="chunked", on_progress=None):
+    """
+    Sets 'language: salish' on points missing the field, with either one filter-based
+    set_payload ("filter") or resumable chunks ("chunked"). Returns a MigrationResult;
+    on_progress(updated, total, points_per_second) is called after every chunk.
+    """
+    from utils.migrations import MISSING_LANGUAGE, run_by_filter, run_in_chunks
+
+    if mode == "filter":
+        return run_by_filter(get_client(), MISSING_LANGUAGE)
+    if mode != "chunked":
+        raise VocabularyError(f"Unknown migration mode: {mode}. Must be 'chunked' or 'filter'")
+    return run_in_chunks(get_client(), MISSING_LANGUAGE, on_progress=on_progress)
+
+
+# --- Generation ---
+
+_lock = threading.Lock()
+_bedrock_client = None
+_response_cache = None
+
+
+def get_bedrock_client():
+    """One bedrock-runtime client per process, shared by every generation worker."""
+    global _bedrock_client
+    with _lock:
+        if _bedrock_client is None:
+            from utils.generation import create_bedrock_client
+            _bedrock_client = create_bedrock_client()
+        return _bedrock_client
+
+
+def get_response_cache():
+    """The on-disk Bedrock response cache, opened on first use."""
+    global _response_cache
+    with _lock:
+        if _response_cache is None:
+            from utils.response_cache import ResponseCache
+            _response_cache = ResponseCache()
+        return _response_cache
+
+
+def parse_generated_text(generated_text):
+    """
+    Parses "Target Word - English Word" lines. Returns (words, malformed lines).
+    """
+    words = []
+    malformed = []
+    # Clean the text of any backticks
+    cleaned_text = generated_text.replace('`', '').strip()
+
+    for line in cleaned_text.split('\n'):
+        if not line.strip():
+            continue
+
+        parts = line.strip().split(' - ')
+        if len(parts) == 2:  # Expecting Target Language Word - English Word
+            target_word_part = parts[0].strip()
+            english_part = parts[1].strip()
+
+            if target_word_part and english_part:  # Only add if both parts are non-empty
+                words.append({"target_word": target_word_part, "english": english_part})
+        else:
+            malformed.append(line)
+    return words, malformed
+
+
+def generate_words(prompts, language, use_cache=True):
+    """
+    Generates words for one or more prompts with concurrent Bedrock calls. Words repeated
+    across prompts are kept once. Responses are served from the response cache unless
+    use_cache is False. Nothing is inserted; see insert_words. Returns a GenerationResult.
+    """
+    from utils.generation import generate_texts
+
+    check_language(language)
+    if isinstance(prompts, str):
+        prompts = [prompts]
+
+    started = time.perf_counter()
+    results = generate_texts(get_bedrock_client(), prompts, language,
+                             cache=get_response_cache() if use_cache else None)
+    words_by_id = {}
+    errors = []
+    malformed = []
+    for prompt, generated_text, error in results:
+        if error is not None:
+            errors.append((prompt, error))
+            continue
+        words, bad_lines = parse_generated_text(generated_text)
+        malformed.extend(bad_lines)
+        for word in words:
+            words_by_id.setdefault(word_point_id(language, word['target_word'], word['english']), word)
+    return GenerationResult(list(words_by_id.values()), errors, malformed, time.perf_counter() - started)
@@ -0,0 +1,30 @@
+import pytest
+from qdrant_client import QdrantClient
+import core
+from utils.duplicates import invalidate_duplicate_index
+
+@pytest.fixture
+def qdrant(monkeypatch):
+    client = QdrantClient(":memory:")
+    monkeypatch.setattr(core, "get_client", lambda: client)
+    # Duplicate indexes are cached per process, so drop anything built by another test
+    invalidate_duplicate_index()
+    core.ensure_collection()
+    return client
+
+def test_update_word_keeps_created_at(qdrant):
+    old_id = core.add_word("gatto", "cat", "italian")
+    created_at = qdrant.retrieve(core.COLLECTION, [old_id], with_payload=True)[0].payload["created_at"]
+
+    new_id = core.update_word(old_id, "gatta", "cat", "italian")
+    assert new_id != old_id
+    assert not qdrant.retrieve(core.COLLECTION, [old_id])
+    payload = qdrant.retrieve(core.COLLECTION, [new_id], with_payload=True)[0].payload
+    assert payload["target_word"] == "gatta"
+    assert payload["created_at"] == created_at
+    assert payload["updated_at"] >= created_at
+
+def test_ensure_collection_creates_only_a_missing_collection(qdrant):
+    core.add_word("gatto", "cat", "italian")
+    assert core.ensure_collection() == core.CollectionStatus(False, None)
+    assert core.count_words() == 1
@@ -0,0 +1,69 @@
+import pytest
+from qdrant_client import QdrantClient
+from qdrant_client.http import models
+from utils.duplicates import DuplicateIndex, build_duplicate_index, get_duplicate_index, invalidate_duplicate_index
+
+@pytest.fixture
+def qdrant():
+    client = QdrantClient(":memory:")
+    client.create_collection(
+        collection_name="words",
+        vectors_config=models.VectorParams(size=4, distance=models.Distance.COSINE),
+    )
+    payloads = [
+        {"target_word": "Gatto", "english": "Cat", "language": "italian"},
+        {"target_word": "cane", "english": "dog", "language": "italian"},
+        {"target_word": "sqwel", "english": "bird", "language": "salish"},
+        # Legacy API point: target word under "salish" and no language, so Salish
+        {"salish": "spe'eth", "english": "bear"},
+    ]
+    client.upsert(
+        collection_name="words",
+        points=[models.PointStruct(id=i, payload=payload, vector=[0.0] * 4) for i, payload in enumerate(payloads, 1)]
+    )
+    invalidate_duplicate_index()
+    yield client
+    invalidate_duplicate_index()
+
+def test_index_matches_either_side_case_insensitively_per_language(qdrant):
+    italian = build_duplicate_index(qdrant, "italian")
+    assert len(italian) == 2
+    assert italian.contains("GATTO", "kitten")
+    assert italian.contains("micio", "cat")
+    assert not italian.contains("uccello", "bird")
+
+    salish = build_duplicate_index(qdrant, "salish")
+    assert salish.contains("sqwel", "x")
+    assert salish.contains("spe'eth", "x")
+    assert not salish.contains("cane", "x")
+
+def test_updated_word_is_left_out_of_its_own_check():
+    index = DuplicateIndex("italian")
+    index.add("gatto", "cat")
+    assert not index.contains("gatto", "kitty", ignore=("gatto", "cat"))
+    index.add("gatto", "kitten")
+    # Another word still uses "gatto"
+    assert index.contains("gatto", "kitty", ignore=("gatto", "cat"))
+    index.discard("gatto", "kitten")
+    index.discard("gatto", "cat")
+    assert not index.contains("gatto", "cat")
+
+def test_cached_index_is_reused_until_invalidated(qdrant, monkeypatch):
+    scrolls = []
+    scroll = qdrant.scroll
+
+    def counting_scroll(**kwargs):
+        scrolls.append(kwargs)
+        return scroll(**kwargs)
+
+    monkeypatch.setattr(qdrant, "scroll", counting_scroll)
+    index = get_duplicate_index(qdrant, "italian")
+    index.add("uccello", "bird")
+    assert get_duplicate_index(qdrant, "italian") is index
+    assert len(scrolls) == 1
+
+    invalidate_duplicate_index("italian")
+    rebuilt = get_duplicate_index(qdrant, "italian")
+    assert rebuilt is not index
+    assert not rebuilt.contains("uccello", "x")
+    assert len(scrolls) == 2
@@ -0,0 +1,28 @@
+import json
+from utils.fast_json import ENCODERS, Word, load_encoder
+import core
+
+WORDS = [Word("città", "city", "italian"), Word("ʔəsxʷ", "seal", "salish")]
+
+def test_every_encoder_writes_words_as_objects():
+    for name in ENCODERS:
+        try:
+            _, encode = load_encoder(name)
+        except ImportError:
+            continue
+        for indent in (False, True):
+            encoded = encode(WORDS, indent)
+            assert json.loads(encoded) == [
+                {"target_word": "città", "english": "city", "language": "italian"},
+                {"target_word": "ʔəsxʷ", "english": "seal", "language": "salish"},
+            ], (name, indent)
+
+def test_export_is_a_valid_json_array(monkeypatch):
+    words = [{"target_word": f"parola{i}", "english": f"word{i}", "language": "italian", "id": i} for i in range(3)]
+    monkeypatch.setattr(core, "iter_words", lambda page_size: iter(words))
+    body, exported = core.export_words_json()
+    assert exported == 3
+    assert json.loads(body) == [{key: word[key] for key in ("target_word", "english", "language")} for word in words]
+
+    monkeypatch.setattr(core, "iter_words", lambda page_size: iter([]))
+    assert json.loads(core.export_words_json()[0]) == []
@@ -0,0 +1,83 @@
+import pytest
+from qdrant_client import QdrantClient
+from qdrant_client.http import models
+import core
+from utils import migrations
+from utils.migrations import MISSING_LANGUAGE, count_pending, load_checkpoint, run_by_filter, run_in_chunks
+
+@pytest.fixture
+def qdrant(monkeypatch, tmp_path):
+    monkeypatch.setattr(migrations, "MIGRATION_CHECKPOINT_DIR", str(tmp_path))
+    client = QdrantClient(":memory:")
+    client.create_collection(
+        collection_name="words",
+        vectors_config=models.VectorParams(size=4, distance=models.Distance.COSINE),
+    )
+    client.upsert(
+        collection_name="words",
+        points=[
+            models.PointStruct(
+                id=i,
+                # Every third point already has a language; the other 16 need migrating
+                payload={"target_word": f"word{i}", "english": f"english{i}", **({"language": "italian"} if i % 3 == 0 else {})},
+                vector=[0.0] * 4
+            )
+            for i in range(1, 25)
+        ]
+    )
+    return client
+
+class Interrupted(Exception):
+    pass
+
+def interrupt(updated, total, points_per_second):
+    raise Interrupted()
+
+def languages(client):
+    records, _ = client.scroll("words", limit=100, with_payload=True)
+    return {record.id: record.payload["language"] for record in records}
+
+def test_run_in_chunks_updates_every_pending_point(qdrant):
+    progress = []
+    result = run_in_chunks(qdrant, MISSING_LANGUAGE, chunk_size=5, on_progress=lambda *args: progress.append(args[:2]))
+    assert result.updated == 16
+    assert not result.resumed
+    assert progress[-1] == (16, 16)
+    assert count_pending(qdrant, MISSING_LANGUAGE) == 0
+    assert languages(qdrant) == {i: "italian" if i % 3 == 0 else "salish" for i in range(1, 25)}
+    assert load_checkpoint(MISSING_LANGUAGE) is None
+
+def test_interrupted_run_resumes_from_its_checkpoint(qdrant):
+    def interrupt_after_two_chunks(updated, total, points_per_second):
+        if updated >= 10:
+            raise Interrupted()
+
+    with pytest.raises(Interrupted):
+        run_in_chunks(qdrant, MISSING_LANGUAGE, chunk_size=5, on_progress=interrupt_after_two_chunks)
+    assert load_checkpoint(MISSING_LANGUAGE)["updated"] == 10
+    assert count_pending(qdrant, MISSING_LANGUAGE) == 6
+
+    result = run_in_chunks(qdrant, MISSING_LANGUAGE, chunk_size=5)
+    assert result.resumed
+    assert result.updated == 16
+    assert count_pending(qdrant, MISSING_LANGUAGE) == 0
+    assert load_checkpoint(MISSING_LANGUAGE) is None
+
+def test_run_by_filter_updates_every_pending_point(qdrant):
+    result = run_by_filter(qdrant, MISSING_LANGUAGE)
+    assert result.updated == 16
+    assert count_pending(qdrant, MISSING_LANGUAGE) == 0
+    assert run_by_filter(qdrant, MISSING_LANGUAGE).updated == 0
+
+def test_obsolete_checkpoint_is_cleared_when_nothing_is_pending(qdrant, monkeypatch):
+    monkeypatch.setattr(core, "get_client", lambda: qdrant)
+    with pytest.raises(Interrupted):
+        run_in_chunks(qdrant, MISSING_LANGUAGE, chunk_size=5, on_progress=interrupt)
+    pending, checkpoint = core.missing_language_status()
+    assert pending == 11
+    assert checkpoint["updated"] == 5
+
+    # Another process finished the migration, leaving this run's checkpoint behind
+    run_by_filter(qdrant, MISSING_LANGUAGE)
+    assert core.missing_language_status() == (0, None)
+    assert load_checkpoint(MISSING_LANGUAGE) is None
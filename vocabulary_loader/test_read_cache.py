@@ -0,0 +1,54 @@
+import importlib
+import pytest
+from qdrant_client import QdrantClient
+import core
+from utils.duplicates import invalidate_duplicate_index
+
+@pytest.fixture
+def qdrant(monkeypatch):
+    client = QdrantClient(":memory:")
+    monkeypatch.setattr(core, "get_client", lambda: client)
+    invalidate_duplicate_index()
+    return client
+
+@pytest.fixture
+def loader(qdrant):
+    # Importing the app runs the UI once in bare mode, which also creates the collection
+    loader = importlib.import_module("vocabulary_loader")
+    loader._initialize_collections.clear()
+    loader.initialize_collections()
+    for cached in (loader.load_word_page, loader.load_word_count, loader.load_export):
+        cached.clear()
+    return loader
+
+def count_calls(monkeypatch, client, method):
+    calls = []
+    original = getattr(client, method)
+
+    def counted(*args, **kwargs):
+        calls.append(method)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(client, method, counted)
+    return calls
+
+def test_reads_are_cached_until_a_write_bumps_the_version(loader, qdrant, monkeypatch):
+    core.add_word("gatto", "cat", "italian")
+    scrolls = count_calls(monkeypatch, qdrant, "scroll")
+    counts = count_calls(monkeypatch, qdrant, "count")
+
+    version = loader.get_collection_version().value
+    words, _ = loader.load_word_page(version, None, 25)
+    assert [word["target_word"] for word in words] == ["gatto"]
+    assert loader.load_word_count(version) == 1
+    # A rerun without writes is served from the cache
+    assert loader.load_word_page(version, None, 25)[0] == words
+    assert loader.load_word_count(version) == 1
+    assert (len(scrolls), len(counts)) == (1, 1)
+
+    assert loader.add_word("cane", "dog", "italian")
+    new_version = loader.get_collection_version().value
+    assert new_version != version
+    words, _ = loader.load_word_page(new_version, None, 25)
+    assert sorted(word["target_word"] for word in words) == ["cane", "gatto"]
+    assert loader.load_word_count(new_version) == 2
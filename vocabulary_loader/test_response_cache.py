@@ -0,0 +1,51 @@
+import pytest
+from utils import response_cache
+from utils.response_cache import ResponseCache, cache_key
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(response_cache, "time", clock)
+    return clock
+
+def test_cache_key_depends_on_everything_sent():
+    key = cache_key("model-a", "italian", "animals", {"temperature": 0.5, "top_p": 0.9})
+    assert key == cache_key("model-a", "italian", "animals", {"top_p": 0.9, "temperature": 0.5})
+    assert key != cache_key("model-b", "italian", "animals", {"temperature": 0.5, "top_p": 0.9})
+    assert key != cache_key("model-a", "salish", "animals", {"temperature": 0.5, "top_p": 0.9})
+    assert key != cache_key("model-a", "italian", "food", {"temperature": 0.5, "top_p": 0.9})
+    assert key != cache_key("model-a", "italian", "animals", {"temperature": 0.7, "top_p": 0.9})
+
+def test_entries_expire_after_the_ttl(tmp_path, clock):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite3"), ttl_seconds=60, max_bytes=1024)
+    cache.set("k", "gatto - cat")
+    clock.now += 59
+    assert cache.get("k") == "gatto - cat"
+    clock.now += 1
+    assert cache.get("k") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_least_recently_used_entries_are_evicted_by_size(tmp_path, clock):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite3"), ttl_seconds=60, max_bytes=10)
+    cache.set("a", "aaaa")
+    clock.now += 1
+    cache.set("b", "bbbb")
+    clock.now += 1
+    assert cache.get("a") == "aaaa"
+    clock.now += 1
+    cache.set("c", "cccc")
+    assert cache.get("b") is None
+    assert cache.get("a") == "aaaa"
+    assert cache.get("c") == "cccc"
+
+def test_entries_survive_reopening(tmp_path, clock):
+    path = str(tmp_path / "cache.sqlite3")
+    ResponseCache(path).set("k", "cane - dog")
+    assert ResponseCache(path).get("k") == "cane - dog"
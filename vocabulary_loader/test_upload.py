@@ -0,0 +1,97 @@
+import threading
+import time
+from functools import partial
+import httpx
+import pytest
+from qdrant_client import QdrantClient
+from qdrant_client.http import models
+from qdrant_client.http.exceptions import UnexpectedResponse
+import core
+from utils import upload
+from utils.duplicates import invalidate_duplicate_index
+from utils.upload import upsert_points
+
+def http_error(status_code):
+    return UnexpectedResponse(status_code, "error", b"", httpx.Headers())
+
+def make_points(count):
+    return [models.PointStruct(id=i, payload={"n": i}, vector=[0.0] * 4) for i in range(count)]
+
+class FakeClient:
+    """Records upserted chunks; `fail(chunk, attempt)` may return an error to raise."""
+
+    def __init__(self, fail=None, delay=None):
+        self.fail = fail
+        self.delay = delay
+        self.attempts = {}
+        self.stored = []
+        self.lock = threading.Lock()
+
+    def upsert(self, collection_name, points, wait):
+        first_id = points[0].id
+        with self.lock:
+            attempt = self.attempts[first_id] = self.attempts.get(first_id, 0) + 1
+        if self.delay:
+            time.sleep(self.delay(points))
+        error = self.fail(points, attempt) if self.fail else None
+        if error is not None:
+            raise error
+        with self.lock:
+            self.stored.extend(point.id for point in points)
+
+def test_unavailable_chunk_is_retried_until_it_succeeds():
+    client = FakeClient(fail=lambda points, attempt: http_error(503) if attempt < 3 else None)
+    results = upsert_points(client, "words", make_points(3), workers=1, max_points=10, backoff_seconds=0.001)
+    assert [(result.attempts, result.error) for result in results] == [(3, None)]
+    assert sorted(client.stored) == [0, 1, 2]
+
+def test_client_error_is_not_retried():
+    client = FakeClient(fail=lambda points, attempt: http_error(400))
+    results = upsert_points(client, "words", make_points(3), workers=1, max_points=10, backoff_seconds=0.001)
+    assert len(results) == 1
+    assert results[0].attempts == 1
+    assert results[0].error is not None
+    assert client.stored == []
+
+def test_results_are_in_chunk_order():
+    # Earlier chunks finish last, so workers report them out of order
+    client = FakeClient(delay=lambda points: 0.02 * (3 - points[0].id // 2))
+    chunks = []
+    results = upsert_points(client, "words", make_points(8), workers=4, max_points=2, on_chunk=chunks.append)
+    assert [result.index for result in results] == [0, 1, 2, 3]
+    assert [result.points for result in results] == [2, 2, 2, 2]
+    assert sorted(result.index for result in chunks) == [0, 1, 2, 3]
+    assert sorted(client.stored) == list(range(8))
+
+def test_producer_error_is_reraised_after_queued_chunks():
+    def points():
+        yield from make_points(4)
+        raise ValueError("bad record")
+
+    client = FakeClient()
+    with pytest.raises(ValueError, match="bad record"):
+        upsert_points(client, "words", points(), workers=2, max_points=2)
+    # The first chunk was queued before the error; the second was still being filled
+    assert sorted(client.stored) == [0, 1]
+
+def test_insert_words_reports_the_words_of_failed_chunks(monkeypatch):
+    local = QdrantClient(":memory:")
+    original_upsert = local.upsert
+
+    def upsert(collection_name, points, wait):
+        if any(point.payload["target_word"] == "c" for point in points):
+            raise http_error(400)
+        return original_upsert(collection_name=collection_name, points=points, wait=wait)
+
+    monkeypatch.setattr(local, "upsert", upsert)
+    monkeypatch.setattr(core, "get_client", lambda: local)
+    monkeypatch.setattr(upload, "upsert_points", partial(upsert_points, max_points=2))
+    invalidate_duplicate_index()
+    core.ensure_collection()
+
+    words = [{"target_word": letter, "english": letter.upper()} for letter in "abcde"]
+    result = core.insert_words(words, "italian")
+    assert [chunk.points for chunk in result.chunks] == [2, 2, 1]
+    assert result.added == ["a - A [italian]", "b - B [italian]", "e - E [italian]"]
+    assert result.failed == ["c - C [italian]", "d - D [italian]"]
+    assert local.count(core.COLLECTION).count == 3
@@ -0,0 +1,57 @@
+import pytest
+from qdrant_client import QdrantClient
+import core
+import vocab
+from utils.duplicates import invalidate_duplicate_index
+
+@pytest.fixture
+def qdrant(monkeypatch):
+    client = QdrantClient(":memory:")
+    monkeypatch.setattr(core, "get_client", lambda: client)
+    invalidate_duplicate_index()
+    return client
+
+def test_import_adds_words(qdrant, tmp_path):
+    path = tmp_path / "words.ndjson"
+    path.write_text('{"target_word": "gatto", "english": "cat"}\n{"italian": "cane", "english": "dog"}\n')
+    assert vocab.main(["import", str(path), "--language", "italian"]) == 0
+    assert qdrant.count(core.COLLECTION).count == 2
+
+@pytest.mark.parametrize("name, content", [
+    ("words.ndjson", b'{"target_word": "gatto", "english": "cat"}\n{"target_word": \n'),
+    ("words.json", b'[{"target_word": "gatto", "english": "cat"}, {"target_word"'),
+    ("words.csv", b'target_word,english\ngatto,cat\n\xff\xfe,dog\n'),
+])
+def test_malformed_import_file_exits_with_one_line(qdrant, tmp_path, capsys, name, content):
+    path = tmp_path / name
+    path.write_bytes(content)
+    assert vocab.main(["import", str(path), "--language", "italian"]) == 2
+    assert capsys.readouterr().err.strip().splitlines()[-1].startswith("vocab import: ")
+
+def test_missing_import_file_exits_with_one_line(qdrant, tmp_path, capsys):
+    assert vocab.main(["import", str(tmp_path / "missing.json"), "--language", "italian"]) == 2
+    assert capsys.readouterr().err.startswith("vocab import: ")
+
+def test_failed_export_leaves_no_partial_file(qdrant, tmp_path, monkeypatch):
+    def failing_export(out):
+        out.write(b"[")
+        raise core.VocabularyError("connection lost")
+
+    monkeypatch.setattr(core, "write_export", failing_export)
+    assert vocab.main(["export", "-o", str(tmp_path / "export.json")]) == 2
+    assert list(tmp_path.iterdir()) == []
+
+def test_export_to_a_missing_directory_raises_the_open_error(qdrant, tmp_path):
+    args = vocab.build_parser().parse_args(["export", "-o", str(tmp_path / "missing" / "export.json")])
+    with pytest.raises(FileNotFoundError) as excinfo:
+        vocab.run_export(args)
+    # Raised by open() itself, not by the cleanup of a temp file that was never created
+    assert excinfo.value.__context__ is None
+
+def test_unrelated_value_error_is_not_reported_as_a_bad_file(qdrant, tmp_path, monkeypatch):
+    def broken_export(out):
+        raise ValueError("bug")
+
+    monkeypatch.setattr(core, "write_export", broken_export)
+    with pytest.raises(ValueError, match="bug"):
+        vocab.main(["export", "-o", str(tmp_path / "export.json")])
@@ -0,0 +1,116 @@
+import os
+import threading
+import time
+from collections import Counter
+from qdrant_client.http import models
+
+# Upper bound on how stale a cached index can get when another process writes
+DUPLICATE_INDEX_TTL_SECONDS = float(os.getenv("DUPLICATE_INDEX_TTL", "60"))
+SCROLL_PAGE_SIZE = 1000
+
+
+class DuplicateIndex:
+    """
+    Lowercased target words and english glosses of one language, for O(1) duplicate checks.
+
+    A word is a duplicate when either its target word or its english gloss is already
+    used in the same language, as in the loader's original is_duplicate_word. Keys are
+    counted rather than stored in sets, so a word can be left out of its own check
+    when it is being updated.
+    """
+
+    def __init__(self, language):
+        self.language = language
+        self.targets = Counter()
+        self.englishes = Counter()
+        self.built_at = time.monotonic()
+
+    def add(self, target_word, english):
+        self.targets[target_word.lower()] += 1
+        self.englishes[english.lower()] += 1
+
+    def discard(self, target_word, english):
+        for counter, key in ((self.targets, target_word.lower()), (self.englishes, english.lower())):
+            counter[key] -= 1
+            if counter[key] <= 0:
+                del counter[key]
+
+    def contains(self, target_word, english, ignore=None):
+        """
+        Checks for a duplicate. `ignore` is an existing (target_word, english) to leave out,
+        e.g. the word being updated.
+        """
+        target_key, english_key = target_word.lower(), english.lower()
+        ignored_target = ignored_english = None
+        if ignore is not None:
+            ignored_target, ignored_english = ignore[0].lower(), ignore[1].lower()
+        return (
+            self.targets[target_key] - (target_key == ignored_target) > 0
+            or self.englishes[english_key] - (english_key == ignored_english) > 0
+        )
+
+    def __len__(self):
+        return sum(self.englishes.values())
+
+
+def language_filter(language):
+    """
+    Matches a language's words. Legacy points without a language count as Salish, as in
+    core.normalize_word_payload.
+    """
+    conditions = [models.FieldCondition(key="language", match=models.MatchValue(value=language))]
+    if language == "salish":
+        conditions.append(models.IsEmptyCondition(is_empty=models.PayloadField(key="language")))
+    return models.Filter(should=conditions)
+
+
+def build_duplicate_index(client, language, collection="words"):
+    """
+    Builds a DuplicateIndex from every word of a language, one scroll page at a time
+    and reading only the word fields.
+    """
+    index = DuplicateIndex(language)
+    offset = None
+    while True:
+        records, offset = client.scroll(
+            collection_name=collection,
+            scroll_filter=language_filter(language),
+            limit=SCROLL_PAGE_SIZE,
+            offset=offset,
+            with_payload=["target_word", "salish", "english"],
+            with_vectors=False
+        )
+        for record in records:
+            payload = record.payload or {}
+            index.add(payload.get("target_word") or payload.get("salish") or "", payload.get("english") or "")
+        if offset is None:
+            return index
+
+
+_lock = threading.Lock()
+_indexes = {}  # language -> DuplicateIndex
+
+
+def get_duplicate_index(client, language):
+    """
+    Returns the cached index for a language, rebuilding it once it is older than the TTL.
+
+    Writes made through the loader update the cached index directly (add/discard), so
+    it only goes stale through writes from other processes.
+    """
+    with _lock:
+        index = _indexes.get(language)
+    if index is None or time.monotonic() - index.built_at >= DUPLICATE_INDEX_TTL_SECONDS:
+        index = build_duplicate_index(client, language)
+        with _lock:
+            _indexes[language] = index
+    return index
+
+
+def invalidate_duplicate_index(language=None):
+    """Drops the cached index for a language, or for every language when None."""
+    with _lock:
+        if language is None:
+            _indexes.clear()
+        else:
+            _indexes.pop(language, None)
@@ -0,0 +1,67 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Same local CPU model as language-learning-assistant's rag.py (384 dimensions)
+EMBEDDING_MODEL_NAME = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+EMBEDDING_DIMENSIONS = 384
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
+EMBEDDING_WORKERS = int(os.getenv("EMBEDDING_WORKERS", "2"))
+
+_model = None
+_model_lock = threading.Lock()
+
+
+def get_model():
+    """
+    Loads the sentence-transformer once per process, on first use.
+
+    sentence-transformers is only needed when embeddings are enabled, so it is imported here.
+    """
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                try:
+                    from sentence_transformers import SentenceTransformer
+                except ImportError as e:
+                    raise RuntimeError("sentence-transformers is required for WORDS_STORAGE_MODE=embedded") from e
+                _model = SentenceTransformer(EMBEDDING_MODEL_NAME, device="cpu")
+    return _model
+
+
+def encode_texts(texts, batch_size=EMBEDDING_BATCH_SIZE, workers=EMBEDDING_WORKERS):
+    """
+    Encodes texts into normalised embeddings, batch_size texts per model call.
+
+    Batches are spread over a small thread pool; the model releases the GIL while it
+    computes, so several batches can run on separate CPU cores. Order is preserved.
+    """
+    if not texts:
+        return []
+    model = get_model()
+    batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+
+    def encode_batch(batch):
+        return model.encode(batch, batch_size=batch_size, normalize_embeddings=True).tolist()
+
+    if workers <= 1 or len(batches) == 1:
+        results = [encode_batch(batch) for batch in batches]
+    else:
+        with ThreadPoolExecutor(max_workers=min(workers, len(batches))) as executor:
+            results = list(executor.map(encode_batch, batches))
+    return [vector for batch in results for vector in batch]
+
+
+def embed_words(pairs, batch_size=EMBEDDING_BATCH_SIZE, workers=EMBEDDING_WORKERS):
+    """
+    Returns named vectors {"target_word": ..., "english": ...} for (target_word, english) pairs.
+
+    Both sides are encoded in a single pass so small inserts still fill whole batches.
+    """
+    texts = [target for target, _ in pairs] + [english for _, english in pairs]
+    vectors = encode_texts(texts, batch_size, workers)
+    return [
+        {"target_word": vectors[i], "english": vectors[len(pairs) + i]}
+        for i in range(len(pairs))
+    ]
@@ -0,0 +1,70 @@
+import json
+import os
+from dataclasses import asdict, dataclass
+
+# JSON encoder for exports: "auto" (orjson, then msgspec, then json), or one of ENCODERS
+JSON_ENCODER = os.getenv("JSON_ENCODER", "auto")
+
+
+@dataclass(slots=True)
+class Word:
+    """One exported word. Slots keep a large export far smaller than the same list of dicts."""
+    target_word: str
+    english: str
+    language: str
+
+
+def _json_encode(obj, indent):
+    return json.dumps(
+        obj, indent=2 if indent else None, ensure_ascii=False,
+        default=lambda value: asdict(value) if isinstance(value, Word) else str(value)
+    ).encode("utf-8")
+
+
+def _orjson_encoder():
+    import orjson
+    return lambda obj, indent: orjson.dumps(obj, default=str, option=orjson.OPT_INDENT_2 if indent else 0)
+
+
+def _msgspec_encoder():
+    import msgspec
+    encoder = msgspec.json.Encoder(enc_hook=str)
+
+    def encode(obj, indent):
+        data = encoder.encode(obj)
+        return msgspec.json.format(data, indent=2) if indent else data
+    return encode
+
+
+# name -> factory returning an encode(obj, indent) -> bytes function; factories import lazily
+ENCODERS = {
+    "orjson": _orjson_encoder,
+    "msgspec": _msgspec_encoder,
+    "json": lambda: _json_encode,
+}
+
+
+def load_encoder(name=JSON_ENCODER):
+    """
+    Returns (name, encode) for the requested encoder, as in my-learning-api's utils/fast_json.py.
+    """
+    if name != "auto":
+        if name not in ENCODERS:
+            raise ValueError(f"JSON_ENCODER must be 'auto' or one of {', '.join(ENCODERS)}")
+        return name, ENCODERS[name]()
+    for candidate in ("orjson", "msgspec"):
+        try:
+            return candidate, ENCODERS[candidate]()
+        except ImportError:
+            continue
+    return "json", _json_encode
+
+
+ENCODER_NAME, _encode = load_encoder()
+
+
+def encode_json(obj, indent=False):
+    """
+    Serializes obj (dicts, lists, Word instances) to UTF-8 JSON bytes.
+    """
+    return _encode(obj, indent)
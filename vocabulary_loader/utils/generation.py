@@ -0,0 +1,92 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+import boto3
+from botocore.config import Config
+from utils.response_cache import cache_key
+
+BEDROCK_REGION = os.getenv("BEDROCK_REGION", "us-east-1")
+BEDROCK_MODEL_ID = os.getenv("BEDROCK_MODEL_ID", "amazon.nova-lite-v1:0")
+# Concurrent invoke_model calls in a batch generation
+GENERATION_WORKERS = int(os.getenv("GENERATION_WORKERS", "4"))
+WORDS_PER_PROMPT = 10
+
+
+def create_bedrock_client():
+    """
+    Builds a bedrock-runtime client. boto3 clients are thread-safe, so one client is shared
+    by every worker; its connection pool is sized for GENERATION_WORKERS.
+    """
+    return boto3.client(
+        service_name="bedrock-runtime",
+        region_name=BEDROCK_REGION,
+        config=Config(max_pool_connections=max(GENERATION_WORKERS, 10))
+    )
+
+
+def build_generation_prompt(prompt, language):
+    return (
+        f"{prompt} Generate {WORDS_PER_PROMPT} vocabulary words with translations between English and "
+        f"{language.capitalize()}. Format each line strictly as: {language.capitalize()} Word - English Word. "
+        "Include only the words per line, no numbering, backticks, or other formatting."
+    )
+
+
+def build_request_body(prompt, language):
+    """The invoke_model request body. Anything besides "messages" is an inference parameter."""
+    return {
+        "messages": [
+            {
+                "role": "user",
+                "content": [{"text": build_generation_prompt(prompt, language)}]
+            }
+        ]
+    }
+
+
+def invoke_generation(bedrock_client, prompt, language, cache=None):
+    """
+    Sends one generation prompt to Bedrock and returns the generated text.
+
+    With a ResponseCache, a response cached for the same model, language, full prompt and
+    inference parameters is returned without calling Bedrock.
+    """
+    body = build_request_body(prompt, language)
+    key = None
+    if cache is not None:
+        params = {name: value for name, value in body.items() if name != "messages"}
+        key = cache_key(BEDROCK_MODEL_ID, language, build_generation_prompt(prompt, language), params)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    response = bedrock_client.invoke_model(
+        body=json.dumps(body),
+        modelId=BEDROCK_MODEL_ID,
+        contentType="application/json",
+        accept="application/json"
+    )
+    response_body = json.loads(response['body'].read().decode('utf-8'))
+    text = response_body['output']['message']['content'][0]['text']
+    if cache is not None:
+        cache.set(key, text)
+    return text
+
+
+def generate_texts(bedrock_client, prompts, language, max_workers=GENERATION_WORKERS, cache=None):
+    """
+    Runs invoke_generation for every prompt on a bounded thread pool.
+
+    Returns (prompt, text, error) tuples in prompt order; exactly one of text and error is
+    None, so one failed prompt does not lose the others.
+    """
+    def generate(prompt):
+        try:
+            return prompt, invoke_generation(bedrock_client, prompt, language, cache), None
+        except Exception as e:
+            return prompt, None, e
+
+    if len(prompts) == 1:
+        return [generate(prompts[0])]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(prompts))) as pool:
+        return list(pool.map(generate, prompts))
@@ -0,0 +1,125 @@
+import json
+import os
+import time
+from collections import namedtuple
+from qdrant_client.http import models
+
+MIGRATION_CHUNK_SIZE = int(os.getenv("MIGRATION_CHUNK_SIZE", "1000"))
+# Where chunked runs record how far they got, so an interrupted run can resume
+MIGRATION_CHECKPOINT_DIR = os.getenv("MIGRATION_CHECKPOINT_DIR", ".migrations")
+
+# Sets `payload` on every point matching `scroll_filter`. The filter must stop matching a
+# point once the payload is set, so re-running a migration only touches what is left.
+PayloadMigration = namedtuple("PayloadMigration", ["name", "scroll_filter", "payload"])
+MigrationResult = namedtuple("MigrationResult", ["updated", "seconds", "points_per_second", "resumed"])
+
+MISSING_LANGUAGE = PayloadMigration(
+    "missing-language",
+    models.Filter(must=[models.IsEmptyCondition(is_empty=models.PayloadField(key="language"))]),
+    {"language": "salish"}
+)
+
+
+def count_pending(client, migration, collection="words"):
+    """Exact number of points the migration still has to update."""
+    return client.count(collection_name=collection, count_filter=migration.scroll_filter, exact=True).count
+
+
+def _checkpoint_path(migration, collection):
+    return os.path.join(MIGRATION_CHECKPOINT_DIR, f"{collection}-{migration.name}.json")
+
+
+def load_checkpoint(migration, collection="words"):
+    """Returns the saved {"offset", "updated"} of an interrupted run, or None."""
+    try:
+        with open(_checkpoint_path(migration, collection)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def _save_checkpoint(migration, collection, checkpoint):
+    path = _checkpoint_path(migration, collection)
+    os.makedirs(MIGRATION_CHECKPOINT_DIR, exist_ok=True)
+    with open(path + ".tmp", "w") as f:
+        json.dump(checkpoint, f)
+    os.replace(path + ".tmp", path)
+
+
+def clear_checkpoint(migration, collection="words"):
+    try:
+        os.remove(_checkpoint_path(migration, collection))
+    except FileNotFoundError:
+        pass
+
+
+def run_by_filter(client, migration, collection="words"):
+    """
+    Applies the migration with one filter-based set_payload, letting Qdrant find and update
+    the points itself. Fastest, but reports no progress while it runs.
+    """
+    started = time.perf_counter()
+    pending = count_pending(client, migration, collection)
+    if pending:
+        client.set_payload(
+            collection_name=collection,
+            payload=migration.payload,
+            points=models.FilterSelector(filter=migration.scroll_filter),
+            wait=True
+        )
+    seconds = time.perf_counter() - started
+    return MigrationResult(pending, seconds, pending / seconds if seconds else 0.0, False)
+
+
+def run_in_chunks(client, migration, collection="words", chunk_size=MIGRATION_CHUNK_SIZE, on_progress=None):
+    """
+    Applies the migration chunk by chunk: scrolls IDs of matching points and sets the
+    payload on each chunk with wait=False, so Qdrant applies a chunk while the next one is
+    read. The last chunk is sent with wait=True, which acts as a barrier: Qdrant applies a
+    collection's updates in order, so every earlier chunk is applied when it returns.
+
+    After each chunk the next scroll offset is saved as a checkpoint, and a later run
+    starts from there. Updates sent with wait=False are already in Qdrant's write-ahead log
+    when acknowledged, so resuming past them loses nothing. The checkpoint is removed once
+    the run completes.
+
+    on_progress(updated, total, points_per_second) is called after every chunk.
+    """
+    checkpoint = load_checkpoint(migration, collection)
+    offset = checkpoint["offset"] if checkpoint else None
+    already_updated = checkpoint["updated"] if checkpoint else 0
+    total = already_updated + count_pending(client, migration, collection)
+
+    started = time.perf_counter()
+    updated = 0
+    while True:
+        records, next_offset = client.scroll(
+            collection_name=collection,
+            scroll_filter=migration.scroll_filter,
+            limit=chunk_size,
+            offset=offset,
+            with_payload=False,
+            with_vectors=False
+        )
+        if records:
+            client.set_payload(
+                collection_name=collection,
+                payload=migration.payload,
+                points=[record.id for record in records],
+                wait=next_offset is None
+            )
+            updated += len(records)
+        if next_offset is None:
+            break
+        offset = next_offset
+        _save_checkpoint(migration, collection, {"offset": offset, "updated": already_updated + updated})
+        if on_progress:
+            seconds = time.perf_counter() - started
+            on_progress(already_updated + updated, total, updated / seconds if seconds else 0.0)
+
+    clear_checkpoint(migration, collection)
+    seconds = time.perf_counter() - started
+    rate = updated / seconds if seconds else 0.0
+    if on_progress:
+        on_progress(already_updated + updated, total, rate)
+    return MigrationResult(already_updated + updated, seconds, rate, checkpoint is not None)
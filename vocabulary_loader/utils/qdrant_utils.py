@@ -1,14 +1,62 @@
+import os
+import threading
+import httpx
 from qdrant_client import QdrantClient
+from qdrant_client.http import models
 from config import QDRANT_URL, QDRANT_API_KEY # Import Qdrant config from config.py
 
-def get_qdrant_client():
+# How word points are stored; must match the my-learning-api setting for the same collection.
+#   dense      - a 384-dim placeholder vector per point (the original layout)
+#   vectorless - no vectors at all; words are only ever read by payload filters
+#   embedded   - real sentence embeddings in named vectors "target_word" and "english"
+WORDS_STORAGE_MODE = os.getenv("WORDS_STORAGE_MODE", "dense")
+
+# Placeholder vector shared by every dense-mode word point
+ZERO_VECTOR = [0.0] * 384
+
+def _env_flag(name, default="false"):
+    return os.getenv(name, default).lower() in ("1", "true", "yes")
+
+# Connection settings shared by every client this process creates
+QDRANT_PREFER_GRPC = _env_flag("QDRANT_PREFER_GRPC")
+QDRANT_TIMEOUT = int(os.getenv("QDRANT_TIMEOUT", "10"))
+QDRANT_MAX_CONNECTIONS = int(os.getenv("QDRANT_MAX_CONNECTIONS", "20"))
+
+_clients = {}  # pid -> QdrantClient
+_clients_lock = threading.Lock()
+
+def create_qdrant_client(prefer_grpc=None, timeout=None):
     """
-    Returns a Qdrant client instance using configuration from config.py.
+    Builds a new Qdrant client using configuration from config.py.
+
+    The REST transport keeps up to QDRANT_MAX_CONNECTIONS pooled keep-alive connections.
+    Most code should call get_qdrant_client() instead, which reuses one client per process.
     """
-    client = QdrantClient(
+    return QdrantClient(
         QDRANT_URL,
-        api_key=QDRANT_API_KEY
+        api_key=QDRANT_API_KEY,
+        prefer_grpc=QDRANT_PREFER_GRPC if prefer_grpc is None else prefer_grpc,
+        timeout=QDRANT_TIMEOUT if timeout is None else timeout,
+        limits=httpx.Limits(
+            max_connections=QDRANT_MAX_CONNECTIONS,
+            max_keepalive_connections=QDRANT_MAX_CONNECTIONS
+        )
     )
+
+def get_qdrant_client():
+    """
+    Returns the process-wide Qdrant client, creating it on first use.
+
+    Clients are keyed by process ID, so each forked worker (e.g. under gunicorn) builds
+    its own connection pool instead of sharing sockets inherited from the parent.
+    """
+    pid = os.getpid()
+    client = _clients.get(pid)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(pid)
+            if client is None:
+                client = _clients[pid] = create_qdrant_client()
     return client
 
 def init_qdrant():
@@ -16,4 +64,28 @@ def init_qdrant():
     Initializes Qdrant client and performs any necessary setup.
     (Currently this function is empty, but you can add setup steps here if needed)
     """
-    pass # Placeholder for future Qdrant initialization steps 
\ No newline at end of file
+    pass # Placeholder for future Qdrant initialization steps 
+
+def words_vectors_config():
+    """
+    Returns the vectors config used when creating the words collection.
+    """
+    if WORDS_STORAGE_MODE == "vectorless":
+        return {}
+    if WORDS_STORAGE_MODE == "embedded":
+        return {
+            name: models.VectorParams(size=384, distance=models.Distance.COSINE)
+            for name in ("target_word", "english")
+        }
+    return models.VectorParams(size=384, distance=models.Distance.COSINE)
+
+def word_vectors(pairs):
+    """
+    Returns the vectors to store for (target_word, english) pairs.
+
+    Embedded mode encodes all pairs in one batched pass; the other modes need no model.
+    """
+    if WORDS_STORAGE_MODE == "embedded":
+        from utils.embeddings import embed_words
+        return embed_words(pairs)
+    return [{} if WORDS_STORAGE_MODE == "vectorless" else ZERO_VECTOR] * len(pairs)
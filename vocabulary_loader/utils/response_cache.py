@@ -0,0 +1,95 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+# SQLite file holding cached Bedrock responses; shared by every loader process on the host
+GENERATION_CACHE_PATH = os.getenv("GENERATION_CACHE_PATH", os.path.join(".cache", "generation.sqlite3"))
+GENERATION_CACHE_TTL_SECONDS = float(os.getenv("GENERATION_CACHE_TTL", str(7 * 24 * 3600)))
+# Least recently used responses are evicted once the cached text exceeds this size
+GENERATION_CACHE_MAX_BYTES = int(float(os.getenv("GENERATION_CACHE_MAX_MB", "64")) * 1024 * 1024)
+
+
+def cache_key(model_id, language, prompt, params):
+    """
+    SHA-256 of everything that determines a response. `params` is the inference
+    configuration sent with the prompt; dict key order does not matter.
+    """
+    material = json.dumps([model_id, language, prompt, params], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Persistent model response cache in SQLite, with a TTL and least-recently-used eviction
+    by total size. Hit and miss counts are kept for this process.
+    """
+
+    def __init__(self, path=GENERATION_CACHE_PATH, ttl_seconds=GENERATION_CACHE_TTL_SECONDS,
+                 max_bytes=GENERATION_CACHE_MAX_BYTES):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, text TEXT NOT NULL, size INTEGER NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+
+    @contextmanager
+    def _connect(self):
+        # One short-lived connection per call, so the cache can be used from any thread
+        db = sqlite3.connect(self.path, timeout=10)
+        try:
+            with db:  # commits, or rolls back on error
+                yield db
+        finally:
+            db.close()
+
+    def get(self, key):
+        """Returns the cached text for a key, or None when missing or expired."""
+        now = time.time()
+        with self._lock, self._connect() as db:
+            row = db.execute("SELECT text, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None and now - row[1] >= self.ttl_seconds:
+                db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return row[0]
+
+    def set(self, key, text):
+        """Stores a response, then drops expired entries and evicts down to max_bytes."""
+        now = time.time()
+        with self._lock, self._connect() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO responses (key, text, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, text, len(text.encode("utf-8")), now, now)
+            )
+            db.execute("DELETE FROM responses WHERE created_at <= ?", (now - self.ttl_seconds,))
+            total = db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total > self.max_bytes:
+                evict = []
+                for old_key, size in db.execute("SELECT key, size FROM responses ORDER BY accessed_at"):
+                    if total <= self.max_bytes:
+                        break
+                    evict.append((old_key,))
+                    total -= size
+                db.executemany("DELETE FROM responses WHERE key = ?", evict)
+
+    def clear(self):
+        with self._lock, self._connect() as db:
+            db.execute("DELETE FROM responses")
@@ -0,0 +1,148 @@
+import os
+import queue
+import random
+import threading
+import time
+from collections import namedtuple
+from utils.fast_json import encode_json
+
+# Upper bounds for one upsert request; Qdrant rejects requests over its
+# service.max_request_size_mb (32 MB by default)
+UPSERT_CHUNK_SIZE = int(os.getenv("UPSERT_CHUNK_SIZE", "500"))
+UPSERT_CHUNK_MAX_BYTES = int(float(os.getenv("UPSERT_CHUNK_MAX_MB", "4")) * 1024 * 1024)
+# Chunks uploaded at once
+UPSERT_WORKERS = int(os.getenv("UPSERT_WORKERS", "4"))
+# Attempts per chunk, with exponential backoff starting at UPSERT_BACKOFF seconds
+UPSERT_ATTEMPTS = int(os.getenv("UPSERT_ATTEMPTS", "4"))
+UPSERT_BACKOFF_SECONDS = float(os.getenv("UPSERT_BACKOFF", "0.5"))
+
+# seconds: latency of the last attempt; error: None once the chunk is stored
+ChunkResult = namedtuple("ChunkResult", ["index", "points", "bytes", "seconds", "attempts", "error"])
+
+
+def point_size(point):
+    """Approximate size of a PointStruct in an upsert request body, in bytes."""
+    return len(encode_json({"id": point.id, "payload": point.payload, "vector": point.vector}))
+
+
+def size_bounded_chunks(points, max_points=UPSERT_CHUNK_SIZE, max_bytes=UPSERT_CHUNK_MAX_BYTES):
+    """
+    Groups an iterable of points into (points, bytes) chunks of at most max_points points
+    and, unless a single point is larger, max_bytes bytes.
+    """
+    chunk, chunk_bytes = [], 0
+    for point in points:
+        size = point_size(point)
+        if chunk and (len(chunk) >= max_points or chunk_bytes + size > max_bytes):
+            yield chunk, chunk_bytes
+            chunk, chunk_bytes = [], 0
+        chunk.append(point)
+        chunk_bytes += size
+    if chunk:
+        yield chunk, chunk_bytes
+
+
+def _is_retryable(error):
+    # Client errors other than 429 will fail the same way again
+    status = getattr(error, "status_code", None)
+    return status is None or status == 429 or status >= 500
+
+
+def _upsert_with_retry(client, collection, index, chunk, chunk_bytes, attempts, backoff_seconds):
+    for attempt in range(1, attempts + 1):
+        started = time.perf_counter()
+        try:
+            client.upsert(collection_name=collection, points=chunk, wait=True)
+            return ChunkResult(index, len(chunk), chunk_bytes, time.perf_counter() - started, attempt, None)
+        except Exception as e:
+            seconds = time.perf_counter() - started
+            if attempt == attempts or not _is_retryable(e):
+                return ChunkResult(index, len(chunk), chunk_bytes, seconds, attempt, str(e))
+            # Full jitter, so workers that failed together do not retry together
+            time.sleep(random.uniform(0, backoff_seconds * 2 ** (attempt - 1)))
+
+
+def _is_local(client):
+    # QdrantClient(":memory:") and QdrantClient(path=...) run in-process and are not thread-safe
+    return type(getattr(client, "_client", None)).__name__ == "QdrantLocal"
+
+
+def upsert_points(client, collection, points, workers=UPSERT_WORKERS, max_points=UPSERT_CHUNK_SIZE,
+                  max_bytes=UPSERT_CHUNK_MAX_BYTES, attempts=UPSERT_ATTEMPTS,
+                  backoff_seconds=UPSERT_BACKOFF_SECONDS, on_chunk=None):
+    """
+    Upserts points through a producer/consumer pipeline and returns one ChunkResult per
+    chunk, in chunk order.
+
+    A producer thread consumes `points` (any iterable, so points can be built while
+    earlier chunks upload) and queues size-bounded chunks; `workers` threads upsert them,
+    retrying failed chunks with exponential backoff. The queue holds at most two chunks
+    per worker, so a slow Qdrant holds back the producer instead of filling memory.
+    Upserts are idempotent, so a retried chunk never duplicates points.
+
+    on_chunk(result) is called in the calling thread as each chunk finishes, so it may
+    update a UI. An exception raised while producing points is re-raised once the chunks
+    already queued have been uploaded.
+    """
+    if _is_local(client):
+        workers = 1
+    work = queue.Queue(maxsize=2 * workers)
+    done = queue.Queue()
+    produce_error = []
+
+    def produce():
+        try:
+            for index, (chunk, chunk_bytes) in enumerate(size_bounded_chunks(points, max_points, max_bytes)):
+                work.put((index, chunk, chunk_bytes))
+        except BaseException as e:
+            produce_error.append(e)
+        finally:
+            for _ in range(workers):
+                work.put(None)
+
+    def consume():
+        try:
+            while True:
+                item = work.get()
+                if item is None:
+                    return
+                done.put(_upsert_with_retry(client, collection, *item, attempts, backoff_seconds))
+        finally:
+            done.put(None)
+
+    threads = [threading.Thread(target=produce, daemon=True)]
+    threads += [threading.Thread(target=consume, daemon=True) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+
+    results = []
+    finished_workers = 0
+    while finished_workers < workers:
+        result = done.get()
+        if result is None:
+            finished_workers += 1
+            continue
+        results.append(result)
+        if on_chunk:
+            on_chunk(result)
+    for thread in threads:
+        thread.join()
+
+    if produce_error:
+        raise produce_error[0]
+    return sorted(results, key=lambda result: result.index)
+
+
+def summarize_chunks(results):
+    """One line describing upload chunks: count, latency percentiles, retries and failures."""
+    if not results:
+        return "no chunks uploaded"
+    latencies = sorted(result.seconds * 1000 for result in results)
+
+    def percentile(fraction):
+        return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))]
+
+    retried = sum(result.attempts > 1 for result in results)
+    failed = sum(result.error is not None for result in results)
+    return (f"{len(results)} chunks, latency p50 {percentile(0.5):.0f} ms / p95 {percentile(0.95):.0f} ms / "
+            f"max {latencies[-1]:.0f} ms, {retried} retried, {failed} failed")
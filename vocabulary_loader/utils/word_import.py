@@ -0,0 +1,70 @@
+import codecs
+import csv
+import json
+import os
+from itertools import islice
+
+try:
+    import ijson
+except ImportError:  # JSON arrays are then parsed in one go; NDJSON and CSV still stream
+    ijson = None
+
+IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", "1000"))
+IMPORT_PREVIEW_ROWS = 50
+IMPORT_FILE_TYPES = ["json", "ndjson", "jsonl", "csv"]
+# Raised by iter_records for malformed files (json and Unicode errors are ValueErrors)
+INVALID_FILE_ERRORS = (ValueError, csv.Error) + ((ijson.JSONError,) if ijson is not None else ())
+
+
+def iter_records(fileobj, filename):
+    """
+    Yields the raw records of an import file one at a time, without reading the whole
+    file first. The format follows the extension: a JSON array (.json), one JSON object
+    per line (.ndjson, .jsonl) or CSV with a header row (.csv).
+    """
+    extension = os.path.splitext(filename)[1].lower().lstrip(".")
+    # A codecs reader, unlike io.TextIOWrapper, does not close the upload when discarded
+    if extension in ("ndjson", "jsonl"):
+        for line in codecs.getreader("utf-8-sig")(fileobj):
+            if line.strip():
+                yield json.loads(line)
+    elif extension == "csv":
+        yield from csv.DictReader(codecs.getreader("utf-8-sig")(fileobj))
+    elif ijson is not None:
+        yield from ijson.items(fileobj, "item", use_float=True)
+    else:
+        yield from json.load(fileobj)
+
+
+def normalize_record(record, language):
+    """
+    Returns {"target_word", "english"} for a record, or None if it is not a usable word.
+    Legacy files may name the target word after the language ("salish", "italian").
+    """
+    if not isinstance(record, dict):
+        return None
+    english = record.get('english')
+    target = record.get('target_word') or record.get(language)
+    if isinstance(target, str) and isinstance(english, str) and target.strip() and english.strip():
+        return {'target_word': target.strip(), 'english': english.strip()}
+    return None
+
+
+def iter_chunks(records, size=IMPORT_CHUNK_SIZE):
+    """Groups an iterable into lists of at most `size` items."""
+    iterator = iter(records)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def preview_records(fileobj, filename, language, rows=IMPORT_PREVIEW_ROWS):
+    """Normalizes only the first `rows` records, for display before an import."""
+    preview = []
+    for record in islice(iter_records(fileobj, filename), rows):
+        word = normalize_record(record, language)
+        if word is not None:
+            preview.append(word)
+    return preview
@@ -0,0 +1,23 @@
+import unicodedata
+import uuid
+
+# Must match my-learning-api/utils/words.py so both services give a word the same point ID
+WORD_ID_NAMESPACE = uuid.UUID("6f1c3f0e-5d0b-5a4e-9c57-3a8e2f4d7b10")
+
+
+def normalize_word_text(text):
+    """
+    Normalizes word text for IDs: Unicode NFC, case-folded, whitespace collapsed.
+    """
+    return " ".join(unicodedata.normalize("NFC", text).casefold().split())
+
+
+def word_point_id(language, target_word, english):
+    """
+    Returns the content-addressed point ID (UUIDv5) for a word.
+
+    The same (language, target word, english) always maps to the same ID, so an exact
+    duplicate is found with one retrieve by ID and re-running an import is idempotent.
+    """
+    key = "\x1f".join((language, normalize_word_text(target_word), normalize_word_text(english)))
+    return str(uuid.uuid5(WORD_ID_NAMESPACE, key))
@@ -0,0 +1,177 @@
+"""
+Command line for the vocabulary loader, for cron jobs and batch pipelines:
+
+    python vocab.py import words.ndjson --language italian
+    python vocab.py export -o vocabulary_export.json
+    python vocab.py migrate --mode chunked
+    python vocab.py generate --language salish "animals" "food" --dry-run
+
+It runs the same operations as the Streamlit app (see core.py) without importing
+Streamlit. Qdrant and Bedrock clients are only created by the commands that use them.
+Progress goes to stderr; exports written to stdout stay clean.
+"""
+import argparse
+import contextlib
+import os
+import sys
+import core
+from utils.upload import summarize_chunks
+from utils.word_import import INVALID_FILE_ERRORS
+
+
+def progress(message):
+    print(f"\r{message}", end="", file=sys.stderr, flush=True)
+
+
+def first_line(error):
+    """An error's message on one line; yajl parse errors append a multi-line excerpt."""
+    lines = str(error).strip().splitlines()
+    return lines[0] if lines else type(error).__name__
+
+
+def chunk_reporter(args):
+    """Prints each upsert chunk's latency with --verbose."""
+    if not args.verbose:
+        return None
+
+    def report(chunk):
+        outcome = f"failed: {chunk.error}" if chunk.error else "ok"
+        print(f"\rchunk {chunk.index + 1}: {chunk.points} points, {chunk.bytes / 1024:.0f} KB, "
+              f"{chunk.seconds * 1000:.0f} ms, {chunk.attempts} attempt(s), {outcome}", file=sys.stderr)
+    return report
+
+
+def run_import(args):
+    core.ensure_collection()
+    report_chunk = chunk_reporter(args)
+
+    def show_progress(added, skipped, invalid, fraction):
+        percent = f"{fraction:.0%} " if fraction is not None else ""
+        progress(f"{percent}added {added}, skipped {skipped} duplicates, {invalid} invalid")
+
+    with open(args.file, "rb") as f:
+        try:
+            result = core.import_words(f, args.file, args.language, os.path.getsize(args.file), show_progress, report_chunk)
+        except INVALID_FILE_ERRORS as e:
+            # Chunks uploaded before the malformed record stay in the collection
+            raise core.VocabularyError(f"{args.file} is not a valid import file: {first_line(e)}") from e
+    items = result.added + result.skipped + result.invalid + result.failed
+    print(file=sys.stderr)
+    print(f"Imported {result.added} words for '{args.language}', skipped {result.skipped} duplicates and "
+          f"{result.invalid} invalid items in {result.seconds:.2f}s "
+          f"({items / result.seconds if result.seconds else 0:,.0f} items/s)", file=sys.stderr)
+    print(f"Upload: {summarize_chunks(result.chunks)}", file=sys.stderr)
+    if result.failed:
+        print(f"Failed to add {result.failed} words after retries; run the import again to retry them", file=sys.stderr)
+        return 1
+
+
+def run_export(args):
+    if args.output == "-":
+        exported = core.write_export(sys.stdout.buffer)
+        sys.stdout.buffer.flush()
+    else:
+        # Written next to the target and renamed, so readers never see a partial export
+        try:
+            with open(args.output + ".tmp", "wb") as f:
+                exported = core.write_export(f)
+            os.replace(args.output + ".tmp", args.output)
+        except BaseException:
+            # Missing when open() itself failed; that error is the one to report
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(args.output + ".tmp")
+            raise
+    print(f"Exported {exported} words", file=sys.stderr)
+
+
+def run_migrate(args):
+    pending, checkpoint = core.missing_language_status()
+    if not pending:
+        print("No points required updating.", file=sys.stderr)
+        return
+    if checkpoint and args.mode == "chunked":
+        print(f"Resuming an interrupted run ({checkpoint['updated']} points already updated)", file=sys.stderr)
+
+    def show_progress(updated, total, points_per_second):
+        progress(f"updated {updated}/{total} points ({points_per_second:,.0f} points/s)")
+
+    result = core.migrate_missing_language(args.mode, on_progress=show_progress)
+    print(file=sys.stderr)
+    print(f"Updated {result.updated} points in {result.seconds:.2f}s "
+          f"({result.points_per_second:,.0f} points/s)", file=sys.stderr)
+
+
+def run_generate(args):
+    prompts = list(args.prompts)
+    if args.prompts_file:
+        with open(args.prompts_file, encoding="utf-8") as f:
+            prompts.extend(line.strip() for line in f if line.strip())
+    if not prompts:
+        raise core.VocabularyError("Give at least one prompt, or --prompts-file")
+
+    result = core.generate_words(prompts, args.language, use_cache=not args.no_cache)
+    for prompt, error in result.errors:
+        print(f"Error calling Bedrock for prompt '{prompt}': {error}", file=sys.stderr)
+    for line in result.malformed:
+        print(f"Skipping malformed line: {line!r}", file=sys.stderr)
+    for word in result.words:
+        print(f"{word['target_word']} - {word['english']}")
+    print(f"Generated {len(result.words)} unique words from {len(prompts)} prompt(s) in {result.seconds:.2f}s "
+          f"({len(result.words) / result.seconds if result.seconds else 0:,.1f} words/s)", file=sys.stderr)
+
+    if result.words and not args.dry_run:
+        core.ensure_collection()
+        inserted = core.insert_words(result.words, args.language, on_chunk=chunk_reporter(args))
+        print(f"Added {len(inserted.added)} new words, skipped {len(inserted.skipped)} duplicates", file=sys.stderr)
+        print(f"Upload: {summarize_chunks(inserted.chunks)}", file=sys.stderr)
+        if inserted.failed:
+            print(f"Failed to add {len(inserted.failed)} words after retries", file=sys.stderr)
+            return 1
+    if result.errors:
+        return 1
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="vocab", description="Vocabulary loader operations without the Streamlit UI.")
+    parser.add_argument("-v", "--verbose", action="store_true", help="print the latency of every upsert chunk")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser("import", help="import words from a JSON, NDJSON/JSONL or CSV file")
+    import_parser.add_argument("file")
+    import_parser.add_argument("--language", required=True, choices=core.SUPPORTED_LANGUAGES)
+    import_parser.set_defaults(run=run_import)
+
+    export_parser = commands.add_parser("export", help="export every word as JSON")
+    export_parser.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    export_parser.set_defaults(run=run_export)
+
+    migrate_parser = commands.add_parser("migrate", help="set 'language: salish' on words missing a language")
+    migrate_parser.add_argument("--mode", choices=["chunked", "filter"], default="chunked",
+                                help="resumable chunks (default) or one server-side update")
+    migrate_parser.set_defaults(run=run_migrate)
+
+    generate_parser = commands.add_parser("generate", help="generate words with Bedrock and insert them")
+    generate_parser.add_argument("prompts", nargs="*", help="prompts or topics, one Bedrock call each")
+    generate_parser.add_argument("--prompts-file", help="file with one prompt or topic per line")
+    generate_parser.add_argument("--language", required=True, choices=core.SUPPORTED_LANGUAGES)
+    generate_parser.add_argument("--no-cache", action="store_true", help="always call Bedrock, bypassing the response cache")
+    generate_parser.add_argument("--dry-run", action="store_true", help="print the words without inserting them")
+    generate_parser.set_defaults(run=run_generate)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.run(args) or 0
+    except (core.VocabularyError, OSError) as e:
+        # Refusals, unreadable files and malformed imports are reported on one line
+        print(f"vocab {args.command}: {first_line(e)}", file=sys.stderr)
+        return 2
+    except KeyboardInterrupt:
+        print(file=sys.stderr)
+        return 130
+
+
+if __name__ == "__main__":
+    sys.exit(main())
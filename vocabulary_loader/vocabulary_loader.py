@@ -1,408 +1,279 @@
 import streamlit as st
-import json
-import boto3
-import random
+import argparse
 import os
-from qdrant_client.http import models
-from datetime import datetime
-from utils.qdrant_utils import get_qdrant_client
-import uuid
-
-# Initialize Qdrant client
-client = get_qdrant_client()
-
-# Define supported languages
-SUPPORTED_LANGUAGES = ["salish", "italian"]
+import sys
+import threading
+import core
+from core import SUPPORTED_LANGUAGES, VocabularyError
+from utils.upload import summarize_chunks
+from utils.word_import import IMPORT_FILE_TYPES, INVALID_FILE_ERRORS, preview_records
+
+# Data operations live in core.py, shared with the command line (vocab.py); the functions
+# below report their results in the UI and keep the Streamlit caches in step with writes.
+
+# Checks the collection once per server process rather than on every rerun. Errors are
+# not cached, so a failed check is retried on the next rerun.
+@st.cache_resource(show_spinner=False)
+def _initialize_collections():
+    status = core.ensure_collection()
+    if status.index_error is not None:
+        st.warning(f"Could not create indexes (they might exist): {status.index_error}")
+    elif status.created:
+        st.success("Qdrant collection 'words' initialized/verified with necessary indexes.")
+    else:
+        st.info("Collection 'words' already exists. Ensure indexes are correct.")
 
 # Function to initialize the collections
 def initialize_collections():
     try:
-        # Check if collection exists first
-        collections = client.get_collections().collections
-        exists = any(collection.name == "words" for collection in collections)
-        
-        if not exists:
-            # Collection for words
-            client.recreate_collection( # Use recreate for potential schema updates
-                collection_name="words",
-                vectors_config=models.VectorParams(size=384, distance=models.Distance.COSINE),
-            )
-            # Ensure payload indexes exist (including the new language field)
-            try:
-                client.create_payload_index(collection_name="words", field_name="language", field_schema=models.PayloadSchemaType.KEYWORD)
-                client.create_payload_index(collection_name="words", field_name="target_word", field_schema=models.PayloadSchemaType.TEXT) # Index target word
-                client.create_payload_index(collection_name="words", field_name="english", field_schema=models.PayloadSchemaType.TEXT)
-                st.success("Qdrant collection 'words' initialized/verified with necessary indexes.")
-            except Exception as index_e:
-                st.warning(f"Could not create indexes (they might exist): {index_e}")
-        else:
-            st.info("Collection 'words' already exists. Ensure indexes are correct.")
+        _initialize_collections()
     except Exception as e:
         st.error(f"Error with Qdrant collection: {e}")
 
 # Initialize the collections
 initialize_collections()
 
-# Function to fetch all words from Qdrant
-def fetch_words():
-    try:
-        # Scroll through all points, fetching payload including language
-        search_result, _ = client.scroll(
-            collection_name="words",
-            limit=1000,  # Increase limit to fetch more/all words if needed
-            with_payload=True,
-            with_vectors=False
-        )
-        # Ensure payload is dictionary and add default language if missing (for backward compatibility)
-        words = []
-        for point in search_result:
-            payload = point.payload
-            if isinstance(payload, dict):
-                # Add id from the point itself into the payload for easier reference
-                payload['id'] = point.id 
-                # Handle potential legacy data without language
-                if 'language' not in payload:
-                    payload['language'] = 'salish' # Assume old data is Salish
-                # Rename 'salish' to 'target_word' if present
-                if 'salish' in payload and 'target_word' not in payload:
-                    payload['target_word'] = payload.pop('salish')
-                elif 'target_word' not in payload:
-                    payload['target_word'] = "[missing]" # Placeholder if somehow missing
-                words.append(payload)
-            else:
-                st.warning(f"Skipping point with non-dict payload: {point.id}")
-
-        return words
-    except Exception as e:
-        st.error(f"Error fetching words: {e}")
-        return []
+# Page sizes offered by the CRUD table
+CRUD_PAGE_SIZES = [25, 50, 100, 250]
 
-# Add this function to check for duplicates, now language-aware
-def is_duplicate_word(target_word: str, english: str, language: str, existing_words: list) -> bool:
-    """Check if a word already exists in the collection for the specific language."""
-    target_word_lower = target_word.lower()
-    english_lower = english.lower()
-    return any(
-        word.get('language') == language and 
-        (word.get('target_word', '').lower() == target_word_lower or 
-         word.get('english', '').lower() == english_lower) 
-        for word in existing_words
-    )
+# --- Read caching ---
+# Reads below are cached across reruns and sessions, keyed on the collection version.
+# Every write made through this app bumps the version, so a rerun with no writes makes
+# no Qdrant calls. Writes from other processes (e.g. the API) show up after the TTL.
+WORDS_CACHE_TTL_SECONDS = float(os.getenv("WORDS_CACHE_TTL", "300"))
+
+class CollectionVersion:
+    """Counter of writes made to the words collection through this process."""
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def bump(self):
+        with self._lock:
+            self.value += 1
+
+@st.cache_resource(show_spinner=False)
+def get_collection_version():
+    # One counter per server process, shared by every browser session
+    return CollectionVersion()
+
+def invalidate_word_caches():
+    """Call after any write to the words collection."""
+    get_collection_version().bump()
+
+@st.cache_data(ttl=WORDS_CACHE_TTL_SECONDS, max_entries=256, show_spinner=False)
+def load_word_page(version, offset, limit):
+    return core.fetch_word_page(offset, limit)
+
+@st.cache_data(ttl=WORDS_CACHE_TTL_SECONDS, max_entries=16, show_spinner=False)
+def load_word_count(version):
+    return core.count_words()
+
+@st.cache_data(ttl=WORDS_CACHE_TTL_SECONDS, max_entries=2, show_spinner=False)
+def load_export(version):
+    return core.export_words_json()
 
 # Function to add a word to Qdrant, now with language
 def add_word(target_word, english, language):
-    if language not in SUPPORTED_LANGUAGES:
-        st.error(f"Invalid language: {language}. Must be one of {SUPPORTED_LANGUAGES}")
-        return False
-        
     try:
-        # First fetch existing words
-        existing_words = fetch_words()
-        
-        # Check for duplicates for the given language
-        if is_duplicate_word(target_word, english, language, existing_words):
-            st.error(f"Word already exists for {language}! Either '{target_word}' or '{english}' is already in the database for this language.")
-            return False
-            
-        # Use UUID for potentially better uniqueness than random int
-        point_id = str(uuid.uuid4())
-        client.upsert(
-            collection_name="words",
-            wait=True, # Wait for confirmation
-            points=[
-                models.PointStruct(
-                    id=point_id, 
-                    payload={
-                        "target_word": target_word, # Use generic field name
-                        "english": english,
-                        "language": language, # Store the language
-                        "created_at": datetime.now().isoformat()
-                    },
-                    vector=[0.0] * 384  # Placeholder vector
-                )
-            ]
-        )
-        st.success(f"Word ('{target_word}' - '{english}' [{language}]) added successfully!")
-        return True
+        core.add_word(target_word, english, language)
+    except VocabularyError as e:
+        st.error(str(e))
+        return False
     except Exception as e:
         st.error(f"Error adding word: {e}")
         return False
+    invalidate_word_caches()
+    st.success(f"Word ('{target_word}' - '{english}' [{language}]) added successfully!")
+    return True
 
 # Function to update a word in Qdrant
 def update_word(id, target_word, english, language): # Language is needed for duplicate check
-    if language not in SUPPORTED_LANGUAGES:
-         st.error(f"Invalid language: {language}. Must be one of {SUPPORTED_LANGUAGES}")
-         return False # Should not happen if fetched correctly, but good sanity check
-
     try:
-        # First fetch existing words
-        existing_words = fetch_words()
-        
-        # Filter out the current word (identified by id) from duplicate check
-        other_words = [w for w in existing_words if str(w.get('id', '')) != str(id)]
-        
-        # Check for duplicates against other words of the same language
-        if is_duplicate_word(target_word, english, language, other_words):
-            st.error(f"Cannot update: Either '{target_word}' or '{english}' already exists in another entry for {language}.")
-            return False
-            
-        # Fetch the existing point to preserve created_at or other fields if necessary
-        # Note: This requires the ID to be correctly passed and exist.
-        # Qdrant upsert with the same ID overwrites payload by default.
-        # We just need to ensure the payload has all required fields.
-        
-        client.upsert(
-            collection_name="words",
-            wait=True,
-            points=[
-                models.PointStruct(
-                    id=id, # Use the existing ID to update
-                    payload={
-                        "target_word": target_word, # Use generic field name
-                        "english": english,
-                        "language": language, # Ensure language is preserved/correct
-                        # Keep created_at if it exists? Or just add updated_at?
-                        # For simplicity, we overwrite with new data + updated_at
-                        "updated_at": datetime.now().isoformat()
-                    },
-                    vector=[0.0] * 384  # Placeholder vector
-                )
-            ]
-        )
-        st.success(f"Word (ID: {id}) updated successfully!")
-        return True
+        core.update_word(id, target_word, english, language)
+    except VocabularyError as e:
+        st.error(str(e))
+        return False
     except Exception as e:
+        invalidate_word_caches()
         st.error(f"Error updating word (ID: {id}): {e}")
         return False
+    invalidate_word_caches()
+    st.success(f"Word (ID: {id}) updated successfully!")
+    return True
 
 # Function to delete a word from Qdrant (remains largely the same, ID is key)
 def delete_word(id):
     try:
-        client.delete(
-            collection_name="words",
-            points_selector=models.PointIdsList(
-                points=[str(id)] # Ensure ID is string if using UUIDs
-            ),
-            wait=True
-        )
+        core.delete_word(id)
+        invalidate_word_caches()
         st.success(f"Word (ID: {id}) deleted successfully!")
     except Exception as e:
         st.error(f"Error deleting word (ID: {id}): {e}")
 
+def show_chunk_latencies(chunks):
+    """Summarizes upsert chunks, with the latency of each in an expander."""
+    if not chunks:
+        return
+    st.caption(f"Upload: {summarize_chunks(chunks)}")
+    with st.expander("Upload chunks"):
+        st.dataframe([
+            {'Chunk': c.index + 1, 'Points': c.points, 'KB': round(c.bytes / 1024, 1),
+             'Latency (ms)': round(c.seconds * 1000, 1), 'Attempts': c.attempts, 'Error': c.error or ''}
+            for c in chunks
+        ])
+
 # Modified to accept language and use target_word
 def insert_words_into_db(words, language):
-    if language not in SUPPORTED_LANGUAGES:
-        st.error(f"Invalid language for import: {language}. Must be one of {SUPPORTED_LANGUAGES}")
-        return
-        
+    status = st.empty()
+
+    def show_chunk(chunk):
+        outcome = f"failed: {chunk.error}" if chunk.error else f"{chunk.seconds * 1000:.0f} ms"
+        status.text(f"Chunk {chunk.index + 1}: {chunk.points} words, {outcome}"
+                    + (f" after {chunk.attempts} attempts" if chunk.attempts > 1 else ""))
+
     try:
-        # First fetch existing words
-        existing_words = fetch_words()
-        points = []
-        skipped_words = []
-        added_words = []
-
-        # Expecting `words` to be a list of dicts like {'target_word': '...', 'english': '...'}
-        for word_data in words:
-            target_word = word_data.get('target_word')
-            english = word_data.get('english')
-
-            if not target_word or not english:
-                st.warning(f"Skipping incomplete word data: {word_data}")
-                continue
-
-            # Perform language-specific duplicate check
-            if is_duplicate_word(target_word, english, language, existing_words):
-                skipped_words.append(f"{target_word} - {english} [{language}]")
-                continue
-
-            # Generate a unique ID for each word
-            point_id = str(uuid.uuid4())
-            points.append(
-                models.PointStruct(
-                    id=point_id, 
-                    payload={
-                        "target_word": target_word,
-                        "english": english,
-                        "language": language, # Assign the language for the batch
-                        "created_at": datetime.now().isoformat()
-                    },
-                    vector=[0.0] * 384  # Placeholder vector
-                )
-            )
-            # Add the newly added word to existing_words for subsequent checks within the same batch
-            existing_words.append({
-                 'id': point_id, 
-                 'target_word': target_word, 
-                 'english': english, 
-                 'language': language
-            })
-            added_words.append(f"{target_word} - {english} [{language}]")
-        
-        if points:
-            client.upsert(
-                collection_name="words",
-                points=points,
-                wait=True
-            )
-            st.success(f"Added {len(points)} new words for language '{language}' successfully!")
-            if added_words:
-                st.write("Added words:", added_words)
-        else:
-            st.info("No new words were added.")
-        
-        if skipped_words:
-            st.warning(f"Skipped {len(skipped_words)} duplicate words for language '{language}':")
-            st.write("Skipped words:", skipped_words)
-            
+        result = core.insert_words(words, language, on_chunk=show_chunk)
+    except VocabularyError as e:
+        st.error(str(e))
+        return
     except Exception as e:
+        invalidate_word_caches()
         st.error(f"Error inserting words for language '{language}': {e}")
+        return
+    status.empty()
+
+    if result.incomplete:
+        st.warning(f"Skipped {result.incomplete} incomplete words.")
+    if result.added or result.failed:
+        invalidate_word_caches()
+    if result.added:
+        st.success(f"Added {len(result.added)} new words for language '{language}' successfully!")
+        st.write("Added words:", result.added)
+    else:
+        st.info("No new words were added.")
+    if result.failed:
+        st.error(f"Failed to add {len(result.failed)} words for language '{language}' after retries:")
+        st.write("Failed words:", result.failed)
+    if result.skipped:
+        st.warning(f"Skipped {len(result.skipped)} duplicate words for language '{language}':")
+        st.write("Skipped words:", result.skipped)
+    show_chunk_latencies(result.chunks)
+
+def import_words_file(uploaded_file, language):
+    """Streams an uploaded file into Qdrant chunk by chunk, with a live progress bar."""
+    progress = st.progress(0.0)
+    status = st.empty()
+    counts = {"added": 0}
+
+    def show_progress(added, skipped, invalid, fraction):
+        counts["added"] = added
+        progress.progress(fraction if fraction is not None else 0.0)
+        status.text(f"Imported {added} words, skipped {skipped} duplicates and {invalid} invalid items")
+
+    uploaded_file.seek(0)
+    try:
+        result = core.import_words(uploaded_file, uploaded_file.name, language, uploaded_file.size, show_progress)
+    except VocabularyError as e:
+        st.error(str(e))
+        return
+    except Exception as e:
+        # Chunks already upserted stay
+        st.error(f"Error importing words for language '{language}' after {counts['added']} words: {e}")
+        return
+    finally:
+        if counts["added"]:
+            invalidate_word_caches()
+
+    progress.progress(1.0)
+    items = result.added + result.skipped + result.invalid + result.failed
+    st.success(f"Import finished: added {result.added} new words for language '{language}', "
+               f"skipped {result.skipped} duplicates and {result.invalid} invalid items "
+               f"({items / result.seconds if result.seconds else 0:,.0f} items/s).")
+    if result.failed:
+        st.error(f"Failed to add {result.failed} words after retries; import the file again to retry them.")
+    show_chunk_latencies(result.chunks)
 
 # --- Data Migration Function ---
-def migrate_missing_language():
-    st.info("Starting data migration: Adding 'language: salish' to points missing the field...")
-    updated_count = 0
-    checked_count = 0
-    points_to_update = []
-
+def migrate_missing_language(mode="chunked"):
+    """
+    Sets 'language: salish' on points missing the field, with either one filter-based
+    set_payload ("filter") or resumable chunks with a progress bar ("chunked").
+    """
     try:
-        # Scroll through all points in the collection
-        offset = None
-        while True:
-            scroll_result, next_offset = client.scroll(
-                collection_name="words",
-                limit=100, # Process in batches
-                offset=offset,
-                with_payload=True,
-                with_vectors=False
-            )
-            checked_count += len(scroll_result)
+        pending, checkpoint = core.missing_language_status()
+        if not pending:
+            st.success("Migration check complete. No points required updating.")
+            return
+        st.info(f"Found {pending} points missing the language field.")
 
-            for point in scroll_result:
-                payload = point.payload
-                # Check if payload is a dict and language field is missing
-                if isinstance(payload, dict) and 'language' not in payload:
-                    points_to_update.append(point.id)
-            
-            if next_offset is None:
-                break # No more pages
-            offset = next_offset
-
-        st.info(f"Checked {checked_count} points. Found {len(points_to_update)} points missing the language field.")
-
-        if points_to_update:
-            st.info("Applying updates...")
-            # Update points in batches if the list is very large, or one by one
-            # set_payload can take a list of points and a payload to set for all of them,
-            # or update individual points. Let's update individually for clarity.
-            for point_id in points_to_update:
-                 try:
-                     client.set_payload(
-                         collection_name="words",
-                         payload={"language": "salish"}, # Payload to add/overwrite
-                         points=[point_id], # ID of the point to update
-                         wait=True
-                     )
-                     updated_count += 1
-                 except Exception as update_err:
-                     st.warning(f"Failed to update point {point_id}: {update_err}")
-            
-            st.success(f"Migration complete. Successfully updated {updated_count} points.")
+        if mode == "filter":
+            with st.spinner("Applying update..."):
+                result = core.migrate_missing_language("filter")
         else:
-            st.success("Migration check complete. No points required updating.")
+            if checkpoint:
+                st.info(f"Resuming an interrupted run ({checkpoint['updated']} points already updated).")
+            progress = st.progress(0.0)
+            status = st.empty()
+
+            def show_progress(updated, total, points_per_second):
+                progress.progress(min(updated / total, 1.0) if total else 1.0)
+                status.text(f"Updated {updated}/{total} points ({points_per_second:,.0f} points/s)")
+
+            result = core.migrate_missing_language("chunked", on_progress=show_progress)
+
+        if result.updated:
+            invalidate_word_caches()
+        st.success(f"Migration complete. Updated {result.updated} points in {result.seconds:.2f}s "
+                   f"({result.points_per_second:,.0f} points/s).")
 
     except Exception as e:
+        # Chunked runs keep their checkpoint, so running again resumes
+        invalidate_word_caches()
         st.error(f"Error during migration: {e}")
 
-# Function to generate vocabulary using Amazon Bedrock - ADD LANGUAGE PARAM
-def generate_vocabulary(prompt, language):
-    if language not in SUPPORTED_LANGUAGES:
-        st.error(f"Cannot generate vocabulary for unsupported language: {language}")
-        return []
-        
-    aws_access_key_id = os.getenv('AWS_ACCESS_KEY_ID')
-    aws_secret_access_key = os.getenv('AWS_SECRET_ACCESS_KEY')
-
-    # Initialize the AWS client
-    boto3.client(
-        's3',
-        aws_access_key_id=aws_access_key_id,
-        aws_secret_access_key=aws_secret_access_key
-    )
-    session = boto3.session.Session()
-    
-    bedrock_client = boto3.client(
-        service_name='bedrock-runtime',
-        region_name='us-east-1'
-    )
-
-    model_id = "amazon.nova-lite-v1:0"
-    content_type = "application/json"
-    accept = "application/json"
+def parse_script_args(argv):
+    """Options passed after `--`, e.g. `streamlit run vocabulary_loader.py -- --no-cache`."""
+    parser = argparse.ArgumentParser(prog="vocabulary_loader.py")
+    parser.add_argument("--no-cache", action="store_true", help="always call Bedrock, bypassing the response cache")
+    args, _ = parser.parse_known_args(argv)
+    return args
 
-    # Update prompt to specify language and format
-    generation_prompt = f"{prompt} Generate 10 vocabulary words with translations between English and {language.capitalize()}. Format each line strictly as: {language.capitalize()} Word - English Word. Include only the words per line, no numbering, backticks, or other formatting."
-    
-    body = json.dumps({
-        "messages": [
-            {
-                "role": "user",
-                "content": [{"text": generation_prompt}]
-            }
-        ]
-    })
+script_args = parse_script_args(sys.argv[1:])
 
+# Function to generate vocabulary using Amazon Bedrock - ADD LANGUAGE PARAM
+def generate_vocabulary(prompts, language, use_cache=True):
+    """
+    Generates words for one or more prompts with concurrent Bedrock calls, then inserts the
+    merged words in one bulk insert. Words repeated across prompts are kept once.
+    Responses are served from the response cache unless use_cache is False.
+    """
+    if isinstance(prompts, str):
+        prompts = [prompts]
     try:
-        response = bedrock_client.invoke_model(
-            body=body,
-            modelId=model_id,
-            contentType=content_type,
-            accept=accept
-        )
-        response_body = json.loads(response['body'].read().decode('utf-8'))
-        generated_text = response_body['output']['message']['content'][0]['text']
-        # Pass language to parser and inserter
-        words = parse_generated_text(generated_text, language) 
-        if words:
-            insert_words_into_db(words, language) 
-        else:
-            st.warning("Could not parse any words from the generated text.")
-        return words
-
+        with st.spinner(f"Generating vocabulary for {len(prompts)} prompt(s)..."):
+            result = core.generate_words(prompts, language, use_cache)
+    except VocabularyError as e:
+        st.error(f"Cannot generate vocabulary: {e}")
+        return []
     except Exception as e:
         st.error(f"Error calling Bedrock: {e}")
         return []
 
-# Modified parser to handle language and target_word
-def parse_generated_text(generated_text, language):
-    words = []
-    # Clean the text of any backticks
-    cleaned_text = generated_text.replace('`', '').strip()
-    
-    for line in cleaned_text.split('\n'):
-        if not line.strip():
-            continue
-        
-        # Clean each line
-        clean_line = line.strip()
-        parts = clean_line.split(' - ')
-        
-        if len(parts) == 2:  # Expecting Target Language Word - English Word
-            target_word_part = parts[0].strip()
-            english_part = parts[1].strip()
-            
-            if target_word_part and english_part:  # Only add if both parts are non-empty
-                words.append({
-                    # The key is now generic 'target_word'
-                    "target_word": target_word_part, 
-                    "english": english_part
-                    # Language is handled by the calling function (insert_words_into_db)
-                })
-        else:
-             st.warning(f"Skipping malformed line (expected 'Target - English'): '{line}'")
-            
-    st.write(f"Parsed {len(words)} words from generated text for language '{language}'.")
-    return words
+    for prompt, error in result.errors:
+        st.error(f"Error calling Bedrock for prompt '{prompt}': {error}")
+    for line in result.malformed:
+        st.warning(f"Skipping malformed line (expected 'Target - English'): '{line}'")
+    st.write(f"Parsed {len(result.words)} words from generated text for language '{language}'.")
+
+    if result.words:
+        insert_words_into_db(result.words, language)
+        st.info(f"Generated {len(result.words)} unique words from {len(prompts)} prompt(s) in {result.seconds:.2f}s "
+                f"({len(result.words) / result.seconds if result.seconds else 0:,.1f} words/s).")
+    else:
+        st.warning("Could not parse any words from the generated text.")
+    return result.words
 
 # Streamlit UI
 # Use language name in title
@@ -411,17 +282,25 @@ st.title(f"Vocabulary Loader (Salish & Italian)")
 # Sidebar options
 # Add "Data Migration" to the options
 operation = st.sidebar.selectbox("Choose an operation", ["Generate", "CRUD", "Import/Export", "Data Migration"])
+use_response_cache = st.sidebar.checkbox(
+    "Cache generation responses",
+    value=not script_args.no_cache,
+    help="Repeat prompts are answered from a local cache instead of calling Bedrock. "
+         "Start with `-- --no-cache` to turn this off by default."
+)
 
 if operation == "Generate":
     st.header("Generate Vocabulary")
     # Add language selection for generation
     selected_language_gen = st.selectbox("Select Language to Generate", SUPPORTED_LANGUAGES, key="lang_gen")
     
+    batch_mode = st.checkbox("Batch mode: one prompt or topic per line", key="gen_batch")
     prompt = st.text_area(f"Enter a prompt for {selected_language_gen.capitalize()} vocabulary generation")
     if st.button("Generate"):
+        prompts = [line.strip() for line in prompt.splitlines() if line.strip()] if batch_mode else [prompt]
         if prompt and selected_language_gen:
             # Pass selected language to generate function
-            generated_words = generate_vocabulary(prompt, selected_language_gen) 
+            generated_words = generate_vocabulary(prompts, selected_language_gen, use_response_cache) 
             st.write(f"Generated {selected_language_gen.capitalize()} Words (Attempted Insert):")
             # Display format includes target_word
             if generated_words:
@@ -432,11 +311,25 @@ if operation == "Generate":
 
 elif operation == "CRUD":
     st.header("CRUD Operations")
-    words = fetch_words() # Fetches all words with language and id
+    # Only the page on screen is read from Qdrant. Scroll offsets cannot jump ahead, so
+    # the start offset of each page visited so far is kept in the session.
+    page_size = st.selectbox("Words per page", CRUD_PAGE_SIZES, key="crud_page_size")
+    if st.session_state.get("crud_offsets_page_size") != page_size:
+        st.session_state.crud_offsets_page_size = page_size
+        st.session_state.crud_page_offsets = [None]
+    page_offsets = st.session_state.crud_page_offsets
+    try:
+        version = get_collection_version().value
+        words, next_offset = load_word_page(version, page_offsets[-1], page_size)
+        total_words = load_word_count(version)
+    except Exception as e:
+        st.error(f"Error fetching words: {e}")
+        words, next_offset, total_words = [], None, 0
 
     # Display words in a table with language
     if words:
-        st.write("Existing Words:")
+        total_pages = max(1, -(-total_words // page_size))
+        st.write(f"Existing Words (page {len(page_offsets)} of {total_pages}, {total_words} words):")
         # Prepare data for display, ensuring all keys exist
         display_data = []
         for w in words:
@@ -451,6 +344,14 @@ elif operation == "CRUD":
     else:
         st.info("No words found in the database.")
 
+    previous_column, next_column = st.columns(2)
+    if previous_column.button("Previous page", disabled=len(page_offsets) == 1):
+        page_offsets.pop()
+        st.experimental_rerun()
+    if next_column.button("Next page", disabled=next_offset is None):
+        page_offsets.append(next_offset)
+        st.experimental_rerun()
+
     # Add word form with language selection
     st.subheader("Add New Word")
     selected_language_add = st.selectbox("Language", SUPPORTED_LANGUAGES, key="lang_add")
@@ -468,6 +369,7 @@ elif operation == "CRUD":
 
     # Update word form - simplifying: get ID, show current, allow edit
     st.subheader("Update Word")
+    st.caption("Words on the current page")
     if words:
         # Select word by ID might be more robust if list is long
         word_options = {str(w.get('id', '')): f"{w.get('target_word', '')} - {w.get('english', '')} [{w.get('language', '')}]" for w in words if w.get('id')}
@@ -526,11 +428,14 @@ elif operation == "Import/Export":
     # Export - Ensure exported data has target_word and language
     st.subheader("Export Vocabulary")
     if st.button("Export to JSON"):
-        words_to_export = fetch_words() # Fetch fresh data with language/target_word
-        if words_to_export:
-            # Prepare for export, maybe remove internal IDs if not needed externally?
-            export_data = [{'target_word': w.get('target_word'), 'english': w.get('english'), 'language': w.get('language')} for w in words_to_export]
-            json_data = json.dumps(export_data, indent=4, ensure_ascii=False)
+        # Words are streamed from Qdrant and encoded page by page
+        try:
+            json_data, exported_count = load_export(get_collection_version().value)
+        except Exception as e:
+            st.error(f"Error exporting words: {e}")
+            json_data, exported_count = b"", 0
+        if exported_count:
+            st.write(f"Exported {exported_count} words.")
             st.download_button(
                 label="Download JSON",
                 data=json_data,
@@ -543,44 +448,27 @@ elif operation == "Import/Export":
     # Import - Add language selection
     st.subheader("Import Vocabulary")
     selected_language_import = st.selectbox("Select Language for Imported File", SUPPORTED_LANGUAGES, key="lang_import")
-    uploaded_file = st.file_uploader(f"Upload a JSON file (for {selected_language_import.capitalize()} language)", type=["json"], key="import_upload")
+    uploaded_file = st.file_uploader(
+        f"Upload a JSON, NDJSON or CSV file (for {selected_language_import.capitalize()} language)",
+        type=IMPORT_FILE_TYPES, key="import_upload"
+    )
     
     if uploaded_file is not None and selected_language_import:
+        # Expected records are { "target_word": "...", "english": "..." }, or legacy files
+        # naming the target word after the language, e.g. { "salish": "...", "english": "..." }.
+        # Only the first rows are parsed for the preview; the import streams the whole file.
         try:
-            # Assuming JSON structure is [{ "target_word": "...", "english": "..." }, ...]
-            # Or potentially legacy { "salish": "...", "english": "..." }
-            raw_data = json.loads(uploaded_file.read().decode("utf-8"))
-            
-            # Normalize data to { "target_word": "...", "english": "..." }
-            words_to_import = []
-            for item in raw_data:
-                if isinstance(item, dict):
-                    english = item.get('english')
-                    target = item.get('target_word')
-                    # Handle legacy format where 'salish' might be present
-                    if not target and selected_language_import == 'salish' and 'salish' in item:
-                        target = item.get('salish')
-                    # Add more specific checks if Italian files might use 'italian' key
-                    elif not target and selected_language_import == 'italian' and 'italian' in item:
-                         target = item.get('italian')
-                        
-                    if target and english:
-                        words_to_import.append({'target_word': target, 'english': english})
-                    else:
-                        st.warning(f"Skipping invalid item during import: {item}")
-                else:
-                    st.warning(f"Skipping non-dictionary item during import: {item}")
-
-            st.write(f"Previewing {len(words_to_import)} words to import as {selected_language_import.capitalize()}:")
-            st.dataframe(words_to_import)
+            uploaded_file.seek(0)
+            preview = preview_records(uploaded_file, uploaded_file.name, selected_language_import)
+            st.write(f"Previewing the first {len(preview)} words of {uploaded_file.name} "
+                     f"({uploaded_file.size / (1024 * 1024):,.1f} MB) to import as {selected_language_import.capitalize()}:")
+            st.dataframe(preview)
 
             if st.button("Add Imported Words to Database"):
-                # Pass the list of dicts and the selected language
-                insert_words_into_db(words_to_import, selected_language_import) 
-                st.experimental_rerun()
+                import_words_file(uploaded_file, selected_language_import)
 
-        except json.JSONDecodeError:
-            st.error("Invalid JSON format.")
+        except INVALID_FILE_ERRORS as e:
+            st.error(f"Invalid file format: {e}")
         except Exception as e:
             st.error(f"Error processing imported file: {e}")
 
@@ -592,5 +480,14 @@ elif operation == "Data Migration":
     st.subheader("Add Missing Language Field")
     st.write("This tool checks all entries in the 'words' collection. \n             If an entry does not have a 'language' field in its payload, \n             it will be assigned 'language: salish'. This is useful for updating older data.")
     
+    migration_mode = st.radio(
+        "Method",
+        ["chunked", "filter"],
+        format_func=lambda mode: {"chunked": "In chunks (progress, resumable)", "filter": "Single server-side update"}[mode]
+    )
     if st.button("Run Salish Language Migration"):
-        migrate_missing_language() # Call the migration function
+        migrate_missing_language(migration_mode) # Call the migration function
+
+# Rendered last so the counts include a generation made during this run
+response_cache = core.get_response_cache()
+st.sidebar.caption(f"Generation cache: {response_cache.hits} hits, {response_cache.misses} misses")